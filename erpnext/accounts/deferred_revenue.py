@@ -1,10 +1,12 @@
 import frappe
 from frappe import _
 from frappe.email import sendmail_to_system_managers
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import (
 	add_days,
 	add_months,
 	cint,
+	create_batch,
 	date_diff,
 	flt,
 	get_first_day,
@@ -15,6 +17,7 @@ from frappe.utils import (
 	today,
 )
 
+import erpnext
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
@@ -73,23 +76,26 @@ def convert_deferred_expense_to_expense(deferred_process, start_date=None, end_d
 	if not end_date:
 		end_date = add_days(today(), -1)
 
-	# check for the purchase invoice for which GL entries has to be done
-	invoices = frappe.db.sql_list(
-		f"""
-		select distinct item.parent
-		from `tabPurchase Invoice Item` item, `tabPurchase Invoice` p
-		where item.service_start_date<=%s and item.service_end_date>=%s
-		and item.enable_deferred_expense = 1 and item.parent=p.name
-		and item.docstatus = 1 and ifnull(item.amount, 0) > 0
-		{conditions}
-	""",
-		(end_date, start_date),
-	)  # nosec
+	if is_bulk_deferred_booking_enabled():
+		book_deferred_entries_in_bulk("Purchase Invoice", deferred_process, start_date, end_date, conditions)
+	else:
+		# check for the purchase invoice for which GL entries has to be done
+		invoices = frappe.db.sql_list(
+			f"""
+			select distinct item.parent
+			from `tabPurchase Invoice Item` item, `tabPurchase Invoice` p
+			where item.service_start_date<=%s and item.service_end_date>=%s
+			and item.enable_deferred_expense = 1 and item.parent=p.name
+			and item.docstatus = 1 and ifnull(item.amount, 0) > 0
+			{conditions}
+		""",
+			(end_date, start_date),
+		)  # nosec
 
-	# For each invoice, book deferred expense
-	for invoice in invoices:
-		doc = frappe.get_doc("Purchase Invoice", invoice)
-		book_deferred_income_or_expense(doc, deferred_process, end_date)
+		# For each invoice, book deferred expense
+		for invoice in invoices:
+			doc = frappe.get_doc("Purchase Invoice", invoice)
+			book_deferred_income_or_expense(doc, deferred_process, end_date)
 
 	if frappe.flags.deferred_accounting_error:
 		send_mail(deferred_process)
@@ -103,22 +109,25 @@ def convert_deferred_revenue_to_income(deferred_process, start_date=None, end_da
 	if not end_date:
 		end_date = add_days(today(), -1)
 
-	# check for the sales invoice for which GL entries has to be done
-	invoices = frappe.db.sql_list(
-		f"""
-		select distinct item.parent
-		from `tabSales Invoice Item` item, `tabSales Invoice` p
-		where item.service_start_date<=%s and item.service_end_date>=%s
-		and item.enable_deferred_revenue = 1 and item.parent=p.name
-		and item.docstatus = 1 and ifnull(item.amount, 0) > 0
-		{conditions}
-	""",
-		(end_date, start_date),
-	)  # nosec
+	if is_bulk_deferred_booking_enabled():
+		book_deferred_entries_in_bulk("Sales Invoice", deferred_process, start_date, end_date, conditions)
+	else:
+		# check for the sales invoice for which GL entries has to be done
+		invoices = frappe.db.sql_list(
+			f"""
+			select distinct item.parent
+			from `tabSales Invoice Item` item, `tabSales Invoice` p
+			where item.service_start_date<=%s and item.service_end_date>=%s
+			and item.enable_deferred_revenue = 1 and item.parent=p.name
+			and item.docstatus = 1 and ifnull(item.amount, 0) > 0
+			{conditions}
+		""",
+			(end_date, start_date),
+		)  # nosec
 
-	for invoice in invoices:
-		doc = frappe.get_doc("Sales Invoice", invoice)
-		book_deferred_income_or_expense(doc, deferred_process, end_date)
+		for invoice in invoices:
+			doc = frappe.get_doc("Sales Invoice", invoice)
+			book_deferred_income_or_expense(doc, deferred_process, end_date)
 
 	if frappe.flags.deferred_accounting_error:
 		send_mail(deferred_process)
@@ -188,7 +197,15 @@ def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None):
 
 
 def calculate_monthly_amount(
-	doc, item, last_gl_entry, start_date, end_date, total_days, total_booking_days, account_currency
+	doc,
+	item,
+	last_gl_entry,
+	start_date,
+	end_date,
+	total_days,
+	total_booking_days,
+	account_currency,
+	already_booked=None,
 ):
 	amount, base_amount = 0, 0
 
@@ -205,8 +222,8 @@ def calculate_monthly_amount(
 
 		actual_months = rounded(total_months * prorate_factor, 1)
 
-		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+		already_booked_amount, already_booked_amount_in_account_currency = (
+			already_booked or get_already_booked_amount(doc, item)
 		)
 		base_amount = flt(item.base_net_amount / actual_months, item.precision("base_net_amount"))
 
@@ -228,8 +245,8 @@ def calculate_monthly_amount(
 			base_amount = rounded(partial_month, 1) * base_amount
 			amount = rounded(partial_month, 1) * amount
 	else:
-		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+		already_booked_amount, already_booked_amount_in_account_currency = (
+			already_booked or get_already_booked_amount(doc, item)
 		)
 		base_amount = flt(item.base_net_amount - already_booked_amount, item.precision("base_net_amount"))
 		if account_currency == doc.company_currency:
@@ -242,7 +259,9 @@ def calculate_monthly_amount(
 	return amount, base_amount
 
 
-def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, account_currency):
+def calculate_amount(
+	doc, item, last_gl_entry, total_days, total_booking_days, account_currency, already_booked=None
+):
 	amount, base_amount = 0, 0
 	if not last_gl_entry:
 		base_amount = flt(
@@ -253,8 +272,8 @@ def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, a
 		else:
 			amount = flt(item.net_amount * total_booking_days / flt(total_days), item.precision("net_amount"))
 	else:
-		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+		already_booked_amount, already_booked_amount_in_account_currency = (
+			already_booked or get_already_booked_amount(doc, item)
 		)
 
 		base_amount = flt(item.base_net_amount - already_booked_amount, item.precision("base_net_amount"))
@@ -482,6 +501,49 @@ def make_gl_entries(
 	if amount == 0:
 		return
 
+	gl_entries = get_deferred_gl_entries(
+		doc,
+		credit_account,
+		debit_account,
+		against,
+		amount,
+		base_amount,
+		posting_date,
+		project,
+		account_currency,
+		cost_center,
+		item,
+		deferred_process,
+	)
+
+	if gl_entries:
+		try:
+			make_gl_entries(gl_entries, cancel=(doc.docstatus == 2), merge_entries=True)
+			frappe.db.commit()
+		except Exception as e:
+			if frappe.flags.in_test:
+				doc.log_error(f"Error while processing deferred accounting for Invoice {doc.name}")
+				raise e
+			else:
+				frappe.db.rollback()
+				doc.log_error(f"Error while processing deferred accounting for Invoice {doc.name}")
+				frappe.flags.deferred_accounting_error = True
+
+
+def get_deferred_gl_entries(
+	doc,
+	credit_account,
+	debit_account,
+	against,
+	amount,
+	base_amount,
+	posting_date,
+	project,
+	account_currency,
+	cost_center,
+	item,
+	deferred_process=None,
+):
 	gl_entries = []
 	gl_entries.append(
 		doc.get_gl_dict(
@@ -521,19 +583,290 @@ def make_gl_entries(
 		)
 	)
 
-	if gl_entries:
-		try:
-			make_gl_entries(gl_entries, cancel=(doc.docstatus == 2), merge_entries=True)
-			frappe.db.commit()
-		except Exception as e:
-			if frappe.flags.in_test:
-				doc.log_error(f"Error while processing deferred accounting for Invoice {doc.name}")
-				raise e
-			else:
-				frappe.db.rollback()
+	return gl_entries
+
+
+def is_bulk_deferred_booking_enabled():
+	"""Deferred entries are booked in bulk only as GL Entries, not via Journal Entries"""
+	return cint(
+		frappe.db.get_single_value("Accounts Settings", "book_deferred_entries_in_bulk", cache=True)
+	) and not cint(
+		frappe.db.get_single_value("Accounts Settings", "book_deferred_entries_via_journal_entry", cache=True)
+	)
+
+
+def book_deferred_entries_in_bulk(
+	doctype, deferred_process, start_date, end_date, conditions="", dry_run=False
+):
+	"""Book the deferred revenue (Sales Invoice) or expense (Purchase Invoice) of all the eligible items
+	till `end_date`, like `book_deferred_income_or_expense` does for one invoice.
+
+	The amounts booked before are read for all the items with grouped queries, the amounts of each
+	month are computed in memory and the GL Entries of each invoice are posted together. With
+	`dry_run`, the entries to book are returned without posting them."""
+	bookings = get_deferred_bookings(doctype, start_date, end_date, conditions)
+	if dry_run:
+		return bookings
+
+	post_deferred_bookings(doctype, bookings, deferred_process)
+
+	if frappe.flags.deferred_accounting_error:
+		send_mail(deferred_process)
+
+
+def get_deferred_bookings(doctype, start_date, end_date, conditions="", batch_size=1000):
+	accounts_frozen_upto = frappe.db.get_single_value("Accounts Settings", "acc_frozen_upto")
+	book_deferred_entries_based_on = frappe.db.get_single_value(
+		"Accounts Settings", "book_deferred_entries_based_on"
+	)
+
+	bookings = []
+	for items in create_batch(get_deferred_items(doctype, start_date, end_date, conditions), batch_size):
+		booked_amounts = get_booked_deferred_amounts(doctype, items)
+		for item in items:
+			bookings.extend(
+				get_item_deferred_bookings(
+					doctype,
+					item,
+					booked_amounts[item.name],
+					end_date,
+					book_deferred_entries_based_on,
+					accounts_frozen_upto,
+				)
+			)
+
+	return bookings
+
+
+def get_deferred_items(doctype, start_date, end_date, conditions=""):
+	"""Deferred items of the submitted invoices, with the details of their invoice needed to book them"""
+	if doctype == "Sales Invoice":
+		enable_check = "enable_deferred_revenue"
+		fields = "item.income_account, item.deferred_revenue_account, p.customer as against, p.project"
+	else:
+		enable_check = "enable_deferred_expense"
+		fields = "item.deferred_expense_account, p.supplier as against, item.project"
+
+	return frappe.db.sql(
+		f"""
+		select item.name, item.parent, item.idx, item.item_code, item.expense_account, item.cost_center,
+			item.service_start_date, item.service_end_date, item.service_stop_date,
+			item.base_net_amount, item.net_amount, p.company, p.currency, {fields}
+		from `tab{doctype} Item` item, `tab{doctype}` p
+		where item.service_start_date<=%s and item.service_end_date>=%s
+		and item.{enable_check} = 1 and item.parent=p.name
+		and item.docstatus = 1 and ifnull(item.amount, 0) > 0
+		{conditions}
+		order by item.parent, item.idx
+	""",
+		(end_date, start_date),
+		as_dict=True,
+	)  # nosec
+
+
+def get_booked_deferred_amounts(doctype, items):
+	"""Amount booked till now and the date it was last booked on, for each item, from GL Entries
+	and Journal Entries like `get_already_booked_amount` and `get_booking_dates`"""
+	if doctype == "Sales Invoice":
+		dr_or_cr, deferred_account = "debit", "deferred_revenue_account"
+	else:
+		dr_or_cr, deferred_account = "credit", "deferred_expense_account"
+
+	deferred_accounts = {item.name: item.get(deferred_account) for item in items}
+	booked_amounts = {
+		item.name: frappe._dict(amount=0.0, amount_in_account_currency=0.0, posting_date=None)
+		for item in items
+	}
+
+	gle = frappe.qb.DocType("GL Entry")
+	gl_entries = (
+		frappe.qb.from_(gle)
+		.select(
+			gle.voucher_detail_no.as_("detail_no"),
+			gle.account,
+			Sum(gle[dr_or_cr]).as_("amount"),
+			Sum(gle[f"{dr_or_cr}_in_account_currency"]).as_("amount_in_account_currency"),
+			Max(gle.posting_date).as_("posting_date"),
+		)
+		.where(
+			(gle.voucher_type == doctype)
+			& (gle.voucher_detail_no.isin(list(deferred_accounts)))
+			& (gle.is_cancelled == 0)
+		)
+		.groupby(gle.voucher_detail_no, gle.account)
+	).run(as_dict=True)
+
+	je = frappe.qb.DocType("Journal Entry")
+	jea = frappe.qb.DocType("Journal Entry Account")
+	journal_entries = (
+		frappe.qb.from_(jea)
+		.inner_join(je)
+		.on(je.name == jea.parent)
+		.select(
+			jea.reference_detail_no.as_("detail_no"),
+			jea.account,
+			Sum(jea[dr_or_cr]).as_("amount"),
+			Sum(jea[f"{dr_or_cr}_in_account_currency"]).as_("amount_in_account_currency"),
+			Max(je.posting_date).as_("posting_date"),
+		)
+		.where(
+			(jea.reference_type == doctype)
+			& (jea.reference_detail_no.isin(list(deferred_accounts)))
+			& (je.docstatus < 2)
+		)
+		.groupby(jea.reference_detail_no, jea.account)
+	).run(as_dict=True)
+
+	for row in [*gl_entries, *journal_entries]:
+		if row.account != deferred_accounts.get(row.detail_no):
+			continue
+
+		booked = booked_amounts[row.detail_no]
+		booked.amount += flt(row.amount)
+		booked.amount_in_account_currency += flt(row.amount_in_account_currency)
+		if not booked.posting_date or getdate(row.posting_date) > booked.posting_date:
+			booked.posting_date = getdate(row.posting_date)
+
+	return booked_amounts
+
+
+def get_item_deferred_bookings(
+	doctype, item, booked, posting_date, book_deferred_entries_based_on, accounts_frozen_upto=None
+):
+	"""Entries to book for the item, month by month till `posting_date`"""
+	doc = frappe._dict(
+		doctype=doctype,
+		name=item.parent,
+		company=item.company,
+		currency=item.currency,
+		company_currency=erpnext.get_company_currency(item.company),
+	)
+	# child document for the precision of its fields
+	item = frappe.get_doc(dict(item, doctype=f"{doctype} Item"))
+
+	account_currency = get_account_currency(item.expense_account or item.get("income_account"))
+	if doctype == "Sales Invoice":
+		credit_account, debit_account = item.income_account, item.deferred_revenue_account
+	else:
+		credit_account, debit_account = item.deferred_expense_account, item.expense_account
+
+	total_days = date_diff(item.service_end_date, item.service_start_date) + 1
+	prev_posting_date = booked.posting_date or add_days(item.service_start_date, -1)
+
+	bookings = []
+	while True:
+		start_date, end_date, last_gl_entry = get_booking_dates(
+			doc, item, posting_date=posting_date, prev_posting_date=prev_posting_date
+		)
+		if not (start_date and end_date):
+			break
+
+		total_booking_days = date_diff(end_date, start_date) + 1
+		already_booked = (
+			booked.amount,
+			booked.amount if doc.currency == doc.company_currency else booked.amount_in_account_currency,
+		)
+
+		if book_deferred_entries_based_on == "Months":
+			amount, base_amount = calculate_monthly_amount(
+				doc,
+				item,
+				last_gl_entry,
+				start_date,
+				end_date,
+				total_days,
+				total_booking_days,
+				account_currency,
+				already_booked,
+			)
+		else:
+			amount, base_amount = calculate_amount(
+				doc, item, last_gl_entry, total_days, total_booking_days, account_currency, already_booked
+			)
+
+		if amount:
+			gl_posting_date = end_date
+			if accounts_frozen_upto and getdate(end_date) <= getdate(accounts_frozen_upto):
+				gl_posting_date = get_last_day(add_days(accounts_frozen_upto, 1))
+
+			bookings.append(
+				frappe._dict(
+					voucher_type=doctype,
+					voucher_no=item.parent,
+					voucher_detail_no=item.name,
+					idx=item.idx,
+					item_code=item.item_code,
+					posting_date=getdate(gl_posting_date),
+					credit_account=credit_account,
+					debit_account=debit_account,
+					against=item.against,
+					project=item.project,
+					cost_center=item.cost_center,
+					account_currency=account_currency,
+					amount=amount,
+					base_amount=base_amount,
+				)
+			)
+
+			booked.amount += flt(base_amount, item.precision("base_net_amount"))
+			booked.amount_in_account_currency += flt(amount, item.precision("net_amount"))
+
+		prev_posting_date = end_date
+		if not (getdate(end_date) < getdate(posting_date) and not last_gl_entry):
+			break
+
+	return bookings
+
+
+def post_deferred_bookings(doctype, bookings, deferred_process, batch_size=100):
+	"""Post the GL Entries of each invoice together, committing after every `batch_size` invoices.
+	An invoice failing to post is rolled back and logged, the other invoices are still posted."""
+	from erpnext.accounts.general_ledger import make_gl_entries
+
+	invoice_bookings = {}
+	for booking in bookings:
+		invoice_bookings.setdefault(booking.voucher_no, []).append(booking)
+
+	for invoices in create_batch(list(invoice_bookings), batch_size):
+		for invoice in invoices:
+			doc = frappe.get_doc(doctype, invoice)
+			items = {item.name: item for item in doc.get("items")}
+
+			# GL Entries are validated against the posting date of the first entry, so each date is posted apart
+			gl_entries_by_date = {}
+			for booking in invoice_bookings[invoice]:
+				gl_entries_by_date.setdefault(booking.posting_date, []).extend(
+					get_deferred_gl_entries(
+						doc,
+						booking.credit_account,
+						booking.debit_account,
+						booking.against,
+						booking.amount,
+						booking.base_amount,
+						booking.posting_date,
+						booking.project,
+						booking.account_currency,
+						booking.cost_center,
+						items[booking.voucher_detail_no],
+						deferred_process,
+					)
+				)
+
+			frappe.db.savepoint("deferred_booking")
+			try:
+				for gl_entries in gl_entries_by_date.values():
+					# not merged, so that each month booked stays a separate entry like when booked one by one
+					make_gl_entries(gl_entries, merge_entries=False)
+			except Exception as e:
 				doc.log_error(f"Error while processing deferred accounting for Invoice {doc.name}")
+				if frappe.flags.in_test:
+					raise e
+
+				frappe.db.rollback(save_point="deferred_booking")
 				frappe.flags.deferred_accounting_error = True
 
+		frappe.db.commit()
+
 
 def send_mail(deferred_process):
 	title = _("Error while processing deferred accounting for {0}").format(deferred_process)
@@ -0,0 +1,258 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Round, Sum
+from frappe.utils import cint, create_batch, cstr, flt, getdate, now
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
+	get_accounting_dimensions,
+)
+
+KEY_FIELDS = (
+	"company",
+	"account",
+	"account_currency",
+	"cost_center",
+	"project",
+	"finance_book",
+	"posting_date",
+	"fiscal_year",
+	"is_opening",
+	"is_period_closing_voucher_entry",
+)
+
+BALANCE_FIELDS = (
+	"debit",
+	"credit",
+	"debit_in_account_currency",
+	"credit_in_account_currency",
+)
+
+REBUILD_IN_PROGRESS_KEY = "account_daily_balance_rebuild_in_progress"
+
+
+class AccountDailyBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		finance_book: DF.Link | None
+		fiscal_year: DF.Link | None
+		is_opening: DF.Literal["No", "Yes"]
+		is_period_closing_voucher_entry: DF.Check
+		posting_date: DF.Date | None
+		project: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_account_daily_balance_enabled():
+	return cint(frappe.db.get_single_value("Accounts Settings", "use_account_daily_balance", cache=True))
+
+
+def use_account_daily_balance():
+	"""Check if balances can be read from Account Daily Balance instead of GL Entry.
+
+	Not used while balances are being rebuilt, or if user permissions restrict the GL Entries
+	visible to the user, since those can't be applied on the summarised balances."""
+	from frappe.desk.reportview import build_match_conditions
+
+	if not is_account_daily_balance_enabled() or frappe.cache.get_value(REBUILD_IN_PROGRESS_KEY):
+		return False
+
+	return not build_match_conditions("GL Entry")
+
+
+def update_account_daily_balance(gl_entries, sign=1):
+	"""Add (or with sign=-1, remove) amounts of GL Entries to the daily balances of their accounts"""
+	if gl_entries and is_account_daily_balance_enabled():
+		add_to_account_daily_balance(gl_entries, sign)
+
+
+def remove_voucher_from_account_daily_balance(voucher_type, voucher_no):
+	"""Remove active GL Entries of a voucher from the daily balances, before they are deleted or cancelled"""
+	if not is_account_daily_balance_enabled():
+		return
+
+	gl_entries = frappe.get_all(
+		"GL Entry",
+		filters={"voucher_type": voucher_type, "voucher_no": voucher_no, "is_cancelled": 0},
+		fields=["*"],
+	)
+	update_account_daily_balance(gl_entries, sign=-1)
+
+
+def remove_gl_entries_from_account_daily_balance(gl_entry_names):
+	"""Remove active GL Entries from the daily balances, before they are deleted or cancelled"""
+	if not (gl_entry_names and is_account_daily_balance_enabled()):
+		return
+
+	for batch in create_batch(list(gl_entry_names), 1000):
+		gl_entries = frappe.get_all(
+			"GL Entry", filters={"name": ("in", batch), "is_cancelled": 0}, fields=["*"]
+		)
+		update_account_daily_balance(gl_entries, sign=-1)
+
+
+def add_to_account_daily_balance(gl_entries, sign=1):
+	from erpnext.accounts.utils import get_currency_precision
+
+	accounting_dimensions = get_accounting_dimensions()
+	# amounts are rounded entry by entry, like balances summed from GL Entries in get_balance_on
+	precision = get_currency_precision()
+
+	balances = {}
+	for entry in gl_entries:
+		key_values = get_key_values(entry, accounting_dimensions)
+		name = hashlib.md5(
+			"\x1f".join(cstr(key_values[field]) for field in key_values).encode(), usedforsecurity=False
+		).hexdigest()
+
+		if name not in balances:
+			balances[name] = {**key_values, **dict.fromkeys(BALANCE_FIELDS, 0.0)}
+
+		for field in BALANCE_FIELDS:
+			balances[name][field] += (
+				flt(entry.get(field), precision, rounding_method="Commercial Rounding") * sign
+			)
+
+	upsert_account_daily_balance(balances, accounting_dimensions)
+
+
+def get_key_values(entry, accounting_dimensions):
+	from erpnext.accounts.utils import get_fiscal_year
+
+	posting_date = getdate(entry.get("posting_date"))
+	key_values = {
+		"company": entry.get("company"),
+		"account": entry.get("account"),
+		"account_currency": entry.get("account_currency")
+		or frappe.get_cached_value("Account", entry.get("account"), "account_currency"),
+		"cost_center": entry.get("cost_center") or None,
+		"project": entry.get("project") or None,
+		"finance_book": entry.get("finance_book") or None,
+		"posting_date": posting_date,
+		"fiscal_year": entry.get("fiscal_year")
+		or get_fiscal_year(posting_date, company=entry.get("company"))[0],
+		"is_opening": entry.get("is_opening") or "No",
+		"is_period_closing_voucher_entry": cint(
+			entry.get("is_period_closing_voucher_entry")
+			or entry.get("voucher_type") == "Period Closing Voucher"
+		),
+	}
+
+	for dimension in accounting_dimensions:
+		key_values[dimension] = entry.get(dimension) or None
+
+	return key_values
+
+
+def upsert_account_daily_balance(balances, accounting_dimensions):
+	fields = ["name", "creation", "modified", "owner", "modified_by", *KEY_FIELDS, *accounting_dimensions]
+	fields.extend(BALANCE_FIELDS)
+
+	columns = ", ".join(f"`{field}`" for field in fields)
+	mariadb_updates = ", ".join(f"`{field}` = `{field}` + values(`{field}`)" for field in BALANCE_FIELDS)
+	postgres_updates = ", ".join(
+		f"{field} = `tabAccount Daily Balance`.{field} + excluded.{field}" for field in BALANCE_FIELDS
+	)
+	timestamp, user = now(), frappe.session.user
+
+	for chunk in create_batch(list(balances.items()), 500):
+		values = []
+		for name, balance in chunk:
+			values.extend([name, timestamp, timestamp, user, user])
+			values.extend(balance[field] for field in fields[5:])
+
+		row_placeholder = "({})".format(", ".join(["%s"] * len(fields)))
+		query = "insert into `tabAccount Daily Balance` ({}) values {}".format(
+			columns, ", ".join([row_placeholder] * len(chunk))
+		)
+
+		# nosemgrep
+		frappe.db.multisql(
+			{
+				"mariadb": f"""{query}
+					on duplicate key update `modified` = values(`modified`), {mariadb_updates}""",
+				"postgres": f"""{query}
+					on conflict (name) do update set modified = excluded.modified, {postgres_updates}""",
+			},
+			values,
+		)
+
+
+def enqueue_rebuild_account_daily_balance():
+	frappe.enqueue(
+		rebuild_account_daily_balance,
+		queue="long",
+		timeout=7200,
+		enqueue_after_commit=True,
+		now=frappe.flags.in_test,
+	)
+
+
+def rebuild_account_daily_balance(company=None):
+	"""Recompute daily balances of accounts from GL Entries"""
+	# expires with the job timeout, in case the job is killed before clearing it
+	frappe.cache.set_value(REBUILD_IN_PROGRESS_KEY, 1, expires_in_sec=7200)
+
+	try:
+		companies = [company] if company else frappe.get_all("Company", pluck="name")
+		for company in companies:
+			frappe.db.delete("Account Daily Balance", {"company": company})
+			add_to_account_daily_balance(get_daily_gl_totals(company))
+
+			if not frappe.flags.in_test:
+				frappe.db.commit()
+	finally:
+		frappe.cache.delete_value(REBUILD_IN_PROGRESS_KEY)
+
+
+def get_daily_gl_totals(company):
+	from erpnext.accounts.utils import get_currency_precision
+
+	gle = frappe.qb.DocType("GL Entry")
+	precision = get_currency_precision()
+
+	is_period_closing_voucher_entry = Case().when(gle.voucher_type == "Period Closing Voucher", 1).else_(0)
+	group_by_fields = [
+		gle.company,
+		gle.account,
+		gle.account_currency,
+		gle.cost_center,
+		gle.project,
+		gle.finance_book,
+		gle.posting_date,
+		gle.fiscal_year,
+		gle.is_opening,
+		*[gle[dimension] for dimension in get_accounting_dimensions()],
+	]
+
+	return (
+		frappe.qb.from_(gle)
+		.select(
+			*group_by_fields,
+			is_period_closing_voucher_entry.as_("is_period_closing_voucher_entry"),
+			*[Sum(Round(gle[field], precision)).as_(field) for field in BALANCE_FIELDS],
+		)
+		.where((gle.company == company) & (gle.is_cancelled == 0))
+		.groupby(*group_by_fields, is_period_closing_voucher_entry)
+	).run(as_dict=True)
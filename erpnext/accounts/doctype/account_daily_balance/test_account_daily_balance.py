@@ -0,0 +1,103 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_days, nowdate
+
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	rebuild_account_daily_balance,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import (
+	setup_provisional_accounting,
+	toggle_provisional_accounting_setting,
+)
+from erpnext.accounts.utils import fix_total_debit_credit, get_balance_on
+from erpnext.stock.doctype.purchase_receipt.purchase_receipt import make_purchase_invoice
+from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
+
+
+class TestAccountDailyBalance(FrappeTestCase):
+	def get_balances(self, account, date=None):
+		return frappe.db.sql(
+			"""
+			select
+				(select sum(debit - credit) from `tabGL Entry`
+					where account = %(account)s and is_cancelled = 0 and posting_date <= %(date)s),
+				(select sum(debit - credit) from `tabAccount Daily Balance`
+					where account = %(account)s and posting_date <= %(date)s)
+			""",
+			{"account": account, "date": date or nowdate()},
+		)[0]
+
+	@change_settings("Accounts Settings", {"use_account_daily_balance": 1})
+	def test_daily_balance_follows_gl_entries(self):
+		account = "_Test Bank - _TC"
+		rebuild_account_daily_balance("_Test Company")
+
+		jv = make_journal_entry(account, "_Test Cash - _TC", 100, posting_date=add_days(nowdate(), -1))
+		jv.submit()
+		make_journal_entry(account, "_Test Cash - _TC", 250, submit=True)
+
+		gl_balance, daily_balance = self.get_balances(account)
+		self.assertEqual(gl_balance, daily_balance)
+		self.assertEqual(get_balance_on(account), gl_balance)
+
+		jv.cancel()
+		gl_balance, daily_balance = self.get_balances(account)
+		self.assertEqual(gl_balance, daily_balance)
+		self.assertEqual(get_balance_on(account, in_account_currency=False), gl_balance)
+
+		rebuild_account_daily_balance("_Test Company")
+		self.assertEqual(self.get_balances(account), (gl_balance, daily_balance))
+
+	@change_settings("Accounts Settings", {"use_account_daily_balance": 1})
+	def test_daily_balance_on_cancelling_provisional_entries(self):
+		setup_provisional_accounting()
+		account = "Provision Account - _TC"
+		rebuild_account_daily_balance("_Test Company")
+
+		pr = make_purchase_receipt(item_code="_Test Non Stock Item", posting_date=add_days(nowdate(), -2))
+		pi = make_purchase_invoice(pr.name)
+		pi.items[0].expense_account = "Cost of Goods Sold - _TC"
+		pi.save().submit()
+
+		# reverse provisional entries of the receipt are cancelled with the invoice
+		pi.cancel()
+		gl_balance, daily_balance = self.get_balances(account)
+		self.assertEqual(gl_balance, daily_balance)
+
+		toggle_provisional_accounting_setting()
+
+	@change_settings("Accounts Settings", {"use_account_daily_balance": 1})
+	def test_daily_balance_on_fixing_total_debit_credit(self):
+		account = "_Test Bank - _TC"
+		jv = make_journal_entry(account, "_Test Cash - _TC", 100, submit=True)
+
+		frappe.db.sql(
+			"""update `tabGL Entry` set debit = debit - 10
+			where voucher_type = 'Journal Entry' and voucher_no = %s and debit > 0""",
+			jv.name,
+		)
+		rebuild_account_daily_balance("_Test Company")
+
+		fix_total_debit_credit()
+		gl_balance, daily_balance = self.get_balances(account)
+		self.assertEqual(gl_balance, daily_balance)
+
+	@change_settings("Accounts Settings", {"use_account_daily_balance": 1})
+	def test_daily_balance_on_deleting_transactions(self):
+		account = "_Test Bank - _TC"
+		rebuild_account_daily_balance("_Test Company")
+
+		jv = make_journal_entry(account, "_Test Cash - _TC", 100, submit=True)
+		gl_entries = frappe.get_all(
+			"GL Entry", filters={"voucher_type": "Journal Entry", "voucher_no": jv.name}, pluck="name"
+		)
+
+		frappe.new_doc("Transaction Deletion Record").delete_docs_linked_with_specified_company(
+			"GL Entry", gl_entries
+		)
+		gl_balance, daily_balance = self.get_balances(account)
+		self.assertEqual(gl_balance, daily_balance)
@@ -6,6 +6,8 @@ import frappe
 from frappe import _, scrub
 from frappe.model.document import Document
 
+DIMENSION_FILTER_MAP_KEY = "accounting_dimension_filter_map"
+
 
 class AccountingDimensionFilter(Document):
 	# begin: auto-generated types
@@ -36,6 +38,12 @@ class AccountingDimensionFilter(Document):
 	def validate(self):
 		self.validate_applicable_accounts()
 
+	def on_update(self):
+		clear_dimension_filter_map()
+
+	def on_trash(self):
+		clear_dimension_filter_map()
+
 	def validate_applicable_accounts(self):
 		accounts = frappe.db.sql(
 			"""
@@ -64,39 +72,53 @@ class AccountingDimensionFilter(Document):
 
 def get_dimension_filter_map():
 	if not frappe.flags.get("dimension_filter_map"):
-		# nosemgrep
-		filters = frappe.db.sql(
-			"""
-			SELECT
-				a.applicable_on_account, d.dimension_value, p.accounting_dimension,
-				p.allow_or_restrict, a.is_mandatory
-			FROM
-				`tabApplicable On Account` a,
-				`tabAccounting Dimension Filter` p
-			LEFT JOIN `tabAllowed Dimension` d ON d.parent = p.name
-			WHERE
-				p.name = a.parent
-				AND p.disabled = 0
-		""",
-			as_dict=1,
+		frappe.flags.dimension_filter_map = frappe.cache.get_value(
+			DIMENSION_FILTER_MAP_KEY, build_dimension_filter_map
 		)
 
-		dimension_filter_map = {}
+	return frappe.flags.dimension_filter_map
+
 
-		for f in filters:
-			f.fieldname = scrub(f.accounting_dimension)
+def clear_dimension_filter_map():
+	from erpnext.accounts.utils import clear_cached_value
+
+	frappe.flags.dimension_filter_map = None
+	clear_cached_value(DIMENSION_FILTER_MAP_KEY)
+
+
+def build_dimension_filter_map():
+	# nosemgrep
+	filters = frappe.db.sql(
+		"""
+		SELECT
+			a.applicable_on_account, d.dimension_value, p.accounting_dimension,
+			p.allow_or_restrict, a.is_mandatory
+		FROM
+			`tabApplicable On Account` a,
+			`tabAccounting Dimension Filter` p
+		LEFT JOIN `tabAllowed Dimension` d ON d.parent = p.name
+		WHERE
+			p.name = a.parent
+			AND p.disabled = 0
+	""",
+		as_dict=1,
+	)
 
-			build_map(
-				dimension_filter_map,
-				f.fieldname,
-				f.applicable_on_account,
-				f.dimension_value,
-				f.allow_or_restrict,
-				f.is_mandatory,
-			)
-		frappe.flags.dimension_filter_map = dimension_filter_map
+	dimension_filter_map = {}
 
-	return frappe.flags.dimension_filter_map
+	for f in filters:
+		f.fieldname = scrub(f.accounting_dimension)
+
+		build_map(
+			dimension_filter_map,
+			f.fieldname,
+			f.applicable_on_account,
+			f.dimension_value,
+			f.allow_or_restrict,
+			f.is_mandatory,
+		)
+
+	return dimension_filter_map
 
 
 def build_map(map_object, dimension, account, filter_value, allow_or_restrict, is_mandatory):
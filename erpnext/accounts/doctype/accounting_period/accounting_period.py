@@ -5,6 +5,9 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils import getdate
+
+CLOSED_ACCOUNTING_PERIODS_KEY = "closed_accounting_periods"
 
 
 class OverlapError(frappe.ValidationError):
@@ -35,6 +38,12 @@ class AccountingPeriod(Document):
 	def validate(self):
 		self.validate_overlap()
 
+	def on_update(self):
+		clear_closed_accounting_periods()
+
+	def on_trash(self):
+		clear_closed_accounting_periods()
+
 	def before_insert(self):
 		self.bootstrap_doctypes_for_closing()
 
@@ -105,27 +114,62 @@ def validate_accounting_period_on_doc_save(doc, method=None):
 	else:
 		date = doc.posting_date
 
+	if accounting_period := get_closed_accounting_period(doc.company, date, doc.doctype):
+		frappe.throw(
+			_("You cannot create a {0} within the closed Accounting Period {1}").format(
+				doc.doctype, frappe.bold(accounting_period)
+			),
+			ClosedAccountingPeriod,
+		)
+
+
+def get_closed_accounting_period(company, date, doctype):
+	"""Name of the Accounting Period of the company in which `doctype` is closed on `date`"""
+	if not (company and date):
+		return
+
+	date = getdate(date)
+	for period in get_closed_accounting_periods(company):
+		if period.start_date <= date <= period.end_date and doctype in period.document_types:
+			return period.name
+
+
+def get_closed_accounting_periods(company):
+	"""Accounting Periods of the company along with the doctypes closed in them, cached till any
+	Accounting Period is changed"""
+	return frappe.cache.hget(
+		CLOSED_ACCOUNTING_PERIODS_KEY, company, lambda: build_closed_accounting_periods(company)
+	)
+
+
+def clear_closed_accounting_periods():
+	from erpnext.accounts.utils import clear_cached_value
+
+	clear_cached_value(CLOSED_ACCOUNTING_PERIODS_KEY)
+
+
+def build_closed_accounting_periods(company):
 	ap = frappe.qb.DocType("Accounting Period")
 	cd = frappe.qb.DocType("Closed Document")
 
-	accounting_period = (
+	closed_documents = (
 		frappe.qb.from_(ap)
 		.from_(cd)
-		.select(ap.name)
-		.where(
-			(ap.name == cd.parent)
-			& (ap.company == doc.company)
-			& (cd.closed == 1)
-			& (cd.document_type == doc.doctype)
-			& (date >= ap.start_date)
-			& (date <= ap.end_date)
-		)
+		.select(ap.name, ap.start_date, ap.end_date, cd.document_type)
+		.where((ap.name == cd.parent) & (ap.company == company) & (cd.closed == 1))
+		.orderby(ap.start_date)
 	).run(as_dict=1)
 
-	if accounting_period:
-		frappe.throw(
-			_("You cannot create a {0} within the closed Accounting Period {1}").format(
-				doc.doctype, frappe.bold(accounting_period[0]["name"])
-			),
-			ClosedAccountingPeriod,
-		)
+	periods = {}
+	for d in closed_documents:
+		if d.name not in periods:
+			periods[d.name] = frappe._dict(
+				name=d.name,
+				start_date=getdate(d.start_date),
+				end_date=getdate(d.end_date),
+				document_types=set(),
+			)
+
+		periods[d.name].document_types.add(d.document_type)
+
+	return list(periods.values())
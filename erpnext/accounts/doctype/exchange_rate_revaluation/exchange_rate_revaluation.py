@@ -7,8 +7,8 @@ from frappe import _, qb
 from frappe.model.document import Document
 from frappe.model.meta import get_field_precision
 from frappe.query_builder import Criterion, Order
-from frappe.query_builder.functions import NullIf, Sum
-from frappe.utils import flt, get_link_to_form
+from frappe.query_builder.functions import IfNull, Max, NullIf, Sum
+from frappe.utils import create_batch, flt, get_link_to_form
 
 import erpnext
 from erpnext.accounts.doctype.journal_entry.journal_entry import get_balance_on
@@ -160,27 +160,7 @@ class ExchangeRateRevaluation(Document):
 		account_details = []
 
 		if company and posting_date:
-			company_currency = erpnext.get_company_currency(company)
-
-			acc = qb.DocType("Account")
-			if account:
-				accounts = [account]
-			else:
-				res = (
-					qb.from_(acc)
-					.select(acc.name)
-					.where(
-						(acc.is_group == 0)
-						& (acc.report_type == "Balance Sheet")
-						& (acc.root_type.isin(["Asset", "Liability", "Equity"]))
-						& (acc.account_type != "Stock")
-						& (acc.company == company)
-						& (acc.account_currency != company_currency)
-					)
-					.orderby(acc.name)
-					.run(as_list=True)
-				)
-				accounts = [x[0] for x in res]
+			accounts = [account] if account else get_foreign_currency_accounts(company)
 
 			if accounts:
 				having_clause = (qb.Field("balance") != qb.Field("balance_in_account_currency")) & (
@@ -252,12 +232,19 @@ class ExchangeRateRevaluation(Document):
 		)
 
 		if account_details:
+			new_exchange_rates = {}
+
 			# Handle Accounts with balance in both Account/Base Currency
 			for d in [x for x in account_details if not x.zero_balance]:
 				current_exchange_rate = (
 					d.balance / d.balance_in_account_currency if d.balance_in_account_currency else 0
 				)
-				new_exchange_rate = get_exchange_rate(d.account_currency, company_currency, posting_date)
+				if d.account_currency not in new_exchange_rates:
+					new_exchange_rates[d.account_currency] = get_exchange_rate(
+						d.account_currency, company_currency, posting_date
+					)
+
+				new_exchange_rate = new_exchange_rates[d.account_currency]
 				new_balance_in_base_currency = flt(d.balance_in_account_currency * new_exchange_rate)
 				gain_loss = flt(new_balance_in_base_currency, precision) - flt(d.balance, precision)
 
@@ -278,6 +265,10 @@ class ExchangeRateRevaluation(Document):
 					}
 				)
 
+			last_exchange_rates = get_last_exchange_rates(
+				company, [x for x in account_details if x.zero_balance and x.balance == 0]
+			)
+
 			# Handle Accounts with '0' balance in Account/Base Currency
 			for d in [x for x in account_details if x.zero_balance]:
 				if d.balance != 0:
@@ -292,8 +283,7 @@ class ExchangeRateRevaluation(Document):
 					new_balance_in_account_currency = 0
 
 					current_exchange_rate = (
-						calculate_exchange_rate_using_last_gle(company, d.account, d.party_type, d.party)
-						or 0.0
+						last_exchange_rates.get((d.account, d.party_type or "", d.party or "")) or 0.0
 					)
 
 					gain_loss = new_balance_in_account_currency - (
@@ -363,6 +353,7 @@ class ExchangeRateRevaluation(Document):
 			return
 
 		unrealized_exchange_gain_loss_account = self.get_for_unrealized_gain_loss_account()
+		unrealized_exchange_gain_loss_balance = get_balance_on(unrealized_exchange_gain_loss_account)
 
 		journal_entry = frappe.new_doc("Journal Entry")
 		journal_entry.voucher_type = "Exchange Gain Or Loss"
@@ -417,7 +408,7 @@ class ExchangeRateRevaluation(Document):
 				journal_entry_accounts.append(
 					{
 						"account": unrealized_exchange_gain_loss_account,
-						"balance": get_balance_on(unrealized_exchange_gain_loss_account),
+						"balance": unrealized_exchange_gain_loss_balance,
 						"debit": 0,
 						"credit": 0,
 						"debit_in_account_currency": abs(d.gain_loss) if d.gain_loss < 0 else 0,
@@ -449,7 +440,7 @@ class ExchangeRateRevaluation(Document):
 				journal_entry_accounts.append(
 					{
 						"account": unrealized_exchange_gain_loss_account,
-						"balance": get_balance_on(unrealized_exchange_gain_loss_account),
+						"balance": unrealized_exchange_gain_loss_balance,
 						"debit": abs(d.gain_loss) if d.gain_loss < 0 else 0,
 						"credit": abs(d.gain_loss) if d.gain_loss > 0 else 0,
 						"debit_in_account_currency": 0,
@@ -565,47 +556,143 @@ class ExchangeRateRevaluation(Document):
 		return journal_entry
 
 
-def calculate_exchange_rate_using_last_gle(company, account, party_type, party):
+def get_foreign_currency_accounts(company):
+	"""Balance Sheet accounts of the company in a currency other than the company currency"""
+	company_currency = erpnext.get_company_currency(company)
+
+	acc = qb.DocType("Account")
+	res = (
+		qb.from_(acc)
+		.select(acc.name)
+		.where(
+			(acc.is_group == 0)
+			& (acc.report_type == "Balance Sheet")
+			& (acc.root_type.isin(["Asset", "Liability", "Equity"]))
+			& (acc.account_type != "Stock")
+			& (acc.company == company)
+			& (acc.account_currency != company_currency)
+		)
+		.orderby(acc.name)
+		.run(as_list=True)
+	)
+	return [x[0] for x in res]
+
+
+def get_last_exchange_rates(company, account_details, batch_size=1000):
 	"""
-	Use last GL entry to calculate exchange rate
+	Exchange rate of the last GL entry of each account and party, with grouped queries for all of them.
+	Rows without a party type take the last GL entry of the account, whatever its party.
 	"""
-	last_exchange_rate = None
-	if company and account:
-		gl = qb.DocType("GL Entry")
-
-		# build conditions
-		conditions = []
-		conditions.append(gl.company == company)
-		conditions.append(gl.account == account)
-		conditions.append(gl.is_cancelled == 0)
-		conditions.append((gl.debit > 0) | (gl.credit > 0))
-		conditions.append((gl.debit_in_account_currency > 0) | (gl.credit_in_account_currency > 0))
-		if party_type:
-			conditions.append(gl.party_type == party_type)
-		if party:
-			conditions.append(gl.party == party)
-
-		voucher_type, voucher_no = (
-			qb.from_(gl)
-			.select(gl.voucher_type, gl.voucher_no)
-			.where(Criterion.all(conditions))
-			.orderby(gl.posting_date, order=Order.desc)
-			.limit(1)
-			.run()[0]
-		)
+	last_exchange_rates = {}
+	gl = qb.DocType("GL Entry")
 
-		last_exchange_rate = (
+	for batch in create_batch(account_details, batch_size):
+		keys = {(d.account, d.party_type or "", d.party or "") for d in batch}
+
+		last_vouchers = {}
+		for with_party in (True, False):
+			group_keys = {key for key in keys if bool(key[1]) == with_party}
+			if group_keys:
+				last_vouchers.update(get_last_vouchers(company, group_keys, with_party))
+
+		if not last_vouchers:
+			continue
+
+		voucher_rates = {}
+		for account, voucher_type, voucher_no, exchange_rate in (
 			qb.from_(gl)
-			.select((gl.debit - gl.credit) / (gl.debit_in_account_currency - gl.credit_in_account_currency))
+			.select(
+				gl.account,
+				gl.voucher_type,
+				gl.voucher_no,
+				(gl.debit - gl.credit) / (gl.debit_in_account_currency - gl.credit_in_account_currency),
+			)
 			.where(
-				(gl.voucher_type == voucher_type) & (gl.voucher_no == voucher_no) & (gl.account == account)
+				gl.voucher_no.isin(list({voucher[1] for voucher in last_vouchers.values()}))
+				& gl.account.isin(list({key[0] for key in last_vouchers}))
 			)
 			.orderby(gl.posting_date, order=Order.desc)
-			.limit(1)
-			.run()[0][0]
+			.run()
+		):
+			voucher_rates.setdefault((account, voucher_type, voucher_no), exchange_rate)
+
+		for key, (voucher_type, voucher_no) in last_vouchers.items():
+			last_exchange_rates[key] = voucher_rates.get((key[0], voucher_type, voucher_no))
+
+	return last_exchange_rates
+
+
+def get_last_vouchers(company, keys, with_party):
+	"""Voucher of the last GL entry of each (account, party type, party) key"""
+	gl = qb.DocType("GL Entry")
+	party_type, party = IfNull(gl.party_type, ""), IfNull(gl.party, "")
+
+	conditions = [
+		gl.company == company,
+		gl.account.isin(list({key[0] for key in keys})),
+		gl.is_cancelled == 0,
+		(gl.debit > 0) | (gl.credit > 0),
+		(gl.debit_in_account_currency > 0) | (gl.credit_in_account_currency > 0),
+	]
+	group_by = [gl.account]
+	if with_party:
+		conditions.append(party.isin(list({key[2] for key in keys})))
+		group_by += [party_type, party]
+
+	conditions = Criterion.all(conditions)
+	last_entry = (
+		qb.from_(gl)
+		.select(*group_by, Max(gl.posting_date).as_("posting_date"))
+		.where(conditions)
+		.groupby(*group_by)
+	).as_("last_entry")
+
+	join_condition = (gl.account == last_entry.account) & (gl.posting_date == last_entry.posting_date)
+	if with_party:
+		join_condition &= (party_type == last_entry.party_type) & (party == last_entry.party)
+
+	last_vouchers = {}
+	for row in (
+		qb.from_(gl)
+		.inner_join(last_entry)
+		.on(join_condition)
+		.select(*group_by, gl.voucher_type, gl.voucher_no)
+		.where(conditions)
+		.run()
+	):
+		key = tuple(row[:3]) if with_party else (row[0], "", "")
+		if key in keys:
+			last_vouchers.setdefault(key, tuple(row[-2:]))
+
+	return last_vouchers
+
+
+def get_revaluation_batches(company, posting_date, rounding_loss_allowance=0.0, batch_size=1000):
+	"""
+	Rows of Exchange Rate Revaluation for the company in batches of `batch_size`.
+	Balances are read one account at a time, so that the rows of all the accounts
+	are not held in memory together.
+	"""
+	rows = []
+	for account in get_foreign_currency_accounts(company):
+		account_details = ExchangeRateRevaluation.get_account_balance_from_gle(
+			company=company,
+			posting_date=posting_date,
+			account=account,
+			party_type=None,
+			party=None,
+			rounding_loss_allowance=rounding_loss_allowance,
 		)
+		rows.extend(
+			ExchangeRateRevaluation.calculate_new_account_balance(company, posting_date, account_details)
+		)
+
+		while len(rows) >= batch_size:
+			yield rows[:batch_size]
+			rows = rows[batch_size:]
 
-	return last_exchange_rate
+	if rows:
+		yield rows
 
 
 @frappe.whitelist()
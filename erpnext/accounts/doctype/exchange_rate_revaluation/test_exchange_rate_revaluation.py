@@ -287,3 +287,45 @@ class TestExchangeRateRevaluation(AccountsTestMixin, FrappeTestCase):
 
 		for key, _val in expected_data.items():
 			self.assertEqual(expected_data.get(key), account_details.get(key))
+
+	@change_settings(
+		"Accounts Settings",
+		{"allow_multi_currency_invoices_against_single_party_account": 1, "allow_stale": 0},
+	)
+	def test_05_revaluation_batches(self):
+		from erpnext.accounts.doctype.exchange_rate_revaluation.exchange_rate_revaluation import (
+			get_revaluation_batches,
+		)
+
+		customers = [self.customer, "_Test ERR Batch Customer"]
+		self.create_customer(customers[1])
+
+		for customer, conversion_rate in zip(customers, [80, 82], strict=True):
+			si = create_sales_invoice(
+				item=self.item,
+				company=self.company,
+				customer=customer,
+				debit_to=self.debtors_usd,
+				posting_date=today(),
+				parent_cost_center=self.cost_center,
+				cost_center=self.cost_center,
+				rate=100,
+				price_list_rate=100,
+				do_not_submit=1,
+			)
+			si.currency = "USD"
+			si.conversion_rate = conversion_rate
+			si.save().submit()
+
+		err = frappe.new_doc("Exchange Rate Revaluation")
+		err.company = self.company
+		err.posting_date = today()
+		accounts = err.get_accounts_data()
+
+		batches = list(get_revaluation_batches(self.company, today(), batch_size=1))
+		self.assertEqual(len(batches), 2)
+		self.assertEqual([row for batch in batches for row in batch], accounts)
+		self.assertEqual(
+			sorted((row["party"], row["current_exchange_rate"]) for row in accounts),
+			sorted(zip(customers, [80.0, 82.0], strict=True)),
+		)
@@ -6,9 +6,11 @@ import unittest
 
 import frappe
 from frappe.model.naming import parse_naming_series
+from frappe.tests.utils import change_settings
 
 from erpnext.accounts.doctype.gl_entry.gl_entry import rename_gle_sle_docs
 from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 
 
 class TestGLEntry(unittest.TestCase):
@@ -141,3 +143,43 @@ class TestGLEntry(unittest.TestCase):
 
 		jv.save().submit()
 		self.assertEqual(1, jv.docstatus)
+
+	def test_ledger_entries_inserted_in_bulk(self):
+		def get_ledger_entries(voucher_no):
+			gl_entries = frappe.get_all(
+				"GL Entry",
+				filters={"voucher_type": "Sales Invoice", "voucher_no": voucher_no, "is_cancelled": 0},
+				fields=["account", "debit", "credit", "against_voucher", "docstatus"],
+				order_by="account",
+			)
+			pl_entries = frappe.get_all(
+				"Payment Ledger Entry",
+				filters={"voucher_type": "Sales Invoice", "voucher_no": voucher_no, "delinked": 0},
+				fields=["account", "amount", "against_voucher_no", "docstatus"],
+			)
+			for entry in pl_entries:
+				entry.against_voucher_no = entry.against_voucher_no == voucher_no
+
+			return gl_entries, pl_entries
+
+		si = create_sales_invoice(rate=300)
+		expected = get_ledger_entries(si.name)
+
+		with change_settings("Accounts Settings", {"insert_ledger_entries_in_bulk": 1}):
+			si_bulk = create_sales_invoice(rate=300)
+
+			gl_entries, pl_entries = get_ledger_entries(si_bulk.name)
+			for entry in gl_entries:
+				if entry.against_voucher:
+					entry.against_voucher = si.name
+
+			self.assertEqual((gl_entries, pl_entries), expected)
+			self.assertEqual(frappe.db.get_value("Sales Invoice", si_bulk.name, "outstanding_amount"), 300)
+
+			si_bulk.cancel()
+			self.assertFalse(
+				frappe.db.exists(
+					"GL Entry",
+					{"voucher_type": "Sales Invoice", "voucher_no": si_bulk.name, "is_cancelled": 0},
+				)
+			)
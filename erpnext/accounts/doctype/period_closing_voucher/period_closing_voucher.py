@@ -15,9 +15,11 @@ from erpnext.accounts.doctype.account_closing_balance.account_closing_balance im
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
-from erpnext.accounts.utils import get_account_currency, get_fiscal_year
+from erpnext.accounts.utils import clear_cached_value, get_account_currency, get_fiscal_year
 from erpnext.controllers.accounts_controller import AccountsController
 
+LAST_PERIOD_CLOSING_DATE_KEY = "last_period_closing_date"
+
 
 class PeriodClosingVoucher(AccountsController):
 	# begin: auto-generated types
@@ -129,6 +131,7 @@ class PeriodClosingVoucher(AccountsController):
 			frappe.throw(_("Currency of the Closing Account must be {0}").format(company_currency))
 
 	def on_submit(self):
+		clear_last_period_closing_date()
 		self.db_set("gle_processing_status", "In Progress")
 		self.make_gl_entries()
 
@@ -140,6 +143,7 @@ class PeriodClosingVoucher(AccountsController):
 			"Account Closing Balance",
 		)
 		self.block_if_future_closing_voucher_exists()
+		clear_last_period_closing_date()
 		self.db_set("gle_processing_status", "In Progress")
 		self.cancel_gl_entries()
 
@@ -470,6 +474,28 @@ def process_cancellation(voucher_type, voucher_no):
 		frappe.db.set_value("Period Closing Voucher", voucher_no, "gle_processing_status", "Failed")
 
 
+def get_last_period_closing_date(company):
+	"""End date of the last submitted Period Closing Voucher of the company, cached till any
+	Period Closing Voucher is submitted or cancelled"""
+	return (
+		frappe.cache.hget(
+			LAST_PERIOD_CLOSING_DATE_KEY,
+			company,
+			lambda: (
+				frappe.db.get_value(
+					"Period Closing Voucher", {"docstatus": 1, "company": company}, "max(period_end_date)"
+				)
+				or ""
+			),
+		)
+		or None
+	)
+
+
+def clear_last_period_closing_date():
+	clear_cached_value(LAST_PERIOD_CLOSING_DATE_KEY)
+
+
 def delete_closing_entries(voucher_no):
 	closing_balance = frappe.qb.DocType("Account Closing Balance")
 	frappe.qb.from_(closing_balance).delete().where(
@@ -23,3 +23,18 @@ class POSSettings(Document):
 
 	def validate(self):
 		pass
+
+	def on_update(self):
+		from erpnext.stock.doctype.item_search_token.item_search_token import (
+			enqueue_rebuild_item_search_index,
+			is_item_search_index_enabled,
+		)
+
+		old_doc = self.get_doc_before_save()
+		old_search_fields = {d.fieldname for d in old_doc.pos_search_fields} if old_doc else set()
+
+		if is_item_search_index_enabled() and old_search_fields != {
+			d.fieldname for d in self.pos_search_fields
+		}:
+			# tokens of the search fields are indexed with the items
+			enqueue_rebuild_item_search_index()
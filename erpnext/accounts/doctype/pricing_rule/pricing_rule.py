@@ -111,6 +111,17 @@ class PricingRule(Document):
 		if not self.margin_type:
 			self.margin_rate_or_amount = 0.0
 
+	def on_change(self):
+		# also called on db_set
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index
+
+		clear_pricing_rule_index()
+
+	def on_trash(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index
+
+		clear_pricing_rule_index()
+
 	def validate_duplicate_apply_on(self):
 		if self.apply_on != "Transaction":
 			apply_on_table = apply_on_dict.get(self.apply_on)
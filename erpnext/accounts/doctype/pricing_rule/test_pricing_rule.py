@@ -7,6 +7,7 @@ import unittest
 import frappe
 from frappe.tests.utils import FrappeTestCase, change_settings
 
+from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index
 from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
@@ -105,6 +106,68 @@ class TestPricingRule(FrappeTestCase):
 		details = get_item_details(args)
 		self.assertEqual(details.get("discount_percentage"), 15)
 
+	@change_settings("Accounts Settings", {"use_pricing_rule_index": 1})
+	def test_pricing_rule_index(self):
+		test_record = {
+			"doctype": "Pricing Rule",
+			"title": "_Test Pricing Rule",
+			"apply_on": "Item Code",
+			"items": [{"item_code": "_Test Item"}],
+			"currency": "USD",
+			"selling": 1,
+			"rate_or_discount": "Discount Percentage",
+			"rate": 0,
+			"discount_percentage": 10,
+			"company": "_Test Company",
+		}
+		frappe.get_doc(test_record.copy()).insert()
+
+		args = frappe._dict(
+			{
+				"item_code": "_Test Item",
+				"company": "_Test Company",
+				"price_list": "_Test Price List",
+				"currency": "_Test Currency",
+				"doctype": "Sales Order",
+				"conversion_rate": 1,
+				"price_list_currency": "_Test Currency",
+				"plc_conversion_rate": 1,
+				"order_type": "Sales",
+				"customer": "_Test Customer",
+				"name": None,
+			}
+		)
+		self.assertEqual(get_item_details(args.copy()).get("discount_percentage"), 10)
+
+		# rules for other customers or item groups not containing the item are not applied
+		prule = frappe.get_doc(test_record.copy())
+		prule.update({"applicable_for": "Customer", "customer": "_Test Customer 1", "priority": 1})
+		prule.discount_percentage = 20
+		prule.title = "_Test Pricing Rule for Customer"
+		prule.insert()
+		self.assertEqual(get_item_details(args.copy()).get("discount_percentage"), 10)
+
+		prule = frappe.get_doc(test_record.copy())
+		prule.apply_on = "Item Group"
+		prule.items = []
+		prule.append("item_groups", {"item_group": "All Item Groups"})
+		prule.title = "_Test Pricing Rule for Item Group"
+		prule.discount_percentage = 15
+		prule.insert()
+		self.assertEqual(get_item_details(args.copy()).get("discount_percentage"), 10)
+		self.assertEqual(
+			get_item_details(frappe._dict(args, item_code="_Test Item 2")).get("discount_percentage"), 15
+		)
+
+		# index is rebuilt on change of pricing rule
+		prule.db_set("disable", 1)
+		self.assertFalse(
+			get_item_details(frappe._dict(args, item_code="_Test Item 2")).get("discount_percentage")
+		)
+
+		args.customer = "_Test Customer 1"
+		self.assertEqual(get_item_details(args.copy()).get("discount_percentage"), 20)
+
 	def test_pricing_rule_for_margin(self):
 		from erpnext.stock.get_item_details import get_item_details
 
@@ -1547,6 +1610,8 @@ def delete_existing_pricing_rules():
 	]:
 		frappe.db.sql(f"delete from `tab{doctype}`")
 
+	clear_pricing_rule_index()
+
 
 def make_item_price(item, price_list_name, item_price):
 	frappe.get_doc(
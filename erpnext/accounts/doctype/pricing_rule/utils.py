@@ -10,7 +10,7 @@ import math
 
 import frappe
 from frappe import _, bold
-from frappe.utils import cint, flt, fmt_money, get_link_to_form, getdate, today
+from frappe.utils import cint, cstr, flt, fmt_money, get_link_to_form, getdate, today
 
 from erpnext.setup.doctype.item_group.item_group import get_child_item_groups
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
@@ -23,12 +23,30 @@ class MultiplePricingRuleConflict(frappe.ValidationError):
 
 apply_on_table = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
+SELLING_DOCTYPES = (
+	"Quotation",
+	"Quotation Item",
+	"Sales Order",
+	"Sales Order Item",
+	"Delivery Note",
+	"Delivery Note Item",
+	"Sales Invoice",
+	"Sales Invoice Item",
+	"POS Invoice",
+	"POS Invoice Item",
+)
+
+PRICING_RULE_INDEX_KEY = "pricing_rule_index"
+
 
 def get_pricing_rules(args, doc=None):
 	pricing_rules = []
 	values = {}
 
-	if not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
+	if use_pricing_rule_index():
+		if not get_pricing_rule_index().has_rules_for.get(args.transaction_type):
+			return
+	elif not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
 		return
 
 	for apply_on in ["Item Code", "Item Group", "Brand"]:
@@ -105,6 +123,9 @@ def _get_pricing_rules(apply_on, args, values):
 	if not args.get(apply_on_field):
 		return []
 
+	if use_pricing_rule_index():
+		return get_pricing_rules_from_index(apply_on, args)
+
 	child_doc = f"`tabPricing Rule {apply_on}`"
 
 	conditions = item_variant_condition = item_conditions = ""
@@ -184,13 +205,27 @@ def apply_multiple_pricing_rules(pricing_rules):
 def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 	field = frappe.scrub(parenttype)
 	condition = ""
-	if args.get(field):
-		if not frappe.flags.tree_conditions:
-			frappe.flags.tree_conditions = {}
-		key = (parenttype, args.get(field))
-		if key in frappe.flags.tree_conditions:
-			return frappe.flags.tree_conditions[key]
 
+	parent_groups = _get_tree_values(args, parenttype, allow_blank)
+	if parent_groups:
+		condition = "ifnull({table}.{field}, '') in ({parent_groups})".format(
+			table=table, field=field, parent_groups=", ".join(frappe.db.escape(d) for d in parent_groups)
+		)
+
+	return condition
+
+
+def _get_tree_values(args, parenttype, allow_blank=True):
+	"""Ancestors of the `parenttype` node in args (and the root), which pricing rules may be set for"""
+	field = frappe.scrub(parenttype)
+	if not args.get(field):
+		return []
+
+	if not frappe.flags.tree_parent_groups:
+		frappe.flags.tree_parent_groups = {}
+
+	key = (parenttype, args.get(field))
+	if key not in frappe.flags.tree_parent_groups:
 		try:
 			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
 		except TypeError:
@@ -215,15 +250,13 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 			if root_name and root_name[0][0]:
 				parent_groups.append(root_name[0][0])
 
-		if parent_groups:
-			if allow_blank:
-				parent_groups.append("")
-			condition = "ifnull({table}.{field}, '') in ({parent_groups})".format(
-				table=table, field=field, parent_groups=", ".join(frappe.db.escape(d) for d in parent_groups)
-			)
+		frappe.flags.tree_parent_groups[key] = parent_groups
 
-			frappe.flags.tree_conditions[key] = condition
-	return condition
+	parent_groups = list(frappe.flags.tree_parent_groups[key])
+	if parent_groups and allow_blank:
+		parent_groups.append("")
+
+	return parent_groups
 
 
 def get_other_conditions(conditions, values, args):
@@ -244,18 +277,7 @@ def get_other_conditions(conditions, values, args):
 			and ifnull(`tabPricing Rule`.valid_upto, '2500-12-31')"""
 		values["transaction_date"] = args.get("transaction_date")
 
-	if args.get("doctype") in [
-		"Quotation",
-		"Quotation Item",
-		"Sales Order",
-		"Sales Order Item",
-		"Delivery Note",
-		"Delivery Note Item",
-		"Sales Invoice",
-		"Sales Invoice Item",
-		"POS Invoice",
-		"POS Invoice Item",
-	]:
+	if args.get("doctype") in SELLING_DOCTYPES:
 		conditions += """ and ifnull(`tabPricing Rule`.selling, 0) = 1"""
 	else:
 		conditions += """ and ifnull(`tabPricing Rule`.buying, 0) = 1"""
@@ -263,6 +285,132 @@ def get_other_conditions(conditions, values, args):
 	return conditions
 
 
+def use_pricing_rule_index():
+	return cint(frappe.db.get_single_value("Accounts Settings", "use_pricing_rule_index", cache=True))
+
+
+def get_pricing_rule_index():
+	return frappe.cache.get_value(PRICING_RULE_INDEX_KEY, build_pricing_rule_index)
+
+
+def clear_pricing_rule_index():
+	from erpnext.accounts.utils import clear_cached_value
+
+	clear_cached_value(PRICING_RULE_INDEX_KEY)
+
+
+def build_pricing_rule_index():
+	"""Compile active pricing rules along with the item codes, item groups and brands they apply on,
+	indexed by those values and by the values of rules applied on other items"""
+	rules = {rule.name: rule for rule in frappe.get_all("Pricing Rule", filters={"disable": 0}, fields=["*"])}
+
+	index = frappe._dict(
+		rules=rules,
+		has_rules_for={
+			field: any(rule.get(field) for rule in rules.values()) for field in ("selling", "buying")
+		},
+	)
+
+	for apply_on in apply_on_table:
+		apply_on_field = frappe.scrub(apply_on)
+		apply_on_index = index[apply_on_field] = frappe._dict(children={}, by_value={}, by_other={})
+
+		for row in frappe.get_all(
+			f"Pricing Rule {apply_on}",
+			filters={"parenttype": "Pricing Rule"},
+			fields=["parent", apply_on_field, "uom"],
+			order_by="idx",
+		):
+			if row.parent not in rules:
+				continue
+
+			apply_on_index.children.setdefault(row.parent, []).append((row.get(apply_on_field), row.uom))
+			apply_on_index.by_value.setdefault(row.get(apply_on_field), set()).add(row.parent)
+
+		for name, rule in rules.items():
+			if rule.apply_rule_on_other and rule.get(f"other_{apply_on_field}"):
+				apply_on_index.by_other.setdefault(rule.get(f"other_{apply_on_field}"), set()).add(name)
+
+	return index
+
+
+def get_pricing_rules_from_index(apply_on, args):
+	"""Same as the query in `_get_pricing_rules`, matched against the compiled pricing rule index"""
+	apply_on_field = frappe.scrub(apply_on)
+	apply_on_value = args.get(apply_on_field)
+	apply_on_index = get_pricing_rule_index()[apply_on_field]
+
+	if apply_on_field == "item_group":
+		item_values = _get_tree_values(args, "Item Group", False)
+	else:
+		item_values = [apply_on_value]
+
+	if apply_on_field == "item_code" and "variant_of" not in args:
+		args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
+
+	variant_of = args.variant_of if apply_on_field == "item_code" else None
+	match_uom = apply_on_field in ("item_code", "item_group") and args.get("uom")
+
+	if not args.price_list:
+		args.price_list = None
+
+	candidates = set(apply_on_index.by_other.get(apply_on_value, ()))
+	for value in [*item_values, variant_of]:
+		candidates.update(apply_on_index.by_value.get(value, ()))
+
+	rules = get_pricing_rule_index().rules
+	allowed_values = get_allowed_values_for_pricing_rule(args)
+
+	pricing_rules = []
+	for name in candidates:
+		rule = rules[name]
+		if not is_pricing_rule_applicable(rule, args, allowed_values):
+			continue
+
+		applied_on_other = rule.apply_rule_on_other and rule.get(f"other_{apply_on_field}") == apply_on_value
+		for value, uom in apply_on_index.children.get(name, []):
+			if (
+				(cstr(value) in item_values and (not match_uom or cstr(uom) in (args.uom, "")))
+				or applied_on_other
+				or (variant_of and value == variant_of)
+			):
+				pricing_rules.append(frappe._dict(rule, **{apply_on_field: value, "uom": uom}))
+
+	return sorted(pricing_rules, key=lambda d: (cstr(d.priority), d.name), reverse=True)
+
+
+def get_allowed_values_for_pricing_rule(args):
+	"""Values of Pricing Rule fields applicable for args, as in the conditions of `get_other_conditions`"""
+	allowed_values = {}
+	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
+		allowed_values[field] = {args.get(field), ""} if args.get(field) else {""}
+
+	for parenttype in ["Customer Group", "Territory", "Supplier Group", "Warehouse"]:
+		if parent_groups := _get_tree_values(args, parenttype):
+			allowed_values[frappe.scrub(parenttype)] = set(parent_groups)
+
+	allowed_values["for_price_list"] = {args.price_list, ""}
+
+	return allowed_values
+
+
+def is_pricing_rule_applicable(rule, args, allowed_values):
+	if not cint(rule.get(args.transaction_type)):
+		return False
+
+	if not cint(rule.selling if args.get("doctype") in SELLING_DOCTYPES else rule.buying):
+		return False
+
+	if args.get("transaction_date") and not (
+		getdate(rule.valid_from or "2000-01-01")
+		<= getdate(args.transaction_date)
+		<= getdate(rule.valid_upto or "2500-12-31")
+	):
+		return False
+
+	return all((rule.get(field) or "") in values for field, values in allowed_values.items())
+
+
 def filter_pricing_rules(args, pricing_rules, doc=None):
 	if not isinstance(pricing_rules, list):
 		pricing_rules = [pricing_rules]
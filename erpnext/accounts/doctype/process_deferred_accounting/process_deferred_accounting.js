@@ -49,6 +49,31 @@ frappe.ui.form.on("Process Deferred Accounting", {
 		}
 	},
 
+	refresh: function (frm) {
+		if (frm.doc.docstatus === 0 && !frm.is_new()) {
+			frm.add_custom_button(__("Show Preview"), () => {
+				frm.call({
+					method: "get_preview",
+					doc: frm.doc,
+					freeze: true,
+					freeze_message: __("Generating Preview"),
+					callback: function (r) {
+						if (r && r.message) {
+							frappe.render_grid({
+								title: __("Deferred Entries"),
+								subtitle: frm.doc.name,
+								content: r.message,
+								print_settings: { orientation: "landscape" },
+								columns: [],
+								data: [],
+							});
+						}
+					},
+				});
+			});
+		}
+	},
+
 	onload: function (frm) {
 		if (frm.doc.posting_date && frm.doc.docstatus === 0) {
 			frm.set_value("start_date", frappe.datetime.add_months(frm.doc.posting_date, -1));
@@ -7,6 +7,7 @@ from frappe import _
 from frappe.model.document import Document
 
 from erpnext.accounts.deferred_revenue import (
+	book_deferred_entries_in_bulk,
 	build_conditions,
 	convert_deferred_expense_to_expense,
 	convert_deferred_revenue_to_income,
@@ -43,6 +44,20 @@ class ProcessDeferredAccounting(Document):
 		else:
 			convert_deferred_expense_to_expense(self.name, self.start_date, self.end_date, conditions)
 
+	@frappe.whitelist()
+	def get_preview(self):
+		"""Deferred entries that will be booked on submit, rendered as a table"""
+		doctype = "Sales Invoice" if self.type == "Income" else "Purchase Invoice"
+		conditions = build_conditions(self.type, self.account, self.company)
+		bookings = book_deferred_entries_in_bulk(
+			doctype, self.name, self.start_date, self.end_date, conditions, dry_run=True
+		)
+
+		return frappe.render_template(
+			"erpnext/accounts/doctype/process_deferred_accounting/process_deferred_accounting.html",
+			{"bookings": bookings},
+		)
+
 	def on_cancel(self):
 		self.ignore_linked_doctypes = ["GL Entry"]
 		gl_entries = frappe.get_all(
@@ -4,7 +4,9 @@
 import unittest
 
 import frappe
+from frappe.tests.utils import change_settings
 
+from erpnext.accounts.deferred_revenue import book_deferred_entries_in_bulk
 from erpnext.accounts.doctype.account.test_account import create_account
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import (
 	check_gl_entries,
@@ -65,6 +67,66 @@ class TestProcessDeferredAccounting(unittest.TestCase):
 		check_gl_entries(self, si.name, expected_gle, "2023-07-01")
 		change_acc_settings()
 
+	@change_settings("Accounts Settings", {"book_deferred_entries_in_bulk": 1})
+	def test_book_deferred_entries_in_bulk(self):
+		change_acc_settings(acc_frozen_upto="2023-05-31", book_deferred_entries_based_on="Months")
+
+		deferred_account = create_account(
+			account_name="Deferred Revenue for Bulk Booking",
+			parent_account="Current Liabilities - _TC",
+			company="_Test Company",
+		)
+
+		item = create_item("_Test Item for Bulk Deferred Accounting")
+		item.enable_deferred_revenue = 1
+		item.deferred_revenue_account = deferred_account
+		item.no_of_months = 12
+		item.save()
+
+		si = create_sales_invoice(
+			item=item.name, rate=3000, update_stock=0, posting_date="2023-07-01", do_not_submit=True
+		)
+		si.items[0].enable_deferred_revenue = 1
+		si.items[0].service_start_date = "2023-05-01"
+		si.items[0].service_end_date = "2023-07-31"
+		si.items[0].deferred_revenue_account = deferred_account
+		si.save()
+		si.submit()
+
+		conditions = f"AND item.deferred_revenue_account = {frappe.db.escape(deferred_account)}"
+		preview = book_deferred_entries_in_bulk(
+			"Sales Invoice", None, "2023-05-01", "2023-06-30", conditions, dry_run=True
+		)
+		self.assertEqual([(d.voucher_no, d.base_amount) for d in preview], [(si.name, 1000), (si.name, 1000)])
+		self.assertFalse(frappe.db.exists("GL Entry", {"voucher_no": si.name, "posting_date": "2023-06-30"}))
+
+		process_deferred_accounting = frappe.get_doc(
+			dict(
+				doctype="Process Deferred Accounting",
+				posting_date="2023-07-01",
+				start_date="2023-05-01",
+				end_date="2023-06-30",
+				type="Income",
+				account=deferred_account,
+			)
+		)
+
+		process_deferred_accounting.insert()
+		process_deferred_accounting.submit()
+
+		# same entries as booking the invoice on its own
+		expected_gle = [
+			["Debtors - _TC", 3000, 0.0, "2023-07-01"],
+			[deferred_account, 0.0, 3000, "2023-07-01"],
+			["Sales - _TC", 0.0, 1000, "2023-06-30"],
+			[deferred_account, 1000, 0.0, "2023-06-30"],
+			["Sales - _TC", 0.0, 1000, "2023-06-30"],
+			[deferred_account, 1000, 0.0, "2023-06-30"],
+		]
+
+		check_gl_entries(self, si.name, expected_gle, "2023-07-01")
+		change_acc_settings()
+
 	def test_pda_submission_and_cancellation(self):
 		pda = frappe.get_doc(
 			dict(
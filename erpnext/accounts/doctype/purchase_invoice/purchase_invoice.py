@@ -10,6 +10,10 @@ from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate,
 
 import erpnext
 from erpnext.accounts.deferred_revenue import validate_service_stop_date
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	is_account_daily_balance_enabled,
+	remove_gl_entries_from_account_daily_balance,
+)
 from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
 	validate_docs_for_deferred_accounting,
 	validate_docs_for_voucher_types,
@@ -808,15 +812,18 @@ class PurchaseInvoice(BuyingController):
 		if rows:
 			# cancel gl entries
 			gle = qb.DocType("GL Entry")
-			gle_update_query = (
-				qb.update(gle)
-				.set(gle.is_cancelled, 1)
-				.where(
-					(gle.voucher_type == "Purchase Receipt")
-					& (gle.voucher_no.isin(purchase_receipts))
-					& (gle.voucher_detail_no.isin(rows))
-				)
+			condition = (
+				(gle.voucher_type == "Purchase Receipt")
+				& (gle.voucher_no.isin(purchase_receipts))
+				& (gle.voucher_detail_no.isin(rows))
 			)
+
+			if is_account_daily_balance_enabled():
+				remove_gl_entries_from_account_daily_balance(
+					qb.from_(gle).select(gle.name).where(condition & (gle.is_cancelled == 0)).run(pluck=True)
+				)
+
+			gle_update_query = qb.update(gle).set(gle.is_cancelled, 1).where(condition)
 			gle_update_query.run()
 
 	def update_supplier_outstanding(self, update_outstanding):
@@ -146,6 +146,9 @@ class RepostAccountingLedger(Document):
 
 @frappe.whitelist()
 def start_repost(account_repost_doc=str) -> None:
+	from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+		remove_voucher_from_account_daily_balance,
+	)
 	from erpnext.accounts.general_ledger import make_reverse_gl_entries
 
 	frappe.flags.through_repost_accounting_ledger = True
@@ -160,6 +163,7 @@ def start_repost(account_repost_doc=str) -> None:
 				doc = frappe.get_doc(x.voucher_type, x.voucher_no)
 
 				if repost_doc.delete_cancelled_entries:
+					remove_voucher_from_account_daily_balance(doc.doctype, doc.name)
 					frappe.db.delete(
 						"GL Entry", filters={"voucher_type": doc.doctype, "voucher_no": doc.name}
 					)
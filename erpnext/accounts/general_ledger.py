@@ -10,15 +10,32 @@ from frappe.model.meta import get_field_precision
 from frappe.utils import cint, flt, formatdate, get_link_to_form, getdate, now
 
 import erpnext
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	is_account_daily_balance_enabled,
+	remove_voucher_from_account_daily_balance,
+	update_account_daily_balance,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
 from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_filter import (
 	get_dimension_filter_map,
 )
-from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
+from erpnext.accounts.doctype.accounting_period.accounting_period import (
+	ClosedAccountingPeriod,
+	get_closed_accounting_period,
+)
 from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
-from erpnext.accounts.utils import create_payment_ledger_entry
+from erpnext.accounts.doctype.gl_entry.gl_entry import (
+	update_outstanding_amt,
+	validate_balance_type,
+	validate_frozen_account,
+)
+from erpnext.accounts.utils import (
+	create_payment_ledger_entry,
+	insert_documents_in_bulk,
+	is_bulk_ledger_insert_enabled,
+)
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
 
@@ -141,31 +158,15 @@ def validate_disabled_accounts(gl_map):
 
 
 def validate_accounting_period(gl_map):
-	accounting_periods = frappe.db.sql(
-		""" SELECT
-			ap.name as name
-		FROM
-			`tabAccounting Period` ap, `tabClosed Document` cd
-		WHERE
-			ap.name = cd.parent
-			AND ap.company = %(company)s
-			AND cd.closed = 1
-			AND cd.document_type = %(voucher_type)s
-			AND %(date)s between ap.start_date and ap.end_date
-			""",
-		{
-			"date": gl_map[0].posting_date,
-			"company": gl_map[0].company,
-			"voucher_type": gl_map[0].voucher_type,
-		},
-		as_dict=1,
+	accounting_period = get_closed_accounting_period(
+		gl_map[0].company, gl_map[0].posting_date, gl_map[0].voucher_type
 	)
 
-	if accounting_periods:
+	if accounting_period:
 		frappe.throw(
 			_(
 				"You cannot create or cancel any accounting entries with in the closed Accounting Period {0}"
-			).format(frappe.bold(accounting_periods[0].name)),
+			).format(frappe.bold(accounting_period)),
 			ClosedAccountingPeriod,
 		)
 
@@ -241,6 +242,7 @@ def get_cost_center_allocation_data(company, posting_date, cost_center):
 
 def merge_similar_entries(gl_map, precision=None):
 	merged_gl_map = []
+	merged_entries = {}
 	accounting_dimensions = get_accounting_dimensions()
 	merge_properties = get_merge_properties(accounting_dimensions)
 
@@ -252,7 +254,7 @@ def merge_similar_entries(gl_map, precision=None):
 		entry.merge_key = get_merge_key(entry, merge_properties)
 		# if there is already an entry in this account then just add it
 		# to that entry
-		same_head = check_if_in_list(entry, merged_gl_map)
+		same_head = merged_entries.get(entry.merge_key)
 		if same_head:
 			same_head.debit = flt(same_head.debit) + flt(entry.debit)
 			same_head.debit_in_account_currency = flt(same_head.debit_in_account_currency) + flt(
@@ -270,6 +272,7 @@ def merge_similar_entries(gl_map, precision=None):
 			)
 		else:
 			merged_gl_map.append(entry)
+			merged_entries[entry.merge_key] = entry
 
 	company = gl_map[0].company if gl_map else erpnext.get_default_company()
 	company_currency = erpnext.get_company_currency(company)
@@ -383,7 +386,14 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 
 	for entry in gl_map:
 		validate_allowed_dimensions(entry, dimension_filter_map)
-		make_entry(entry, adv_adj, update_outstanding, from_repost)
+
+	if is_bulk_ledger_insert_enabled():
+		make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost)
+	else:
+		for entry in gl_map:
+			make_entry(entry, adv_adj, update_outstanding, from_repost)
+
+	update_account_daily_balance(gl_map)
 
 
 def make_entry(args, adv_adj, update_outstanding, from_repost=False):
@@ -400,6 +410,70 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 		validate_expense_against_budget(args)
 
 
+def make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost=False):
+	"""Submit the GL Entries of a voucher with one batched insert.
+
+	Each entry is validated like in `make_entry`, but the checks depending only on the account run
+	once per account and the outstanding of each against voucher is updated once, after all the
+	entries are inserted."""
+	validate = not from_repost and gl_map[0].voucher_type != "Period Closing Voucher"
+
+	gl_entries, accounts, against_vouchers = [], set(), {}
+	for args in gl_map:
+		gle = frappe.new_doc("GL Entry")
+		gle.update(args)
+		gle.flags.from_repost = from_repost
+		gle.flags.adv_adj = adv_adj
+		gle.docstatus = 1
+		gle.set_new_name()
+		gle.validate()
+
+		if validate:
+			gle.validate_dimensions_for_pl_and_bs()
+			if gle.account not in accounts:
+				accounts.add(gle.account)
+				gle.validate_account_details(adv_adj)
+				validate_frozen_account(gle.account, adv_adj)
+
+			if key := get_against_voucher_to_update(gle, update_outstanding):
+				against_vouchers.setdefault(key)
+
+		gl_entries.append(gle)
+
+	insert_documents_in_bulk(gl_entries)
+
+	if validate:
+		for account in accounts:
+			validate_balance_type(account, adv_adj)
+
+		for args in against_vouchers:
+			update_outstanding_amt(*args)
+
+		for args in gl_map:
+			validate_expense_against_budget(args)
+
+
+def get_against_voucher_to_update(gle, update_outstanding):
+	"""Same conditions as `GL Entry.on_update` for updating the outstanding of the against voucher"""
+	if (
+		gle.voucher_type == "Journal Entry"
+		and frappe.get_cached_value("Journal Entry", gle.voucher_no, "voucher_type")
+		== "Exchange Gain Or Loss"
+	):
+		return
+
+	if frappe.get_cached_value("Account", gle.account, "account_type") in ["Receivable", "Payable"]:
+		return
+
+	if (
+		gle.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+		and gle.against_voucher
+		and (update_outstanding or "Yes") == "Yes"
+		and not frappe.flags.is_reverse_depr_entry
+	):
+		return (gle.account, gle.party_type, gle.party, gle.against_voucher_type, gle.against_voucher)
+
+
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
 	if gl_map and gl_map[0].voucher_type != "Journal Entry":
@@ -669,31 +743,42 @@ def make_reverse_gl_entries(
 			# Only cancel GL entries for unlinked reference using `voucher_detail_no`
 			gle = frappe.qb.DocType("GL Entry")
 			for x in gl_entries:
+				condition = (
+					(gle.company == x.company)
+					& (gle.account == x.account)
+					& (gle.party_type == x.party_type)
+					& (gle.party == x.party)
+					& (gle.voucher_type == x.voucher_type)
+					& (gle.voucher_no == x.voucher_no)
+					& (gle.against_voucher_type == x.against_voucher_type)
+					& (gle.against_voucher == x.against_voucher)
+					& (gle.voucher_detail_no == x.voucher_detail_no)
+				)
 				query = (
 					frappe.qb.update(gle)
 					.set(gle.modified, now())
 					.set(gle.modified_by, frappe.session.user)
-					.where(
-						(gle.company == x.company)
-						& (gle.account == x.account)
-						& (gle.party_type == x.party_type)
-						& (gle.party == x.party)
-						& (gle.voucher_type == x.voucher_type)
-						& (gle.voucher_no == x.voucher_no)
-						& (gle.against_voucher_type == x.against_voucher_type)
-						& (gle.against_voucher == x.against_voucher)
-						& (gle.voucher_detail_no == x.voucher_detail_no)
-					)
+					.where(condition)
 				)
 
 				if not immutable_ledger_enabled:
 					query = query.set(gle.is_cancelled, True)
 
+					if is_account_daily_balance_enabled():
+						cancelled_entries = (
+							frappe.qb.from_(gle).select("*").where(condition & (gle.is_cancelled == 0))
+						).run(as_dict=True)
+						update_account_daily_balance(cancelled_entries, sign=-1)
+
 				query.run()
 		else:
 			if not immutable_ledger_enabled:
+				remove_voucher_from_account_daily_balance(
+					gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"]
+				)
 				set_as_cancel(gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"])
 
+		reverse_entries = []
 		for entry in gl_entries:
 			new_gle = copy.deepcopy(entry)
 			new_gle["name"] = None
@@ -721,6 +806,11 @@ def make_reverse_gl_entries(
 
 			if new_gle["debit"] or new_gle["credit"]:
 				make_entry(new_gle, adv_adj, "Yes")
+				reverse_entries.append(new_gle)
+
+		if immutable_ledger_enabled:
+			# reverse entries are not marked as cancelled
+			update_account_daily_balance(reverse_entries)
 
 
 def check_freezing_date(posting_date, adv_adj=False):
@@ -732,10 +822,10 @@ def check_freezing_date(posting_date, adv_adj=False):
 	Hence stop admin to bypass if accounts are freezed
 	"""
 	if not adv_adj:
-		acc_frozen_upto = frappe.db.get_value("Accounts Settings", None, "acc_frozen_upto")
+		acc_frozen_upto = frappe.db.get_single_value("Accounts Settings", "acc_frozen_upto", cache=True)
 		if acc_frozen_upto:
-			frozen_accounts_modifier = frappe.db.get_value(
-				"Accounts Settings", None, "frozen_accounts_modifier"
+			frozen_accounts_modifier = frappe.db.get_single_value(
+				"Accounts Settings", "frozen_accounts_modifier", cache=True
 			)
 			if getdate(posting_date) <= getdate(acc_frozen_upto) and (
 				frozen_accounts_modifier not in frappe.get_roles() or frappe.session.user == "Administrator"
@@ -748,16 +838,18 @@ def check_freezing_date(posting_date, adv_adj=False):
 
 
 def validate_against_pcv(is_opening, posting_date, company):
-	if is_opening and frappe.db.exists("Period Closing Voucher", {"docstatus": 1, "company": company}):
+	from erpnext.accounts.doctype.period_closing_voucher.period_closing_voucher import (
+		get_last_period_closing_date,
+	)
+
+	last_pcv_date = get_last_period_closing_date(company)
+
+	if is_opening and last_pcv_date:
 		frappe.throw(
 			_("Opening Entry can not be created after Period Closing Voucher is created."),
 			title=_("Invalid Opening Entry"),
 		)
 
-	last_pcv_date = frappe.db.get_value(
-		"Period Closing Voucher", {"docstatus": 1, "company": company}, "max(period_end_date)"
-	)
-
 	if last_pcv_date and getdate(posting_date) <= getdate(last_pcv_date):
 		message = _("Books have been closed till the period ending on {0}").format(formatdate(last_pcv_date))
 		message += "</br >"
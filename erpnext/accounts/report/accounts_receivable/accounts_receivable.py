@@ -3,13 +3,14 @@
 
 
 from collections import OrderedDict
+from itertools import groupby
 
 import frappe
 from frappe import _, qb, query_builder, scrub
 from frappe.desk.reportview import build_match_conditions
 from frappe.query_builder import Criterion
 from frappe.query_builder.functions import Date, Substring, Sum
-from frappe.utils import cint, cstr, flt, getdate, nowdate
+from frappe.utils import cint, create_batch, cstr, flt, getdate, nowdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
@@ -31,6 +32,12 @@ from erpnext.accounts.utils import get_currency_precision, get_party_types_from_
 #  8. Invoice details like Sales Persons, Delivery Notes are also fetched comma separated
 #  9. Report amounts are in party currency if in_party_currency is selected, otherwise company currency
 # 10. This report is based on Payment Ledger Entries
+# 11. With the "Streaming" fetch method, entries are loaded for a batch of STREAMING_PARTY_BATCH_SIZE
+#     parties at a time, so the Payment Ledger Entries held in memory are bounded by one batch of
+#     parties instead of the whole ledger. Rows are then ordered by party
+
+# number of parties whose Payment Ledger Entries are fetched together in "Streaming" fetch method
+STREAMING_PARTY_BATCH_SIZE = 100
 
 
 def execute(filters=None):
@@ -100,7 +107,9 @@ class ReceivablePayableReport:
 		self.get_sales_invoices_or_customers_based_on_sales_person()
 
 		# Get invoice details like bill_no, due_date etc for all invoices
-		self.get_invoice_details()
+		# (fetched along with each batch of parties while streaming)
+		if self.ple_fetch_method != "Streaming":
+			self.get_invoice_details()
 
 		# fetch future payments against invoices
 		self.get_future_payments()
@@ -120,6 +129,10 @@ class ReceivablePayableReport:
 			self.fetch_ple_in_buffered_cursor()
 		elif self.ple_fetch_method == "UnBuffered Cursor":
 			self.fetch_ple_in_unbuffered_cursor()
+		elif self.ple_fetch_method == "Streaming":
+			self.fetch_ple_by_party()
+			self.append_total_rows()
+			return
 
 		# Build delivery note map against all sales invoices
 		self.build_delivery_note_map()
@@ -152,6 +165,49 @@ class ReceivablePayableReport:
 			self.update_voucher_balance(ple)
 		delattr(self, "ple_entries")
 
+	def fetch_ple_by_party(self):
+		"""Load entries of a batch of parties at a time, build rows of each party and drop its voucher
+		balances once emitted.
+
+		All keys of `voucher_balance` include the party, so balances of one party never depend on
+		entries of another party. Both passes (init and update) are run per party."""
+		query, param = self.unordered_ple_query
+		party_field = f"`{self.ple.party.name}`"
+
+		# nosemgrep
+		parties = frappe.db.sql(
+			f"select distinct {party_field} from ({query}) ple order by {party_field}", param, pluck=True
+		)
+
+		for batch in create_batch(parties, STREAMING_PARTY_BATCH_SIZE):
+			# nosemgrep
+			ple_entries = frappe.db.sql(
+				f"{query} AND {party_field} in %(streaming_parties)s "
+				f"ORDER BY {party_field}, `{self.ple.posting_date.name}`",
+				{**param, "streaming_parties": tuple(batch)},
+				as_dict=True,
+			)
+
+			self.get_invoice_details({ple.voucher_no for ple in ple_entries})
+			self.invoices = set()
+			for ple in ple_entries:
+				self.get_invoices(ple)
+			self.build_delivery_note_map()
+
+			for _party, party_entries in groupby(ple_entries, key=lambda ple: ple.party):
+				party_entries = list(party_entries)
+				self.voucher_balance = OrderedDict()
+
+				for ple in party_entries:
+					self.init_voucher_balance(ple)
+
+				for ple in party_entries:
+					self.update_voucher_balance(ple)
+
+				self.build_voucher_rows()
+
+		self.voucher_balance = OrderedDict()
+
 	def build_voucher_dict(self, ple):
 		return frappe._dict(
 			voucher_type=ple.voucher_type,
@@ -325,6 +381,10 @@ class ReceivablePayableReport:
 			self.update_sub_total_row(sub_total_row, "Total")
 
 	def build_data(self):
+		self.build_voucher_rows()
+		self.append_total_rows()
+
+	def build_voucher_rows(self):
 		# set outstanding for all the accumulated balances
 		# as we can use this to filter out invoices without outstanding
 		for _key, row in self.voucher_balance.items():
@@ -372,6 +432,7 @@ class ReceivablePayableReport:
 				else:
 					self.append_row(row)
 
+	def append_total_rows(self):
 		if self.filters.get("group_by_party"):
 			self.append_subtotal_row(self.previous_party)
 			if self.data:
@@ -446,17 +507,24 @@ class ReceivablePayableReport:
 			for d in dn_against_si:
 				self.delivery_notes.setdefault(d.against_sales_invoice, set()).add(d.parent)
 
-	def get_invoice_details(self):
+	def get_invoice_details(self, voucher_nos=None):
+		"""Fetch invoice details for all invoices, or only for `voucher_nos` if given"""
 		self.invoice_details = frappe._dict()
+		filters = {
+			"posting_date": ("<=", self.filters.report_date),
+			"company": self.filters.company,
+			"docstatus": 1,
+		}
+		if voucher_nos is not None:
+			if not voucher_nos:
+				return
+			filters["name"] = ("in", list(voucher_nos))
+
 		if self.account_type == "Receivable":
 			# nosemgrep
 			si_list = frappe.get_list(
 				"Sales Invoice",
-				filters={
-					"posting_date": ("<=", self.filters.report_date),
-					"company": self.filters.company,
-					"docstatus": 1,
-				},
+				filters=filters,
 				fields=["name", "due_date", "po_no"],
 			)
 			for d in si_list:
@@ -464,15 +532,14 @@ class ReceivablePayableReport:
 
 			# Get Sales Team
 			if self.filters.show_sales_person:
-				# nosemgrep
-				sales_team = frappe.db.sql(
-					"""
-					select parent, sales_person
-					from `tabSales Team`
-					where parenttype = 'Sales Invoice'
-				""",
-					as_dict=1,
+				st = qb.DocType("Sales Team")
+				query = (
+					qb.from_(st).select(st.parent, st.sales_person).where(st.parenttype == "Sales Invoice")
 				)
+				if voucher_nos is not None:
+					query = query.where(st.parent.isin(filters["name"][1]))
+
+				sales_team = query.run(as_dict=True)
 				for d in sales_team:
 					self.invoice_details.setdefault(d.parent, {}).setdefault("sales_team", []).append(
 						d.sales_person
@@ -482,11 +549,7 @@ class ReceivablePayableReport:
 			# nosemgrep
 			invoices = frappe.get_list(
 				"Purchase Invoice",
-				filters={
-					"posting_date": ("<=", self.filters.report_date),
-					"company": self.filters.company,
-					"docstatus": 1,
-				},
+				filters=filters,
 				fields=["name", "due_date", "bill_no", "bill_date"],
 			)
 
@@ -497,11 +560,7 @@ class ReceivablePayableReport:
 		# nosemgrep
 		journal_entries = frappe.get_list(
 			"Journal Entry",
-			filters={
-				"posting_date": ("<=", self.filters.report_date),
-				"company": self.filters.company,
-				"docstatus": 1,
-			},
+			filters=filters,
 			fields=["name", "due_date", "bill_no", "bill_date"],
 		)
 
@@ -857,6 +916,8 @@ class ReceivablePayableReport:
 		if match_conditions:
 			query += " AND " + match_conditions
 
+		self.unordered_ple_query = (query, param)
+
 		if self.filters.get("group_by_party"):
 			query += f" ORDER BY `{self.ple.party.name}`, `{self.ple.posting_date.name}`"
 		else:
@@ -1064,3 +1064,31 @@ class TestAccountsReceivable(AccountsTestMixin, FrappeTestCase):
 		self.assertEqual(len(report[1]), 1)
 		row = report[1][0]
 		self.assertEqual(expected_data_after_payment, [row.voucher_no, row.cost_center, row.outstanding])
+
+	def test_streaming_fetch_method(self):
+		filters = {
+			"company": self.company,
+			"based_on_payment_terms": 1,
+			"report_date": today(),
+			"range": "30, 60, 90, 120",
+			"group_by_party": True,
+		}
+
+		si = self.create_sales_invoice(qty=2)
+		self.create_payment_entry(si.name)
+		cr_note = self.create_credit_note(si.name, do_not_submit=True)
+		cr_note.update_outstanding_for_self = False
+		cr_note.save().submit()
+		self.create_sales_invoice(no_payment_schedule=True)
+
+		with change_settings("Accounts Settings", {"receivable_payable_fetch_method": "Buffered Cursor"}):
+			buffered_report = execute(filters)[1]
+
+		with change_settings("Accounts Settings", {"receivable_payable_fetch_method": "Streaming"}):
+			streamed_report = execute(filters)[1]
+
+		fields = ["voucher_no", "party", "invoiced", "paid", "credit_note", "outstanding", "due_date"]
+		self.assertEqual(
+			[[row.get(field) for field in fields] for row in buffered_report],
+			[[row.get(field) for field in fields] for row in streamed_report],
+		)
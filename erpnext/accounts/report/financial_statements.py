@@ -13,6 +13,7 @@ from frappe.query_builder.functions import Sum
 from frappe.utils import add_days, add_months, cint, cstr, flt, formatdate, get_first_day, getdate
 from pypika.terms import ExistsCriterion
 
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import use_account_daily_balance
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
@@ -501,6 +502,10 @@ def get_accounting_entries(
 	ignore_opening_entries=False,
 	group_by_account=False,
 ):
+	if doctype == "GL Entry" and use_account_daily_balance():
+		# read summarised balances instead of individual GL Entries
+		doctype = "Account Daily Balance"
+
 	gl_entry = frappe.qb.DocType(doctype)
 	query = (
 		frappe.qb.from_(gl_entry)
@@ -523,11 +528,13 @@ def get_accounting_entries(
 		"Accounts Settings", "ignore_is_opening_check_for_reporting"
 	)
 
-	if doctype == "GL Entry":
+	if doctype != "Account Closing Balance":
 		query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
-		query = query.where(gl_entry.is_cancelled == 0)
 		query = query.where(gl_entry.posting_date <= to_date)
 
+		if doctype == "GL Entry":
+			query = query.where(gl_entry.is_cancelled == 0)
+
 		if ignore_opening_entries and not ignore_is_opening:
 			query = query.where(gl_entry.is_opening == "No")
 	else:
@@ -578,7 +585,7 @@ def apply_additional_conditions(doctype, query, from_date, ignore_closing_entrie
 		else:
 			query = query.where(gl_entry.is_period_closing_voucher_entry == 0)
 
-	if from_date and doctype == "GL Entry":
+	if from_date and doctype != "Account Closing Balance":
 		query = query.where(gl_entry.posting_date >= from_date)
 
 	if filters:
@@ -6,7 +6,8 @@ from collections import OrderedDict
 import frappe
 from frappe import _, qb, scrub
 from frappe.query_builder import Order
-from frappe.utils import cint, flt, formatdate
+from frappe.query_builder.functions import Avg, IfNull, Max
+from frappe.utils import cint, create_batch, flt, formatdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
@@ -464,15 +465,26 @@ class GrossProfitGenerator:
 		self.sle = {}
 		self.data = []
 		self.average_buying_rate = {}
+		self.last_purchase_rate = {}
+		self.purchase_rates = {}
 		self.filters = frappe._dict(filters)
 		self.load_invoice_items()
 		self.get_delivery_notes()
+		self.load_stock_ledger_entries()
+		self.load_incoming_rates_from_delivery_notes()
 
 		self.load_product_bundle()
 		if filters.group_by == "Invoice":
 			self.group_items_by_invoice()
 
 		self.load_non_stock_items()
+		self.load_purchase_rates(
+			{
+				row.item_code
+				for row in self.si_list
+				if row.item_code in self.non_stock_items and (row.project or row.cost_center)
+			}
+		)
 		self.get_returned_invoice_items()
 		self.process()
 
@@ -689,34 +701,28 @@ class GrossProfitGenerator:
 
 		return flt(buying_amount, self.currency_precision)
 
-	def calculate_buying_amount_from_sle(self, row, my_sle, parenttype, parent, item_row, item_code):
-		for i, sle in enumerate(my_sle):
-			# find the stock valution rate from stock ledger entry
-			if (
-				sle.voucher_type == parenttype
-				and parent == sle.voucher_no
-				and sle.voucher_detail_no == item_row
-			):
-				previous_stock_value = len(my_sle) > i + 1 and flt(my_sle[i + 1].stock_value) or 0.0
+	def calculate_buying_amount_from_sle(self, row, parenttype, parent, item_row, item_code, warehouse):
+		# find the stock valution rate from stock ledger entry
+		sle = self.sle.get((parenttype, parent, item_row, item_code, warehouse))
+		if not sle:
+			return 0.0
 
-				if previous_stock_value:
-					return abs(previous_stock_value - flt(sle.stock_value)) * flt(row.qty) / abs(flt(sle.qty))
-				else:
-					return flt(row.qty) * self.get_average_buying_rate(row, item_code)
-		return 0.0
+		previous_stock_value = flt(sle.stock_value - sle.stock_value_difference, self.currency_precision)
+		if previous_stock_value:
+			return abs(flt(sle.stock_value_difference)) * flt(row.qty) / abs(flt(sle.qty))
+		else:
+			return flt(row.qty) * self.get_average_buying_rate(row, item_code)
 
 	def get_buying_amount(self, row, item_code):
-		# IMP NOTE
-		# stock_ledger_entries should already be filtered by item_code and warehouse and
-		# sorted by posting_date desc, posting_time desc
 		if item_code in self.non_stock_items and (row.project or row.cost_center):
 			# Issue 6089-Get last purchasing rate for non-stock item
 			item_rate = self.get_last_purchase_rate(item_code, row)
 			return flt(row.qty) * item_rate
 
 		else:
-			my_sle = self.get_stock_ledger_entries(item_code, row.warehouse)
-			if (row.update_stock or row.dn_detail) and my_sle:
+			if (row.update_stock or row.dn_detail) and self.has_stock_ledger_entries(
+				item_code, row.warehouse
+			):
 				parenttype = row.parenttype
 				parent = row.invoice or row.parent
 
@@ -724,7 +730,7 @@ class GrossProfitGenerator:
 					parenttype, parent = "Delivery Note", row.delivery_note
 
 				return self.calculate_buying_amount_from_sle(
-					row, my_sle, parenttype, parent, row.item_row, item_code
+					row, parenttype, parent, row.item_row, item_code, row.warehouse
 				)
 			elif self.delivery_notes.get((row.parent, row.item_code), None):
 				#  check if Invoice has delivery notes
@@ -735,9 +741,8 @@ class GrossProfitGenerator:
 					dn["item_row"],
 					dn["warehouse"],
 				)
-				my_sle = self.get_stock_ledger_entries(item_code, dn_warehouse)
 				return self.calculate_buying_amount_from_sle(
-					row, my_sle, parenttype, parent, item_row, item_code
+					row, parenttype, parent, item_row, item_code, dn_warehouse
 				)
 			elif row.sales_order and row.so_detail:
 				incoming_amount = self.get_buying_amount_from_so_dn(row.sales_order, row.so_detail, item_code)
@@ -749,22 +754,35 @@ class GrossProfitGenerator:
 		return flt(row.qty) * self.get_average_buying_rate(row, item_code)
 
 	def get_buying_amount_from_so_dn(self, sales_order, so_detail, item_code):
-		from frappe.query_builder.functions import Avg
+		return self.incoming_rates_from_delivery_notes.get((sales_order, so_detail, item_code), 0)
 
-		delivery_note_item = frappe.qb.DocType("Delivery Note Item")
+	def load_incoming_rates_from_delivery_notes(self):
+		"""Average incoming rate of delivered items, for Sales Order items invoiced without a Delivery Note"""
+		self.incoming_rates_from_delivery_notes = {}
+		so_details = {row.so_detail for row in self.si_list if row.sales_order and row.so_detail}
 
-		query = (
-			frappe.qb.from_(delivery_note_item)
-			.select(Avg(delivery_note_item.incoming_rate))
-			.where(delivery_note_item.docstatus == 1)
-			.where(delivery_note_item.item_code == item_code)
-			.where(delivery_note_item.against_sales_order == sales_order)
-			.where(delivery_note_item.so_detail == so_detail)
-			.groupby(delivery_note_item.item_code)
-		)
+		delivery_note_item = frappe.qb.DocType("Delivery Note Item")
+		for batch in create_batch(sorted(so_details), 1000):
+			query = (
+				frappe.qb.from_(delivery_note_item)
+				.select(
+					delivery_note_item.against_sales_order,
+					delivery_note_item.so_detail,
+					delivery_note_item.item_code,
+					Avg(delivery_note_item.incoming_rate).as_("incoming_rate"),
+				)
+				.where(delivery_note_item.docstatus == 1)
+				.where(delivery_note_item.so_detail.isin(batch))
+				.groupby(
+					delivery_note_item.against_sales_order,
+					delivery_note_item.so_detail,
+					delivery_note_item.item_code,
+				)
+			)
 
-		incoming_amount = query.run()
-		return flt(incoming_amount[0][0]) if incoming_amount else 0
+			for d in query.run(as_dict=True):
+				key = (d.against_sales_order, d.so_detail, d.item_code)
+				self.incoming_rates_from_delivery_notes[key] = flt(d.incoming_rate)
 
 	def get_average_buying_rate(self, row, item_code):
 		args = row
@@ -789,33 +807,86 @@ class GrossProfitGenerator:
 		return self.average_buying_rate[key]
 
 	def get_last_purchase_rate(self, item_code, row):
+		key = (item_code, row.project, row.cost_center)
+		if key not in self.last_purchase_rate:
+			if item_code not in self.purchase_rates:
+				self.load_purchase_rates([item_code])
+
+			self.last_purchase_rate[key] = next(
+				(
+					flt(d.rate)
+					for d in self.purchase_rates[item_code]
+					if (not row.project or d.project == row.project)
+					and (not row.cost_center or d.cost_center == row.cost_center)
+				),
+				0,
+			)
+
+		return self.last_purchase_rate[key]
+
+	def load_purchase_rates(self, item_codes):
+		"""Latest purchase rates of items per project and cost center till the report date, latest first"""
 		purchase_invoice = frappe.qb.DocType("Purchase Invoice")
 		purchase_invoice_item = frappe.qb.DocType("Purchase Invoice Item")
 
-		query = (
-			frappe.qb.from_(purchase_invoice_item)
-			.inner_join(purchase_invoice)
-			.on(purchase_invoice.name == purchase_invoice_item.parent)
-			.select(
-				purchase_invoice_item.base_rate / purchase_invoice_item.conversion_factor,
+		def get_purchase_invoice_items(fields, batch):
+			return (
+				frappe.qb.from_(purchase_invoice_item)
+				.inner_join(purchase_invoice)
+				.on(purchase_invoice.name == purchase_invoice_item.parent)
+				.select(*fields)
+				.where(purchase_invoice.docstatus == 1)
+				.where(purchase_invoice.posting_date <= self.filters.to_date)
+				.where(purchase_invoice_item.item_code.isin(batch))
+				.where(purchase_invoice.is_return == 0)
+				.where(purchase_invoice_item.parenttype == "Purchase Invoice")
 			)
-			.where(purchase_invoice.docstatus == 1)
-			.where(purchase_invoice.posting_date <= self.filters.to_date)
-			.where(purchase_invoice_item.item_code == item_code)
-			.where(purchase_invoice.is_return == 0)
-			.where(purchase_invoice_item.parenttype == "Purchase Invoice")
-		)
 
-		if row.project:
-			query = query.where(purchase_invoice_item.project == row.project)
+		project = IfNull(purchase_invoice_item.project, "")
+		cost_center = IfNull(purchase_invoice_item.cost_center, "")
+
+		for batch in create_batch(sorted(item_codes), 1000):
+			latest = (
+				get_purchase_invoice_items(
+					[
+						purchase_invoice_item.item_code,
+						project.as_("project"),
+						cost_center.as_("cost_center"),
+						Max(purchase_invoice.posting_date).as_("posting_date"),
+					],
+					batch,
+				)
+				.groupby(purchase_invoice_item.item_code, project, cost_center)
+				.as_("latest")
+			)
 
-		if row.cost_center:
-			query = query.where(purchase_invoice_item.cost_center == row.cost_center)
+			query = (
+				get_purchase_invoice_items(
+					[
+						purchase_invoice_item.item_code,
+						purchase_invoice_item.project,
+						purchase_invoice_item.cost_center,
+						(purchase_invoice_item.base_rate / purchase_invoice_item.conversion_factor).as_(
+							"rate"
+						),
+					],
+					batch,
+				)
+				.inner_join(latest)
+				.on(
+					(latest.item_code == purchase_invoice_item.item_code)
+					& (latest.project == project)
+					& (latest.cost_center == cost_center)
+					& (latest.posting_date == purchase_invoice.posting_date)
+				)
+				.orderby(purchase_invoice.posting_date, order=frappe.qb.desc)
+			)
 
-		query = query.orderby(purchase_invoice.posting_date, order=frappe.qb.desc).limit(1)
-		last_purchase_rate = query.run()
+			for item_code in batch:
+				self.purchase_rates[item_code] = []
 
-		return flt(last_purchase_rate[0][0]) if last_purchase_rate else 0
+			for d in query.run(as_dict=True):
+				self.purchase_rates[d.item_code].append(d)
 
 	def load_invoice_items(self):
 		conditions = ""
@@ -1050,36 +1121,65 @@ class GrossProfitGenerator:
 			}
 		)
 
-	def get_stock_ledger_entries(self, item_code, warehouse):
-		if item_code and warehouse:
-			if (item_code, warehouse) not in self.sle:
-				sle = qb.DocType("Stock Ledger Entry")
-				res = (
-					qb.from_(sle)
-					.select(
-						sle.item_code,
-						sle.voucher_type,
-						sle.voucher_no,
-						sle.voucher_detail_no,
-						sle.stock_value,
-						sle.warehouse,
-						sle.actual_qty.as_("qty"),
-					)
-					.where(
-						(sle.company == self.filters.company)
-						& (sle.item_code == item_code)
-						& (sle.warehouse == warehouse)
-						& (sle.is_cancelled == 0)
-					)
-					.orderby(sle.item_code)
-					.orderby(sle.warehouse, sle.posting_datetime, sle.creation, order=Order.desc)
-					.run(as_dict=True)
+	def load_stock_ledger_entries(self):
+		"""Load Stock Ledger Entries of the invoices (with update stock) and delivery notes in the report,
+		keyed by voucher, voucher detail, item and warehouse"""
+		self.sle_item_warehouses = set()
+
+		voucher_nos = {dn.delivery_note for dn in self.delivery_notes.values()}
+		for row in self.si_list:
+			if row.update_stock:
+				voucher_nos.add(row.parent)
+			if row.dn_detail and row.delivery_note:
+				voucher_nos.add(row.delivery_note)
+
+		sle = qb.DocType("Stock Ledger Entry")
+		for batch in create_batch(sorted(voucher_nos), 1000):
+			entries = (
+				qb.from_(sle)
+				.select(
+					sle.item_code,
+					sle.voucher_type,
+					sle.voucher_no,
+					sle.voucher_detail_no,
+					sle.stock_value,
+					sle.stock_value_difference,
+					sle.warehouse,
+					sle.actual_qty.as_("qty"),
+				)
+				.where(
+					(sle.company == self.filters.company)
+					& (sle.voucher_no.isin(batch))
+					& (sle.is_cancelled == 0)
 				)
+				.orderby(sle.posting_datetime, sle.creation)
+				.run(as_dict=True)
+			)
+
+			# the latest entry of a voucher row is considered
+			for d in entries:
+				self.sle[(d.voucher_type, d.voucher_no, d.voucher_detail_no, d.item_code, d.warehouse)] = d
+				self.sle_item_warehouses.add((d.item_code, d.warehouse))
 
-				self.sle[(item_code, warehouse)] = res
+	def has_stock_ledger_entries(self, item_code, warehouse):
+		if not (item_code and warehouse):
+			return False
+
+		if (item_code, warehouse) not in self.sle_item_warehouses:
+			if frappe.db.exists(
+				"Stock Ledger Entry",
+				{
+					"company": self.filters.company,
+					"item_code": item_code,
+					"warehouse": warehouse,
+					"is_cancelled": 0,
+				},
+			):
+				self.sle_item_warehouses.add((item_code, warehouse))
+			else:
+				return False
 
-			return self.sle[(item_code, warehouse)]
-		return []
+		return True
 
 	def load_product_bundle(self):
 		self.product_bundles = {}
@@ -1,7 +1,7 @@
 import frappe
 from frappe import qb
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import flt, nowdate
+from frappe.utils import add_days, flt, nowdate
 
 from erpnext.accounts.doctype.sales_invoice.sales_invoice import make_delivery_note
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
@@ -635,3 +635,66 @@ class TestGrossProfit(FrappeTestCase):
 		self.assertEqual(total.buying_amount, 0.0)
 		self.assertEqual(total.gross_profit, 100.0)
 		self.assertEqual(total.get("gross_profit_%"), 100.0)
+
+	def test_last_purchase_rate_of_non_stock_item(self):
+		from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
+		from erpnext.accounts.report.gross_profit.gross_profit import GrossProfitGenerator
+		from erpnext.projects.doctype.project.test_project import make_project
+
+		item = create_item(item_code="_Test GP Non Stock Item", is_stock_item=0).item_code
+		project = make_project({"project_name": "_Test GP Project"}).name
+		cost_center, cost_center_2 = "_Test Cost Center - _TC", "_Test Cost Center 2 - _TC"
+
+		for days, rate, item_cost_center, item_project in (
+			(-4, 50, cost_center, None),
+			(-3, 100, cost_center, None),
+			(-2, 200, cost_center, project),
+			(-1, 300, cost_center_2, None),
+		):
+			make_purchase_invoice(
+				item_code=item,
+				rate=rate,
+				qty=1,
+				posting_date=add_days(nowdate(), days),
+				cost_center=item_cost_center,
+				project=item_project,
+			)
+
+		def get_last_purchase_rate_per_row(row):
+			purchase_invoice = qb.DocType("Purchase Invoice")
+			purchase_invoice_item = qb.DocType("Purchase Invoice Item")
+
+			query = (
+				qb.from_(purchase_invoice_item)
+				.inner_join(purchase_invoice)
+				.on(purchase_invoice.name == purchase_invoice_item.parent)
+				.select(purchase_invoice_item.base_rate / purchase_invoice_item.conversion_factor)
+				.where(purchase_invoice.docstatus == 1)
+				.where(purchase_invoice.posting_date <= nowdate())
+				.where(purchase_invoice_item.item_code == item)
+				.where(purchase_invoice.is_return == 0)
+				.where(purchase_invoice_item.parenttype == "Purchase Invoice")
+			)
+			if row.project:
+				query = query.where(purchase_invoice_item.project == row.project)
+			if row.cost_center:
+				query = query.where(purchase_invoice_item.cost_center == row.cost_center)
+
+			rate = query.orderby(purchase_invoice.posting_date, order=qb.desc).limit(1).run()
+			return flt(rate[0][0]) if rate else 0
+
+		filters = frappe._dict(
+			company=self.company, from_date=nowdate(), to_date=nowdate(), group_by="Invoice"
+		)
+		generator = GrossProfitGenerator(filters)
+
+		for row_project, row_cost_center, expected_rate in (
+			(None, cost_center, 200),
+			(None, cost_center_2, 300),
+			(project, None, 200),
+			(project, cost_center, 200),
+			(project, cost_center_2, 0),
+		):
+			row = frappe._dict(project=row_project, cost_center=row_cost_center)
+			self.assertEqual(generator.get_last_purchase_rate(item, row), expected_rate)
+			self.assertEqual(generator.get_last_purchase_rate(item, row), get_last_purchase_rate_per_row(row))
@@ -9,6 +9,7 @@ from erpnext.accounts.party import get_party_shipping_address
 from erpnext.accounts.utils import (
 	get_future_stock_vouchers,
 	get_voucherwise_gl_entries,
+	repost_gle_for_stock_vouchers,
 	sort_stock_vouchers_by_posting_date,
 )
 from erpnext.stock.doctype.item.test_item import make_item
@@ -59,6 +60,39 @@ class TestUtils(unittest.TestCase):
 			msg="get_voucherwise_gl_entries not returning expected GLes",
 		)
 
+	def test_incremental_gl_reposting(self):
+		company = "_Test Company with perpetual inventory"
+		pr = make_purchase_receipt(
+			item_code="_Test Item",
+			posting_date="2021-02-01",
+			rate=100,
+			qty=1,
+			warehouse="Stores - TCP1",
+			company=company,
+		)
+
+		filters = {"voucher_type": pr.doctype, "voucher_no": pr.name, "is_cancelled": 0}
+		expected_gle = frappe.get_all("GL Entry", filters, ["name", "debit", "credit"], order_by="name")
+
+		# corrupt amounts, keeping the ledger balanced
+		for gle in expected_gle:
+			frappe.db.set_value(
+				"GL Entry",
+				gle.name,
+				{
+					"debit": gle.debit / 2,
+					"credit": gle.credit / 2,
+					"debit_in_account_currency": gle.debit / 2,
+					"credit_in_account_currency": gle.credit / 2,
+				},
+			)
+
+		repost_gle_for_stock_vouchers([(pr.doctype, pr.name)], pr.posting_date, company, incremental=True)
+
+		# same rows are updated in place instead of being recreated
+		gle = frappe.get_all("GL Entry", filters, ["name", "debit", "credit"], order_by="name")
+		self.assertEqual(gle, expected_gle)
+
 	def test_stock_voucher_sorting(self):
 		vouchers = []
 
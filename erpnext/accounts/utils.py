@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import copy
 from json import loads
 from typing import TYPE_CHECKING, Optional
 
@@ -196,7 +197,16 @@ def get_balance_on(
 	if not cost_center and frappe.form_dict.get("cost_center"):
 		cost_center = frappe.form_dict.get("cost_center")
 
-	cond = ["is_cancelled=0"]
+	from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+		use_account_daily_balance,
+	)
+
+	# party balances need individual GL Entries
+	gl_doctype = "GL Entry"
+	if not (party_type and party) and use_account_daily_balance():
+		gl_doctype = "Account Daily Balance"
+
+	cond = ["is_cancelled=0"] if gl_doctype == "GL Entry" else []
 	if start_date:
 		cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
 	if date:
@@ -293,8 +303,8 @@ def get_balance_on(
 		bal = frappe.db.sql(
 			"""
 			SELECT {}
-			FROM `tabGL Entry` gle
-			WHERE {}""".format(select_field, " and ".join(cond)),
+			FROM `tab{}` gle
+			WHERE {}""".format(select_field, gl_doctype, " and ".join(cond)),
 			(precision, precision),
 		)[0][0]
 		# if bal is None, return 0
@@ -1075,18 +1085,36 @@ def fix_total_debit_credit():
 		as_dict=1,
 	)
 
+	from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+		update_account_daily_balance,
+	)
+
 	for d in vouchers:
 		if abs(d.diff) > 0:
 			dr_or_cr = d.voucher_type == "Sales Invoice" and "credit" or "debit"
 
+			gl_entry = frappe.db.get_value(
+				"GL Entry",
+				{"voucher_type": d.voucher_type, "voucher_no": d.voucher_no, dr_or_cr: (">", 0)},
+				"*",
+				as_dict=True,
+			)
+			if not gl_entry:
+				continue
+
 			frappe.db.sql(
-				"""update `tabGL Entry` set {} = {} + {}
-				where voucher_type = {} and voucher_no = {} and {} > 0 limit 1""".format(
-					dr_or_cr, dr_or_cr, "%s", "%s", "%s", dr_or_cr
+				"""update `tabGL Entry` set {} = {} + {} where name = {}""".format(
+					dr_or_cr, dr_or_cr, "%s", "%s"
 				),
-				(d.diff, d.voucher_type, d.voucher_no),
+				(d.diff, gl_entry.name),
 			)
 
+			if not gl_entry.is_cancelled:
+				# only the difference is added to the daily balance
+				gl_entry.update(dict.fromkeys(GL_ENTRY_AMOUNT_FIELDS, 0))
+				gl_entry[dr_or_cr] = d.diff
+				update_account_daily_balance([gl_entry])
+
 
 def get_currency_precision():
 	precision = cint(frappe.db.get_default("currency_precision"))
@@ -1097,6 +1125,16 @@ def get_currency_precision():
 	return precision
 
 
+def clear_cached_value(key):
+	"""Delete a cached value, and again once the transaction is committed or rolled back"""
+	frappe.cache.delete_value(key)
+
+	# till the transaction ends, the value may get cached again with uncommitted changes by this
+	# request, or with the old committed rows by a concurrent request
+	frappe.db.after_commit.add(lambda: frappe.cache.delete_value(key))
+	frappe.db.after_rollback.add(lambda: frappe.cache.delete_value(key))
+
+
 def get_held_invoices(party_type, party):
 	"""
 	Returns a list of names Purchase Invoices for the given party that are on hold
@@ -1411,6 +1449,7 @@ def repost_gle_for_stock_vouchers(
 	company: str | None = None,
 	warehouse_account=None,
 	repost_doc: Optional["RepostItemValuation"] = None,
+	incremental: bool = False,
 ):
 	from erpnext.accounts.general_ledger import toggle_debit_credit_if_negative
 
@@ -1440,6 +1479,9 @@ def repost_gle_for_stock_vouchers(
 				if not existing_gle or not compare_existing_and_expected_gle(
 					existing_gle, expected_gle, precision
 				):
+					if incremental and update_changed_gl_entries(existing_gle, expected_gle, precision):
+						continue
+
 					_delete_accounting_ledger_entries(voucher_type, voucher_no)
 					voucher_obj.make_gl_entries(gl_entries=expected_gle, from_repost=True)
 			else:
@@ -1455,12 +1497,120 @@ def repost_gle_for_stock_vouchers(
 			)
 
 
+GL_ENTRY_AMOUNT_FIELDS = (
+	"debit",
+	"credit",
+	"debit_in_account_currency",
+	"credit_in_account_currency",
+	"debit_in_transaction_currency",
+	"credit_in_transaction_currency",
+)
+
+GL_ENTRY_DIFF_KEY_FIELDS = (
+	"account",
+	"cost_center",
+	"project",
+	"party_type",
+	"party",
+	"voucher_detail_no",
+	"finance_book",
+)
+
+
+def update_changed_gl_entries(existing_gle, expected_gle, precision) -> bool:
+	"""Update amounts of only those GL Entries of a voucher which differ from the expected ledger.
+
+	Returns False if the voucher can not be updated in place, i.e. if rows were added or removed,
+	if the new ledger needs a round off entry or if a changed row affects party balances.
+	The ledger of such vouchers has to be recreated.
+	"""
+	from erpnext.accounts.general_ledger import process_gl_map
+
+	expected_gle = process_gl_map(copy.deepcopy(expected_gle), from_repost=True)
+	if len(existing_gle) != len(expected_gle):
+		return False
+
+	if flt(sum(flt(d.debit, precision) - flt(d.credit, precision) for d in expected_gle), precision):
+		return False
+
+	existing_gle_map = {get_gl_entry_diff_key(d): d for d in existing_gle}
+	expected_gle_map = {get_gl_entry_diff_key(d): d for d in expected_gle}
+	if len(existing_gle_map) != len(existing_gle) or existing_gle_map.keys() != expected_gle_map.keys():
+		return False
+
+	updates = {}
+	for key, entry in expected_gle_map.items():
+		existing = existing_gle_map[key]
+		if flt(entry.debit, precision) == flt(existing.debit, precision) and flt(
+			entry.credit, precision
+		) == flt(existing.credit, precision):
+			continue
+
+		if entry.party or entry.against_voucher:
+			# outstanding amounts and payment ledger depend on these rows
+			return False
+
+		updates[existing.name] = {field: flt(entry.get(field), precision) for field in GL_ENTRY_AMOUNT_FIELDS}
+
+	if updates:
+		bulk_update_gl_entries(updates)
+
+	return True
+
+
+def get_gl_entry_diff_key(gl_entry):
+	return tuple(gl_entry.get(field) or None for field in GL_ENTRY_DIFF_KEY_FIELDS)
+
+
+def bulk_update_gl_entries(updates: dict[str, dict]):
+	"""Write amounts of many GL Entries using one UPDATE per chunk."""
+	from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+		is_account_daily_balance_enabled,
+		update_account_daily_balance,
+	)
+
+	if is_account_daily_balance_enabled():
+		# add the change in amounts to daily balances
+		changes = frappe.get_all("GL Entry", filters={"name": ("in", list(updates))}, fields=["*"])
+		for gle in changes:
+			for field in GL_ENTRY_AMOUNT_FIELDS:
+				gle[field] = flt(updates[gle.name][field]) - flt(gle[field])
+
+		update_account_daily_balance(changes)
+
+	for chunk in create_batch(list(updates.items()), 500):
+		set_clauses, values = [], []
+		for field in GL_ENTRY_AMOUNT_FIELDS:
+			set_clauses.append(f"`{field}` = case name {' '.join(['when %s then %s'] * len(chunk))} end")
+			for name, amounts in chunk:
+				values.extend([name, amounts[field]])
+
+		values.extend(name for name, _amounts in chunk)
+
+		# nosemgrep
+		frappe.db.sql(
+			"""
+			update `tabGL Entry`
+			set {set_clauses}
+			where name in ({names})""".format(
+				set_clauses=", ".join(set_clauses), names=", ".join(["%s"] * len(chunk))
+			),
+			values,
+		)
+
+
 def _delete_pl_entries(voucher_type, voucher_no):
 	ple = qb.DocType("Payment Ledger Entry")
 	qb.from_(ple).delete().where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)).run()
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+		remove_voucher_from_account_daily_balance,
+	)
+
+	remove_voucher_from_account_daily_balance(voucher_type, voucher_no)
+
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
 
@@ -1548,7 +1698,8 @@ def get_voucherwise_gl_entries(future_stock_vouchers, posting_date):
 
 	gles = frappe.db.sql(
 		"""
-		select name, account, credit, debit, cost_center, project, voucher_type, voucher_no
+		select name, account, credit, debit, cost_center, project, voucher_type, voucher_no,
+			party_type, party, voucher_detail_no, finance_book
 			from `tabGL Entry`
 		where
 			posting_date >= {} and voucher_no in ({})""".format("%s", ", ".join(["%s"] * len(voucher_nos))),
@@ -1686,22 +1837,52 @@ def check_and_delete_linked_reports(report):
 
 def create_err_and_its_journals(companies: list | None = None) -> None:
 	if companies:
+		batch_size = cint(
+			frappe.db.get_single_value("Accounts Settings", "exchange_rate_revaluation_batch_size")
+		)
+
 		for company in companies:
-			err = frappe.new_doc("Exchange Rate Revaluation")
-			err.company = company.name
-			err.posting_date = nowdate()
-			err.rounding_loss_allowance = 0.0
+			if not batch_size:
+				create_err_and_its_journal(company)
+				continue
+
+			from erpnext.accounts.doctype.exchange_rate_revaluation.exchange_rate_revaluation import (
+				get_revaluation_batches,
+			)
 
-			err.fetch_and_calculate_accounts_data()
-			if err.accounts:
-				err.save().submit()
-				response = err.make_jv_entries()
+			precision = get_currency_precision()
+			for accounts in get_revaluation_batches(company.name, nowdate(), 0.0, batch_size):
+				# a revaluation without any gain or loss cannot be submitted
+				accounts = [d for d in accounts if flt(d["gain_loss"], precision)]
+				if accounts:
+					create_err_and_its_journal(company, accounts)
 
-				if company.submit_err_jv:
-					jv = response.get("revaluation_jv", None)
-					jv and frappe.get_doc("Journal Entry", jv).submit()
-					jv = response.get("zero_balance_jv", None)
-					jv and frappe.get_doc("Journal Entry", jv).submit()
+					if not frappe.flags.in_test:
+						frappe.db.commit()
+
+
+def create_err_and_its_journal(company, accounts=None):
+	"""Create and submit Exchange Rate Revaluation of the company with the given rows, or with all the
+	accounts and parties to revaluate, and make its Journal Entries"""
+	err = frappe.new_doc("Exchange Rate Revaluation")
+	err.company = company.name
+	err.posting_date = nowdate()
+	err.rounding_loss_allowance = 0.0
+
+	if accounts is None:
+		err.fetch_and_calculate_accounts_data()
+	else:
+		err.extend("accounts", accounts)
+
+	if err.accounts:
+		err.save().submit()
+		response = err.make_jv_entries()
+
+		if company.submit_err_jv:
+			jv = response.get("revaluation_jv", None)
+			jv and frappe.get_doc("Journal Entry", jv).submit()
+			jv = response.get("zero_balance_jv", None)
+			jv and frappe.get_doc("Journal Entry", jv).submit()
 
 
 def auto_create_exchange_rate_revaluation_daily() -> None:
@@ -1756,18 +1937,13 @@ def get_payment_ledger_entries(gl_entries, cancel=0):
 			.where(account.account_type.isin(["Receivable", "Payable"]) & (account.company.isin(companies)))
 			.run(as_dict=True)
 		)
-		receivable_or_payable_accounts = [y.name for y in accounts_with_types]
-
-		def get_account_type(account):
-			for entry in accounts_with_types:
-				if entry.name == account:
-					return entry.account_type
+		account_types = {y.name: y.account_type for y in accounts_with_types}
 
 		dr_or_cr = 0
 		account_type = None
 		for gle in gl_entries:
-			if gle.account in receivable_or_payable_accounts:
-				account_type = get_account_type(gle.account)
+			if gle.account in account_types:
+				account_type = account_types[gle.account]
 				if account_type == "Receivable":
 					dr_or_cr = gle.debit - gle.credit
 					dr_or_cr_account_currency = gle.debit_in_account_currency - gle.credit_in_account_currency
@@ -1819,6 +1995,10 @@ def create_payment_ledger_entry(
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
 
+		if not cancel and is_bulk_ledger_insert_enabled():
+			make_payment_ledger_entries_in_bulk(ple_map, adv_adj, update_outstanding, from_repost)
+			return
+
 		for entry in ple_map:
 			ple = frappe.get_doc(entry)
 
@@ -1832,6 +2012,78 @@ def create_payment_ledger_entry(
 			ple.submit()
 
 
+def is_bulk_ledger_insert_enabled():
+	return cint(frappe.db.get_single_value("Accounts Settings", "insert_ledger_entries_in_bulk", cache=True))
+
+
+def insert_documents_in_bulk(docs):
+	"""Insert new documents of a doctype in batches, without running their controller methods
+	and hooks. The documents must be validated by the caller."""
+	if not docs:
+		return
+
+	timestamp, user = now(), frappe.session.user
+
+	fields, values = None, []
+	for doc in docs:
+		doc.creation = doc.modified = timestamp
+		doc.owner = doc.modified_by = user
+
+		row = doc.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+		if fields is None:
+			fields = list(row)
+
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert(docs[0].doctype, fields=fields, values=values)
+
+
+def make_payment_ledger_entries_in_bulk(ple_map, adv_adj=0, update_outstanding="Yes", from_repost=0):
+	"""Submit Payment Ledger Entries of a voucher with one batched insert.
+
+	Runs the validations of the Payment Ledger Entry, the ones depending only on the account
+	once per account, and updates the outstanding of each against voucher once."""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import validate_balance_type, validate_frozen_account
+
+	entries, validated_accounts, against_vouchers = [], set(), {}
+	for entry in ple_map:
+		ple = frappe.get_doc(entry)
+		ple.docstatus = 1
+		ple.set_new_name()
+
+		if (ple.account, ple.account_type, ple.company) not in validated_accounts:
+			validated_accounts.add((ple.account, ple.account_type, ple.company))
+			ple.validate_account()
+
+			if not from_repost:
+				validate_frozen_account(ple.account, adv_adj)
+				ple.validate_account_details()
+
+		if not from_repost:
+			ple.validate_dimensions_for_pl_and_bs()
+			ple.validate_allowed_dimensions()
+
+		if (
+			ple.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+			and update_outstanding == "Yes"
+			and not frappe.flags.is_reverse_depr_entry
+		):
+			against_vouchers.setdefault(
+				(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+			)
+
+		entries.append(ple)
+
+	insert_documents_in_bulk(entries)
+
+	if not from_repost:
+		for account in {ple.account for ple in entries}:
+			validate_balance_type(account, adv_adj)
+
+	for args in against_vouchers:
+		update_voucher_outstanding(*args)
+
+
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
 	ple = frappe.qb.DocType("Payment Ledger Entry")
 	vouchers = [frappe._dict({"voucher_type": voucher_type, "voucher_no": voucher_no})]
@@ -9,6 +9,7 @@ from frappe.query_builder.functions import Max, Min
 from frappe.utils import (
 	add_months,
 	cint,
+	create_batch,
 	flt,
 	get_last_day,
 	get_link_to_form,
@@ -43,6 +44,10 @@ def post_depreciation_entries(date=None):
 	if not date:
 		date = today()
 
+	if cint(frappe.db.get_single_value("Accounts Settings", "post_consolidated_depreciation_entries")):
+		post_consolidated_depreciation_entries(date)
+		return
+
 	failed_asset_names = []
 	error_log_names = []
 
@@ -105,6 +110,209 @@ def post_depreciation_entries(date=None):
 	frappe.db.commit()
 
 
+def post_consolidated_depreciation_entries(date, batch_size=500):
+	"""Book depreciation due till `date` with one Journal Entry for the assets of the same company,
+	asset category, cost center and finance book on each schedule date, with a debit and credit row
+	for every asset.
+
+	If a Journal Entry fails, the depreciation of its assets is booked asset by asset, so that
+	failure of one asset does not hold back the others."""
+	failed_asset_names = []
+	error_log_names = []
+
+	credit_and_debit_accounts_for_asset_category_and_company = {}
+	depreciation_cost_center_and_depreciation_series_for_company = (
+		get_depreciation_cost_center_and_depreciation_series_for_company()
+	)
+
+	accounting_dimensions = get_checks_for_pl_and_bs_accounts()
+
+	schedules_to_book = {}
+	for d in get_due_depreciation_schedules(date, accounting_dimensions):
+		depreciation_cost_center = (
+			d.cost_center or depreciation_cost_center_and_depreciation_series_for_company[d.company][0]
+		)
+		key = (
+			getdate(d.schedule_date),
+			d.company,
+			d.asset_category,
+			depreciation_cost_center,
+			d.finance_book,
+		)
+		schedules_to_book.setdefault(key, []).append(d)
+
+	# book older depreciation first, like when booked asset by asset
+	for key in sorted(schedules_to_book, key=lambda key: key[0]):
+		posting_date, company, asset_category, depreciation_cost_center, finance_book = key
+		depreciation_series = depreciation_cost_center_and_depreciation_series_for_company[company][1]
+
+		for schedules in create_batch(schedules_to_book[key], batch_size):
+			try:
+				if (asset_category, company) not in credit_and_debit_accounts_for_asset_category_and_company:
+					credit_and_debit_accounts_for_asset_category_and_company[(asset_category, company)] = (
+						get_credit_and_debit_accounts_for_asset_category_and_company(asset_category, company)
+					)
+
+				make_consolidated_depreciation_entry(
+					schedules,
+					posting_date,
+					company,
+					finance_book,
+					depreciation_cost_center,
+					depreciation_series,
+					credit_and_debit_accounts_for_asset_category_and_company[(asset_category, company)],
+					accounting_dimensions,
+				)
+
+				frappe.db.commit()
+			except Exception:
+				frappe.db.rollback()
+				frappe.log_error(title=_("Consolidated Depreciation Entry failed, booking asset by asset"))
+
+				for d in schedules:
+					try:
+						make_depreciation_entry(
+							d.asset_depr_schedule,
+							date,
+							d.idx - 1,
+							d.idx,
+							credit_and_debit_accounts_for_asset_category_and_company.get(
+								(asset_category, company)
+							),
+							depreciation_cost_center_and_depreciation_series_for_company[company],
+							accounting_dimensions,
+						)
+
+						frappe.db.commit()
+					except Exception as e:
+						frappe.db.rollback()
+						failed_asset_names.append(d.asset)
+						error_log = frappe.log_error(e)
+						error_log_names.append(error_log.name)
+
+	if failed_asset_names:
+		failed_asset_names = list(dict.fromkeys(failed_asset_names))
+		set_depr_entry_posting_status_for_failed_assets(failed_asset_names)
+		notify_depr_entry_posting_error(failed_asset_names, error_log_names)
+
+	frappe.db.commit()
+
+
+def get_due_depreciation_schedules(date, accounting_dimensions):
+	"""Depreciation Schedule rows due till `date` which are not booked, along with their asset"""
+	a = frappe.qb.DocType("Asset")
+	ads = frappe.qb.DocType("Asset Depreciation Schedule")
+	ds = frappe.qb.DocType("Depreciation Schedule")
+
+	asset_meta = frappe.get_meta("Asset")
+	dimension_fields = {d["fieldname"] for d in accounting_dimensions if asset_meta.has_field(d["fieldname"])}
+
+	query = (
+		frappe.qb.from_(ads)
+		.join(a)
+		.on(ads.asset == a.name)
+		.join(ds)
+		.on(ads.name == ds.parent)
+		.select(
+			ds.name,
+			ds.idx,
+			ds.schedule_date,
+			ds.depreciation_amount,
+			ads.name.as_("asset_depr_schedule"),
+			ads.finance_book,
+			ads.finance_book_id,
+			a.name.as_("asset"),
+			a.asset_category,
+			a.company,
+			a.cost_center,
+			*[a[fieldname] for fieldname in dimension_fields],
+		)
+		.where(a.calculate_depreciation == 1)
+		.where(a.docstatus == 1)
+		.where(ads.docstatus == 1)
+		.where(a.status.isin(["Submitted", "Partially Depreciated"]))
+		.where(ds.journal_entry.isnull())
+		.where(ds.schedule_date <= date)
+		.orderby(ds.schedule_date)
+		.orderby(a.name)
+		.orderby(ds.idx)
+	)
+
+	acc_frozen_upto = get_acc_frozen_upto()
+	if acc_frozen_upto:
+		query = query.where(ds.schedule_date > acc_frozen_upto)
+
+	return query.run(as_dict=True)
+
+
+def make_consolidated_depreciation_entry(
+	schedules,
+	posting_date,
+	company,
+	finance_book,
+	depreciation_cost_center,
+	depreciation_series,
+	credit_and_debit_accounts,
+	accounting_dimensions,
+):
+	credit_account, debit_account = credit_and_debit_accounts
+
+	je = frappe.new_doc("Journal Entry")
+	je.voucher_type = "Depreciation Entry"
+	je.naming_series = depreciation_series
+	je.posting_date = posting_date
+	je.company = company
+	je.finance_book = finance_book
+	asset_count = len({d.asset for d in schedules})
+	total_depreciation = sum(flt(d.depreciation_amount) for d in schedules)
+	je.remark = f"Depreciation Entry against {asset_count} assets worth {total_depreciation}"
+
+	for d in schedules:
+		credit_entry, debit_entry = get_depreciation_entry_rows(
+			d.asset,
+			d,
+			d.depreciation_amount,
+			depreciation_cost_center,
+			credit_account,
+			debit_account,
+			accounting_dimensions,
+		)
+		je.append("accounts", credit_entry)
+		je.append("accounts", debit_entry)
+
+	je.flags.ignore_permissions = True
+	je.flags.planned_depr_entry = True
+	je.save()
+
+	ds = frappe.qb.DocType("Depreciation Schedule")
+	frappe.qb.update(ds).set(ds.journal_entry, je.name).where(ds.name.isin([d.name for d in schedules])).run()
+
+	if je.meta.get_workflow():
+		return je
+
+	je.submit()
+
+	depreciation_amounts = {}
+	for d in schedules:
+		key = (d.asset, cint(d.finance_book_id) or 1)
+		depreciation_amounts[key] = depreciation_amounts.get(key, 0.0) + flt(d.depreciation_amount)
+
+	afb = frappe.qb.DocType("Asset Finance Book")
+	for (asset_name, finance_book_id), depreciation_amount in depreciation_amounts.items():
+		(
+			frappe.qb.update(afb)
+			.set(afb.value_after_depreciation, afb.value_after_depreciation - depreciation_amount)
+			.where((afb.parent == asset_name) & (afb.parenttype == "Asset") & (afb.idx == finance_book_id))
+		).run()
+
+	for asset_name in {d.asset for d in schedules}:
+		asset = frappe.get_doc("Asset", asset_name)
+		asset.set_status()
+		asset.db_set("depr_entry_posting_status", "Successful")
+
+	return je
+
+
 def get_depreciable_asset_depr_schedules_data(date):
 	a = frappe.qb.DocType("Asset")
 	ads = frappe.qb.DocType("Asset Depreciation Schedule")
@@ -142,6 +350,53 @@ def make_depreciation_entry_for_all_asset_depr_schedules(asset_doc, date=None):
 		make_depreciation_entry(asset_depr_schedule_name, date)
 
 
+def get_depreciation_entry_rows(
+	asset_name,
+	dimension_values,
+	depreciation_amount,
+	depreciation_cost_center,
+	credit_account,
+	debit_account,
+	accounting_dimensions,
+):
+	"""Credit and debit rows of the Journal Entry for the depreciation of an asset, with the
+	accounting dimensions taken from `dimension_values` (the asset)"""
+	credit_entry = {
+		"account": credit_account,
+		"credit_in_account_currency": depreciation_amount,
+		"reference_type": "Asset",
+		"reference_name": asset_name,
+		"cost_center": depreciation_cost_center,
+	}
+
+	debit_entry = {
+		"account": debit_account,
+		"debit_in_account_currency": depreciation_amount,
+		"reference_type": "Asset",
+		"reference_name": asset_name,
+		"cost_center": depreciation_cost_center,
+	}
+
+	for dimension in accounting_dimensions:
+		if dimension_values.get(dimension["fieldname"]) or dimension.get("mandatory_for_bs"):
+			credit_entry.update(
+				{
+					dimension["fieldname"]: dimension_values.get(dimension["fieldname"])
+					or dimension.get("default_dimension")
+				}
+			)
+
+		if dimension_values.get(dimension["fieldname"]) or dimension.get("mandatory_for_pl"):
+			debit_entry.update(
+				{
+					dimension["fieldname"]: dimension_values.get(dimension["fieldname"])
+					or dimension.get("default_dimension")
+				}
+			)
+
+	return credit_entry, debit_entry
+
+
 def get_acc_frozen_upto():
 	acc_frozen_upto = frappe.db.get_single_value("Accounts Settings", "acc_frozen_upto")
 
@@ -279,38 +534,15 @@ def _make_journal_entry_for_depreciation(
 	je.finance_book = asset_depr_schedule_doc.finance_book
 	je.remark = f"Depreciation Entry against {asset.name} worth {depr_schedule.depreciation_amount}"
 
-	credit_entry = {
-		"account": credit_account,
-		"credit_in_account_currency": depr_schedule.depreciation_amount,
-		"reference_type": "Asset",
-		"reference_name": asset.name,
-		"cost_center": depreciation_cost_center,
-	}
-
-	debit_entry = {
-		"account": debit_account,
-		"debit_in_account_currency": depr_schedule.depreciation_amount,
-		"reference_type": "Asset",
-		"reference_name": asset.name,
-		"cost_center": depreciation_cost_center,
-	}
-
-	for dimension in accounting_dimensions:
-		if asset.get(dimension["fieldname"]) or dimension.get("mandatory_for_bs"):
-			credit_entry.update(
-				{
-					dimension["fieldname"]: asset.get(dimension["fieldname"])
-					or dimension.get("default_dimension")
-				}
-			)
-
-		if asset.get(dimension["fieldname"]) or dimension.get("mandatory_for_pl"):
-			debit_entry.update(
-				{
-					dimension["fieldname"]: asset.get(dimension["fieldname"])
-					or dimension.get("default_dimension")
-				}
-			)
+	credit_entry, debit_entry = get_depreciation_entry_rows(
+		asset.name,
+		asset,
+		depr_schedule.depreciation_amount,
+		depreciation_cost_center,
+		credit_account,
+		debit_account,
+		accounting_dimensions,
+	)
 
 	je.append("accounts", credit_entry)
 	je.append("accounts", debit_entry)
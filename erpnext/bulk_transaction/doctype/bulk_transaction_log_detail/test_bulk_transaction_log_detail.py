@@ -1,9 +1,41 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now
+
+from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
+from erpnext.utilities.bulk_transaction import get_progress_key, init_progress, job
 
 
 class TestBulkTransactionLogDetail(FrappeTestCase):
-	pass
+	def test_bulk_transaction_job_resume(self):
+		batch_started = now()
+		sales_orders = [make_sales_order(qty=1).name for _ in range(2)]
+
+		job([{"name": sales_orders[0]}], "Sales Order", "Sales Invoice", batch_started=batch_started)
+
+		batch_id = frappe.generate_hash(length=10)
+		init_progress(batch_id, len(sales_orders))
+		job(
+			[{"name": name} for name in sales_orders],
+			"Sales Order",
+			"Sales Invoice",
+			batch_id=batch_id,
+			batch_started=batch_started,
+		)
+
+		logs = frappe.get_all(
+			"Bulk Transaction Log Detail",
+			filters={"transaction_name": ("in", sales_orders), "creation": (">=", batch_started)},
+			fields=["transaction_name", "transaction_status"],
+		)
+		# documents converted by the first run are skipped on resume
+		self.assertEqual(
+			sorted((log.transaction_name, log.transaction_status) for log in logs),
+			sorted((name, "Success") for name in sales_orders),
+		)
+
+		# the batch completes with the skipped documents counted as processed
+		self.assertFalse(frappe.cache.get_value(get_progress_key(batch_id)))
@@ -28,6 +28,9 @@ from frappe.utils import (
 )
 
 import erpnext
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	remove_voucher_from_account_daily_balance,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimensions,
@@ -67,6 +70,7 @@ from erpnext.stock.get_item_details import (
 	get_item_details,
 	get_item_tax_map,
 	get_item_warehouse,
+	prefetch_item_details,
 )
 from erpnext.utilities.regional import temporary_flag
 from erpnext.utilities.transaction_base import TransactionBase
@@ -416,6 +420,7 @@ class AccountsController(TransactionBase):
 					== 1
 				)
 			).run()
+			remove_voucher_from_account_daily_balance(self.doctype, self.name)
 			gle = frappe.qb.DocType("GL Entry")
 			frappe.qb.from_(gle).delete().where(
 				(gle.voucher_type == self.doctype) & (gle.voucher_no == self.name)
@@ -946,107 +951,117 @@ class AccountsController(TransactionBase):
 
 			self.pricing_rules = []
 
-			for item in self.get("items"):
-				if item.get("item_code"):
-					args = parent_dict.copy()
-					args.update(item.as_dict())
-
-					args["doctype"] = self.doctype
-					args["name"] = self.name
-					args["child_doctype"] = item.doctype
-					args["child_docname"] = item.name
-					args["ignore_pricing_rule"] = (
-						self.ignore_pricing_rule if hasattr(self, "ignore_pricing_rule") else 0
-					)
+			def get_item_details_args(item):
+				args = parent_dict.copy()
+				args.update(item.as_dict())
 
-					if not args.get("transaction_date"):
-						args["transaction_date"] = args.get("posting_date")
-
-					if self.get("is_subcontracted"):
-						args["is_subcontracted"] = self.is_subcontracted
-
-					ret = get_item_details(args, self, for_validate=for_validate, overwrite_warehouse=False)
-					for fieldname, value in ret.items():
-						if item.meta.get_field(fieldname) and value is not None:
-							if (
-								item.get(fieldname) is None
-								or fieldname in force_item_fields
-								or (
-									fieldname in ["serial_no", "batch_no"]
-									and item.get("use_serial_batch_fields")
-								)
-							):
-								item.set(fieldname, value)
+				args["doctype"] = self.doctype
+				args["name"] = self.name
+				args["child_doctype"] = item.doctype
+				args["child_docname"] = item.name
+				args["ignore_pricing_rule"] = (
+					self.ignore_pricing_rule if hasattr(self, "ignore_pricing_rule") else 0
+				)
 
-								if fieldname == "batch_no" and item.batch_no and not item.is_free_item:
-									if ret.get("rate"):
-										item.set("rate", ret.get("rate"))
+				if not args.get("transaction_date"):
+					args["transaction_date"] = args.get("posting_date")
 
-									if not item.get("price_list_rate") and ret.get("price_list_rate"):
-										item.set("price_list_rate", ret.get("price_list_rate"))
+				if self.get("is_subcontracted"):
+					args["is_subcontracted"] = self.is_subcontracted
 
-							elif fieldname in ["cost_center", "conversion_factor"] and not item.get(
-								fieldname
-							):
-								item.set(fieldname, value)
-							elif fieldname == "item_tax_rate" and not (
-								self.get("is_return") and self.get("return_against")
-							):
-								item.set(fieldname, value)
-							elif fieldname == "serial_no":
-								# Ensure that serial numbers are matched against Stock UOM
-								item_conversion_factor = item.get("conversion_factor") or 1.0
-								item_qty = abs(item.get("qty")) * item_conversion_factor
+				return args
 
-								if item_qty != len(get_serial_nos(item.get("serial_no"))):
+			# args are built again for each row, as free items may be added or updated by pricing rules
+			with prefetch_item_details(
+				[get_item_details_args(item) for item in self.get("items") if item.get("item_code")]
+			):
+				for item in self.get("items"):
+					if item.get("item_code"):
+						args = get_item_details_args(item)
+						ret = get_item_details(
+							args, self, for_validate=for_validate, overwrite_warehouse=False
+						)
+						for fieldname, value in ret.items():
+							if item.meta.get_field(fieldname) and value is not None:
+								if (
+									item.get(fieldname) is None
+									or fieldname in force_item_fields
+									or (
+										fieldname in ["serial_no", "batch_no"]
+										and item.get("use_serial_batch_fields")
+									)
+								):
 									item.set(fieldname, value)
 
-							elif (
-								ret.get("pricing_rule_removed")
-								and value is not None
-								and fieldname
-								in [
-									"discount_percentage",
-									"discount_amount",
-									"rate",
-									"margin_rate_or_amount",
-									"margin_type",
-									"remove_free_item",
-								]
-							):
-								# reset pricing rule fields if pricing_rule_removed
-								item.set(fieldname, value)
+									if fieldname == "batch_no" and item.batch_no and not item.is_free_item:
+										if ret.get("rate"):
+											item.set("rate", ret.get("rate"))
 
-					if self.doctype in ["Purchase Invoice", "Sales Invoice"] and item.meta.get_field(
-						"is_fixed_asset"
-					):
-						item.set("is_fixed_asset", ret.get("is_fixed_asset", 0))
-
-					# Double check for cost center
-					# Items add via promotional scheme may not have cost center set
-					if hasattr(item, "cost_center") and not item.get("cost_center"):
-						item.set(
-							"cost_center",
-							self.get("cost_center") or erpnext.get_default_cost_center(self.company),
-						)
+										if not item.get("price_list_rate") and ret.get("price_list_rate"):
+											item.set("price_list_rate", ret.get("price_list_rate"))
 
-					if ret.get("pricing_rules"):
-						self.apply_pricing_rule_on_items(item, ret)
-						self.set_pricing_rule_details(item, ret)
-				else:
-					# Transactions line item without item code
-
-					uom = item.get("uom")
-					stock_uom = item.get("stock_uom")
-					if bool(uom) != bool(stock_uom):  # xor
-						item.stock_uom = item.uom = uom or stock_uom
-
-					# UOM cannot be zero so substitute as 1
-					item.conversion_factor = (
-						get_uom_conv_factor(item.get("uom"), item.get("stock_uom"))
-						or item.get("conversion_factor")
-						or 1
-					)
+								elif fieldname in ["cost_center", "conversion_factor"] and not item.get(
+									fieldname
+								):
+									item.set(fieldname, value)
+								elif fieldname == "item_tax_rate" and not (
+									self.get("is_return") and self.get("return_against")
+								):
+									item.set(fieldname, value)
+								elif fieldname == "serial_no":
+									# Ensure that serial numbers are matched against Stock UOM
+									item_conversion_factor = item.get("conversion_factor") or 1.0
+									item_qty = abs(item.get("qty")) * item_conversion_factor
+
+									if item_qty != len(get_serial_nos(item.get("serial_no"))):
+										item.set(fieldname, value)
+
+								elif (
+									ret.get("pricing_rule_removed")
+									and value is not None
+									and fieldname
+									in [
+										"discount_percentage",
+										"discount_amount",
+										"rate",
+										"margin_rate_or_amount",
+										"margin_type",
+										"remove_free_item",
+									]
+								):
+									# reset pricing rule fields if pricing_rule_removed
+									item.set(fieldname, value)
+
+						if self.doctype in ["Purchase Invoice", "Sales Invoice"] and item.meta.get_field(
+							"is_fixed_asset"
+						):
+							item.set("is_fixed_asset", ret.get("is_fixed_asset", 0))
+
+						# Double check for cost center
+						# Items add via promotional scheme may not have cost center set
+						if hasattr(item, "cost_center") and not item.get("cost_center"):
+							item.set(
+								"cost_center",
+								self.get("cost_center") or erpnext.get_default_cost_center(self.company),
+							)
+
+						if ret.get("pricing_rules"):
+							self.apply_pricing_rule_on_items(item, ret)
+							self.set_pricing_rule_details(item, ret)
+					else:
+						# Transactions line item without item code
+
+						uom = item.get("uom")
+						stock_uom = item.get("stock_uom")
+						if bool(uom) != bool(stock_uom):  # xor
+							item.stock_uom = item.uom = uom or stock_uom
+
+						# UOM cannot be zero so substitute as 1
+						item.conversion_factor = (
+							get_uom_conv_factor(item.get("uom"), item.get("stock_uom"))
+							or item.get("conversion_factor")
+							or 1
+						)
 
 			if self.doctype == "Purchase Invoice":
 				self.set_expense_account(for_validate)
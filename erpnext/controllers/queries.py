@@ -15,6 +15,7 @@ from frappe.utils import cint, nowdate, today, unique
 from pypika import Order
 
 import erpnext
+from erpnext.stock.doctype.item_search_token.item_search_token import search_items, use_item_search_index
 from erpnext.stock.get_item_details import _get_item_tax_template
 
 
@@ -230,12 +231,30 @@ def item_query(doctype, txt, searchfield, start, page_len, filters, as_dict=Fals
 			filters.pop("customer", None)
 			filters.pop("supplier", None)
 
-	description_cond = ""
-	if frappe.db.count(doctype, cache=True) < 50000:
-		# scan description only if items are less than 50000
-		description_cond = "or tabItem.description LIKE %(txt)s"
+	item_codes = None
+	if txt and use_item_search_index():
+		item_codes = search_items(txt)
+		if not item_codes:
+			return []
 
-	return frappe.db.sql(
+		search_cond = "tabItem.name in %(item_codes)s"
+		order_by = ""
+	else:
+		description_cond = ""
+		if frappe.db.count(doctype, cache=True) < 50000:
+			# scan description only if items are less than 50000
+			description_cond = "or tabItem.description LIKE %(txt)s"
+
+		search_cond = """({scond} or tabItem.item_code IN (select parent from `tabItem Barcode` where barcode LIKE %(txt)s)
+			{description_cond})""".format(scond=searchfields, description_cond=description_cond)
+		order_by = """order by
+			if(locate(%(_txt)s, name), locate(%(_txt)s, name), 99999),
+			if(locate(%(_txt)s, item_name), locate(%(_txt)s, item_name), 99999),
+			idx desc,
+			name, item_name
+		limit %(start)s, %(page_len)s"""
+
+	items = frappe.db.sql(
 		"""select
 			tabItem.name {columns}
 		from tabItem
@@ -243,20 +262,14 @@ def item_query(doctype, txt, searchfield, start, page_len, filters, as_dict=Fals
 			and tabItem.disabled=0
 			and tabItem.has_variants=0
 			and (tabItem.end_of_life > %(today)s or ifnull(tabItem.end_of_life, '0000-00-00')='0000-00-00')
-			and ({scond} or tabItem.item_code IN (select parent from `tabItem Barcode` where barcode LIKE %(txt)s)
-				{description_cond})
+			and {search_cond}
 			{fcond} {mcond}
-		order by
-			if(locate(%(_txt)s, name), locate(%(_txt)s, name), 99999),
-			if(locate(%(_txt)s, item_name), locate(%(_txt)s, item_name), 99999),
-			idx desc,
-			name, item_name
-		limit %(start)s, %(page_len)s """.format(
+		{order_by}""".format(
 			columns=columns,
-			scond=searchfields,
+			search_cond=search_cond,
 			fcond=get_filters_cond(doctype, filters, conditions).replace("%", "%%"),
 			mcond=get_match_cond(doctype).replace("%", "%%"),
-			description_cond=description_cond,
+			order_by=order_by,
 		),
 		{
 			"today": nowdate(),
@@ -264,10 +277,19 @@ def item_query(doctype, txt, searchfield, start, page_len, filters, as_dict=Fals
 			"_txt": txt.replace("%", ""),
 			"start": start,
 			"page_len": page_len,
+			"item_codes": tuple(item_codes or []),
 		},
 		as_dict=as_dict,
 	)
 
+	if item_codes:
+		# matches from the search index, ordered by their rank
+		rank = {item_code: i for i, item_code in enumerate(item_codes)}
+		items = sorted(items, key=lambda d: rank[d.name if as_dict else d[0]])
+		items = items[cint(start) : cint(start) + cint(page_len)]
+
+	return items
+
 
 @frappe.whitelist()
 @frappe.validate_and_sanitize_search_inputs
@@ -476,6 +476,7 @@ scheduler_events = {
 	"monthly_long": [
 		"erpnext.accounts.deferred_revenue.process_deferred_accounting",
 		"erpnext.accounts.utils.auto_create_exchange_rate_revaluation_monthly",
+		"erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint.create_monthly_stock_balance_checkpoints",
 	],
 }
 
@@ -557,6 +558,7 @@ accounting_dimension_doctypes = [
 	"Subcontracting Receipt",
 	"Subcontracting Receipt Item",
 	"Account Closing Balance",
+	"Account Daily Balance",
 	"Supplier Quotation",
 	"Supplier Quotation Item",
 	"Payment Reconciliation",
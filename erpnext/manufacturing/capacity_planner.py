@@ -0,0 +1,224 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# License: GNU General Public License v3. See license.txt
+
+import datetime
+from bisect import bisect_left, insort
+
+import frappe
+from frappe.query_builder import Criterion
+from frappe.utils import add_to_date, cint, get_datetime, get_time, getdate
+
+from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
+	get_mins_between_operations,
+)
+from erpnext.manufacturing.doctype.workstation_type.workstation_type import get_workstations
+from erpnext.support.doctype.issue.issue import get_holidays
+
+# scheduling stops searching for a free slot beyond this, the caller validates the planned end time
+MAX_PLANNING_DAYS = 366
+
+
+class WorkstationSchedule:
+	"""Busy intervals of a workstation, sorted by start time.
+
+	Overlaps with a slot are found by bisecting on the start time, looking back only as far as
+	the longest interval."""
+
+	def __init__(self, workstation):
+		self.workstation = workstation
+		self.intervals = []
+		self.max_length = datetime.timedelta(0)
+		self.loaded_from = None
+
+		if workstation:
+			doc = frappe.get_cached_doc("Workstation", workstation)
+			self.production_capacity = cint(doc.production_capacity) or 1
+			self.working_hours = sorted(
+				(get_time(d.start_time), get_time(d.end_time))
+				for d in doc.working_hours
+				if d.start_time and d.end_time
+			)
+			self.holidays = set()
+			if doc.holiday_list and not cint(
+				frappe.db.get_single_value("Manufacturing Settings", "allow_production_on_holidays")
+			):
+				self.holidays = {getdate(d) for d in get_holidays(doc.holiday_list)}
+		else:
+			self.production_capacity = 0
+			self.working_hours = []
+			self.holidays = set()
+
+	def add(self, from_time, to_time):
+		if from_time < to_time:
+			insort(self.intervals, (from_time, to_time))
+			self.max_length = max(self.max_length, to_time - from_time)
+
+	def get_overlaps(self, from_time, to_time):
+		start = bisect_left(self.intervals, (from_time - self.max_length,))
+		end = bisect_left(self.intervals, (to_time,))
+
+		return [d for d in self.intervals[start:end] if d[1] > from_time]
+
+	def get_conflict(self, from_time, to_time):
+		"""Return the earliest end time of the overlapping intervals if the workstation has no
+		free capacity during the slot, else None"""
+		if not self.production_capacity:
+			return
+
+		overlaps = self.get_overlaps(from_time, to_time)
+		if len(overlaps) < self.production_capacity:
+			return
+
+		if get_max_concurrency(overlaps) >= self.production_capacity:
+			return min(d[1] for d in overlaps)
+
+	def get_working_slot(self, from_time):
+		"""Return the start and end of the working slot available at or after `from_time`.
+		End is None if the workstation has no working hours."""
+		if not self.working_hours:
+			return from_time, None
+
+		day = from_time.date()
+		for _i in range(MAX_PLANNING_DAYS):
+			if day not in self.holidays:
+				for start_time, end_time in self.working_hours:
+					slot_end = datetime.datetime.combine(day, end_time)
+					if from_time < slot_end:
+						return max(from_time, datetime.datetime.combine(day, start_time)), slot_end
+
+			day += datetime.timedelta(days=1)
+
+		return from_time, None
+
+
+class CapacityPlanner:
+	"""Schedules operations of Job Cards on workstations in memory.
+
+	Time logs of the existing Job Cards are loaded once per workstation, and the slots allocated
+	by the planner are added to them, so that all the operations of one or many Work Orders can
+	be planned without querying for every attempted slot."""
+
+	def __init__(self):
+		self.schedules = {}
+		self.workstations = {}
+		self.mins_between_operations = get_mins_between_operations()
+		self.allow_overtime = cint(frappe.db.get_single_value("Manufacturing Settings", "allow_overtime"))
+
+	def get_schedule(self, workstation, from_time):
+		if workstation not in self.schedules:
+			self.schedules[workstation] = WorkstationSchedule(workstation)
+
+		schedule = self.schedules[workstation]
+		if workstation and (not schedule.loaded_from or from_time < schedule.loaded_from):
+			for d in get_busy_intervals(workstation, from_time, schedule.loaded_from):
+				schedule.add(get_datetime(d.from_time), get_datetime(d.to_time))
+
+			schedule.loaded_from = from_time
+
+		return schedule
+
+	def get_workstations(self, workstation_type):
+		if workstation_type not in self.workstations:
+			self.workstations[workstation_type] = get_workstations(workstation_type)
+
+		return self.workstations[workstation_type]
+
+	def schedule(self, from_time, time_in_mins, workstation=None, workstation_type=None):
+		"""Allocate `time_in_mins` starting at or after `from_time`.
+
+		If only the workstation type is given, the workstation of the type which can finish
+		the operation first is picked. Returns the workstation and the allocated (from, to) slots."""
+		from_time = get_datetime(from_time)
+
+		workstations = [workstation]
+		if not workstation and workstation_type:
+			workstations = self.get_workstations(workstation_type) or [None]
+
+		best = None
+		for name in workstations:
+			slots = self.get_slots(self.get_schedule(name, from_time), from_time, time_in_mins)
+			if not best or slots[-1][1] < best[1][-1][1]:
+				best = (name, slots)
+
+		workstation, slots = best
+		schedule = self.schedules[workstation]
+		for slot in slots:
+			schedule.add(*slot)
+
+		return workstation, slots
+
+	def get_slots(self, schedule, from_time, time_in_mins):
+		remaining = datetime.timedelta(minutes=time_in_mins)
+		horizon = add_to_date(from_time, days=MAX_PLANNING_DAYS)
+		ignore_working_hours = self.allow_overtime or not schedule.working_hours
+
+		slots = []
+		while remaining > datetime.timedelta(0):
+			if from_time > horizon:
+				# no free slot found, let the caller validate the planned end time
+				slots.append((from_time, from_time + remaining))
+				break
+
+			slot_end = None
+			if not ignore_working_hours:
+				from_time, slot_end = schedule.get_working_slot(from_time)
+
+			to_time = from_time + remaining
+			if slot_end and slot_end < to_time:
+				to_time = slot_end
+
+			if busy_till := schedule.get_conflict(from_time, to_time):
+				from_time = busy_till + self.mins_between_operations
+				continue
+
+			slots.append((from_time, to_time))
+			remaining -= to_time - from_time
+			from_time = to_time
+
+		return slots or [(from_time, from_time)]
+
+
+def get_max_concurrency(intervals):
+	events = sorted([(d[0], 1) for d in intervals] + [(d[1], -1) for d in intervals])
+
+	concurrency = max_concurrency = 0
+	for _time, change in events:
+		concurrency += change
+		max_concurrency = max(max_concurrency, concurrency)
+
+	return max_concurrency
+
+
+def get_busy_intervals(workstation, from_time, to_time=None):
+	"""Time logs and scheduled time of the open Job Cards of the workstation ending after `from_time`
+	(and till `to_time`, if set)"""
+	jc = frappe.qb.DocType("Job Card")
+
+	intervals = []
+	for doctype in ("Job Card Time Log", "Job Card Scheduled Time"):
+		jctl = frappe.qb.DocType(doctype)
+
+		conditions = [jctl.to_time > from_time]
+		if to_time:
+			conditions.append(jctl.to_time <= to_time)
+
+		if doctype == "Job Card Time Log":
+			conditions.append(jc.docstatus < 2)
+		else:
+			conditions.extend([jc.docstatus == 0, jc.total_time_in_mins == 0])
+
+		intervals.extend(
+			frappe.qb.from_(jctl)
+			.inner_join(jc)
+			.on(jctl.parent == jc.name)
+			.select(jctl.from_time, jctl.to_time)
+			.where(
+				(jc.workstation == workstation)
+				& (jctl.from_time.isnotnull())
+				& (jctl.to_time.isnotnull())
+				& Criterion.all(conditions)
+			)
+			.run(as_dict=True)
+		)
+
+	return intervals
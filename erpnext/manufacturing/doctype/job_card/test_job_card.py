@@ -8,8 +8,9 @@ import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase, change_settings
 from frappe.utils import random_string
-from frappe.utils.data import add_to_date, now, today
+from frappe.utils.data import add_to_date, get_datetime, now, today
 
+from erpnext.manufacturing.capacity_planner import CapacityPlanner
 from erpnext.manufacturing.doctype.job_card.job_card import (
 	JobCardOverTransferError,
 	OperationMismatchError,
@@ -697,6 +698,44 @@ class TestJobCard(FrappeTestCase):
 		self.assertEqual(wo_doc.process_loss_qty, 2)
 		self.assertEqual(wo_doc.status, "Completed")
 
+	@change_settings("Manufacturing Settings", {"mins_between_operations": 10, "allow_overtime": 0})
+	def test_capacity_planner(self):
+		workstation = frappe.get_doc(
+			{
+				"doctype": "Workstation",
+				"workstation_name": "_Test Workstation " + random_string(6),
+				"production_capacity": 2,
+				"working_hours": [{"start_time": "09:00:00", "end_time": "17:00:00"}],
+			}
+		).insert()
+
+		def schedule(from_time, time_in_mins):
+			return planner.schedule(from_time, time_in_mins, workstation=workstation.name)[1]
+
+		def slot(from_time, to_time):
+			return (get_datetime(from_time), get_datetime(to_time))
+
+		planner = CapacityPlanner()
+
+		# split across working hours
+		self.assertEqual(
+			schedule("2026-01-05 16:00:00", 120),
+			[
+				slot("2026-01-05 16:00:00", "2026-01-05 17:00:00"),
+				slot("2026-01-06 09:00:00", "2026-01-06 10:00:00"),
+			],
+		)
+
+		# parallel as per production capacity
+		self.assertEqual(
+			schedule("2026-01-06 09:00:00", 60), [slot("2026-01-06 09:00:00", "2026-01-06 10:00:00")]
+		)
+
+		# capacity is full, planned after the earliest slot ends
+		self.assertEqual(
+			schedule("2026-01-06 09:00:00", 60), [slot("2026-01-06 10:10:00", "2026-01-06 11:10:00")]
+		)
+
 
 def create_bom_with_multiple_operations():
 	"Create a BOM with multiple operations and Material Transfer against Job Card"
@@ -935,6 +935,7 @@ class ProductionPlan(Document):
 		self.sub_assembly_items = []
 		sub_assembly_items_store = []  # temporary store to process all subassembly items
 		bin_details = frappe._dict()
+		bom_children = {}  # BOM Items of each BOM, shared by all the rows
 
 		for row in self.po_items:
 			if self.skip_available_sub_assembly_item and not self.sub_assembly_warehouse:
@@ -957,6 +958,7 @@ class ProductionPlan(Document):
 				self.company,
 				warehouse=self.sub_assembly_warehouse,
 				skip_available_sub_assembly_item=self.skip_available_sub_assembly_item,
+				bom_children=bom_children,
 			)
 			self.set_sub_assembly_items_based_on_level(row, bom_data, manufacturing_type)
 			sub_assembly_items_store.extend(bom_data)
@@ -1153,7 +1155,23 @@ def download_raw_materials(doc, warehouses=None):
 	build_csv_response(item_list, doc.name)
 
 
-def get_exploded_items(item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None):
+def get_exploded_items(
+	item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None, bom_items_cache=None
+):
+	if bom_items_cache is None:
+		bom_items_cache = {}
+
+	key = ("BOM Explosion Item", bom_no, company, include_non_stock_items)
+	if key not in bom_items_cache:
+		bom_items_cache[key] = get_exploded_items_per_unit(bom_no, company, include_non_stock_items)
+
+	for d in bom_items_cache[key]:
+		item_details.setdefault(d.item_code, frappe._dict(d, qty=d.qty * planned_qty))
+
+	return item_details
+
+
+def get_exploded_items_per_unit(bom_no, company, include_non_stock_items):
 	bei = frappe.qb.DocType("BOM Explosion Item")
 	bom = frappe.qb.DocType("BOM")
 	item = frappe.qb.DocType("Item")
@@ -1171,7 +1189,7 @@ def get_exploded_items(item_details, company, bom_no, include_non_stock_items, p
 		.left_join(item_uom)
 		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
 		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
+			IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0).as_("qty"),
 			item.item_name,
 			item.name.as_("item_code"),
 			bei.description,
@@ -1196,9 +1214,8 @@ def get_exploded_items(item_details, company, bom_no, include_non_stock_items, p
 	for d in data:
 		if not d.conversion_factor and d.purchase_uom:
 			d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-		item_details.setdefault(d.get("item_code"), d)
 
-	return item_details
+	return data
 
 
 def get_uom_conversion_factor(item_code, uom):
@@ -1217,58 +1234,28 @@ def get_subitems(
 	include_subcontracted_items,
 	parent_qty,
 	planned_qty=1,
+	bom_items_cache=None,
 ):
-	bom_item = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	items = (
-		frappe.qb.from_(bom_item)
-		.join(bom)
-		.on(bom.name == bom_item.parent)
-		.join(item)
-		.on(bom_item.item_code == item.name)
-		.left_join(item_default)
-		.on((item.name == item_default.parent) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			bom_item.item_code,
-			item.default_material_request_type,
-			item.item_name,
-			IfNull(parent_qty * Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)) * planned_qty, 0).as_(
-				"qty"
-			),
-			item.is_sub_contracted_item.as_("is_sub_contracted"),
-			bom_item.source_warehouse,
-			item.default_bom.as_("default_bom"),
-			bom_item.description.as_("description"),
-			bom_item.stock_uom.as_("stock_uom"),
-			item.min_order_qty.as_("min_order_qty"),
-			item.safety_stock.as_("safety_stock"),
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-			bom.item.as_("main_bom_item"),
+	if bom_items_cache is None:
+		bom_items_cache = {}
+
+	key = ("BOM Item", bom_no, company, include_non_stock_items)
+	if key not in bom_items_cache:
+		load_bom_items(
+			[bom_no],
+			company,
+			include_non_stock_items,
+			bom_items_cache,
+			explode=data.get("include_exploded_items"),
 		)
-		.where(
-			(bom.name == bom_no)
-			& (bom_item.docstatus < 2)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-		)
-		.groupby(bom_item.item_code)
-	).run(as_dict=True)
 
-	for d in items:
+	for d in bom_items_cache[key]:
+		d = frappe._dict(d, qty=flt(parent_qty) * d.qty * flt(planned_qty))
+
 		if not data.get("include_exploded_items") or not d.default_bom:
 			if d.item_code in item_details:
 				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
 			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-
 				item_details[d.item_code] = d
 
 		if data.get("include_exploded_items") and d.default_bom:
@@ -1285,10 +1272,78 @@ def get_subitems(
 						include_non_stock_items,
 						include_subcontracted_items,
 						d.qty,
+						bom_items_cache=bom_items_cache,
 					)
 	return item_details
 
 
+def load_bom_items(bom_nos, company, include_non_stock_items, bom_items_cache, explode=False):
+	"""Load the BOM Items of the given BOMs, with qty per unit of the BOM, into `bom_items_cache`.
+
+	If `explode` is set, the BOMs of the sub-assembly items are loaded as well, one level at a time,
+	so that the whole tree is fetched with one query per level."""
+
+	bom_item = frappe.qb.DocType("BOM Item")
+	bom = frappe.qb.DocType("BOM")
+	item = frappe.qb.DocType("Item")
+	item_default = frappe.qb.DocType("Item Default")
+	item_uom = frappe.qb.DocType("UOM Conversion Detail")
+
+	def get_key(bom_no):
+		return ("BOM Item", bom_no, company, include_non_stock_items)
+
+	while bom_nos := {bom_no for bom_no in bom_nos if get_key(bom_no) not in bom_items_cache}:
+		items = (
+			frappe.qb.from_(bom_item)
+			.join(bom)
+			.on(bom.name == bom_item.parent)
+			.join(item)
+			.on(bom_item.item_code == item.name)
+			.left_join(item_default)
+			.on((item.name == item_default.parent) & (item_default.company == company))
+			.left_join(item_uom)
+			.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
+			.select(
+				bom.name.as_("parent_bom"),
+				bom_item.item_code,
+				item.default_material_request_type,
+				item.item_name,
+				IfNull(Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)), 0).as_("qty"),
+				item.is_sub_contracted_item.as_("is_sub_contracted"),
+				bom_item.source_warehouse,
+				item.default_bom.as_("default_bom"),
+				bom_item.description.as_("description"),
+				bom_item.stock_uom.as_("stock_uom"),
+				item.min_order_qty.as_("min_order_qty"),
+				item.safety_stock.as_("safety_stock"),
+				item_default.default_warehouse,
+				item.purchase_uom,
+				item_uom.conversion_factor,
+				bom.item.as_("main_bom_item"),
+			)
+			.where(
+				(bom.name.isin(bom_nos))
+				& (bom_item.docstatus < 2)
+				& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
+			)
+			.groupby(bom.name, bom_item.item_code)
+		).run(as_dict=True)
+
+		for bom_no in bom_nos:
+			bom_items_cache[get_key(bom_no)] = []
+
+		for d in items:
+			if not d.conversion_factor and d.purchase_uom:
+				d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
+
+			bom_items_cache[get_key(d.pop("parent_bom"))].append(d)
+
+		if not explode:
+			break
+
+		bom_nos = {d.default_bom for d in items if d.default_bom}
+
+
 def get_material_request_items(
 	doc,
 	row,
@@ -1542,6 +1597,9 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 
 	so_item_details = frappe._dict()
 
+	# BOM Items per unit of each BOM, shared by all the rows
+	bom_items_cache = {}
+
 	sub_assembly_items = defaultdict(int)
 	if doc.get("skip_available_sub_assembly_item") and doc.get("sub_assembly_items"):
 		for d in doc.get("sub_assembly_items"):
@@ -1592,6 +1650,7 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 						include_non_stock_items,
 						planned_qty=planned_qty,
 						doc=doc,
+						bom_items_cache=bom_items_cache,
 					)
 				else:
 					item_details = get_subitems(
@@ -1604,6 +1663,7 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 						include_subcontracted_items,
 						1,
 						planned_qty=planned_qty,
+						bom_items_cache=bom_items_cache,
 					)
 		elif data.get("item_code"):
 			item_master = frappe.get_doc("Item", data["item_code"]).as_dict()
@@ -1761,9 +1821,15 @@ def get_sub_assembly_items(
 	warehouse=None,
 	indent=0,
 	skip_available_sub_assembly_item=False,
+	bom_children=None,
 ):
-	data = get_bom_children(parent=bom_no)
-	for d in data:
+	if bom_children is None:
+		bom_children = {}
+
+	if bom_no not in bom_children:
+		bom_children[bom_no] = get_bom_children(parent=bom_no)
+
+	for d in bom_children[bom_no]:
 		if d.expandable:
 			parent_item_code = frappe.get_cached_value("BOM", bom_no, "item")
 			stock_qty = (d.stock_qty / d.parent_bom_qty) * flt(to_produce_qty)
@@ -1816,6 +1882,7 @@ def get_sub_assembly_items(
 						warehouse,
 						indent=indent + 1,
 						skip_available_sub_assembly_item=skip_available_sub_assembly_item,
+						bom_children=bom_children,
 					)
 
 
@@ -10,6 +10,7 @@ from erpnext.manufacturing.doctype.production_plan.production_plan import (
 	get_non_completed_production_plans,
 	get_sales_orders,
 	get_warehouse_list,
+	load_bom_items,
 )
 from erpnext.manufacturing.doctype.work_order.work_order import OverProductionError
 from erpnext.manufacturing.doctype.work_order.work_order import make_stock_entry as make_se_from_wo
@@ -1359,6 +1360,57 @@ class TestProductionPlan(FrappeTestCase):
 			if row.item_code == "ChildPart2 For SUB Test":
 				self.assertEqual(row.quantity, 2)
 
+	def test_bom_items_loaded_level_wise(self):
+		from erpnext.manufacturing.doctype.bom.test_bom import create_nested_bom
+
+		bom_tree = {
+			"Finished Goods For BOM Cache Test": {
+				"SubAssembly1 For BOM Cache Test": {
+					"SubAssembly2 For BOM Cache Test": {"ChildPart1 For BOM Cache Test": {}}
+				},
+				"ChildPart2 For BOM Cache Test": {},
+			}
+		}
+
+		parent_bom = create_nested_bom(bom_tree, prefix="")
+		bom_items_cache = {}
+		load_bom_items([parent_bom.name], "_Test Company", 1, bom_items_cache, explode=True)
+
+		# all the BOMs of the tree are loaded
+		boms = [key[1] for key in bom_items_cache]
+		self.assertEqual(len(boms), 3)
+		self.assertIn(parent_bom.name, boms)
+
+		for item_code in ("SubAssembly1 For BOM Cache Test", "SubAssembly2 For BOM Cache Test"):
+			self.assertIn(frappe.db.get_value("Item", item_code, "default_bom"), boms)
+
+		plan = create_production_plan(
+			item_code=parent_bom.item,
+			planned_qty=3,
+			ignore_existing_ordered_qty=1,
+			skip_getting_mr_items=True,
+			do_not_save=True,
+		)
+		plan.append(
+			"po_items",
+			{
+				"use_multi_level_bom": 1,
+				"item_code": parent_bom.item,
+				"bom_no": parent_bom.name,
+				"planned_qty": 2,
+				"planned_start_date": now_datetime(),
+			},
+		)
+		for row in plan.po_items:
+			row.include_exploded_items = 1
+
+		# raw materials of the shared sub-assemblies are added up across the rows
+		items = get_items_for_material_requests(plan.as_dict())
+		qty = {d["item_code"]: d["required_bom_qty"] for d in items}
+		self.assertEqual(qty["ChildPart1 For BOM Cache Test"], 5)
+		self.assertEqual(qty["ChildPart2 For BOM Cache Test"], 5)
+		self.assertNotIn("SubAssembly1 For BOM Cache Test", qty)
+
 	def test_reserve_sub_assembly_items(self):
 		from erpnext.manufacturing.doctype.bom.test_bom import create_nested_bom
 		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
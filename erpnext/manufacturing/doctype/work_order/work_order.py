@@ -23,6 +23,7 @@ from frappe.utils import (
 )
 from pypika import functions as fn
 
+from erpnext.manufacturing.capacity_planner import CapacityPlanner
 from erpnext.manufacturing.doctype.bom.bom import (
 	get_bom_item_rate,
 	get_bom_items_as_dict,
@@ -635,22 +636,27 @@ class WorkOrder(Document):
 				).format(next((op.idx for op in self.operations if not op.sequence_id), None))
 			)
 
+		# slots of all the operations are planned against the same in-memory schedule
+		planner = CapacityPlanner() if enable_capacity_planning else None
+
 		for idx, row in enumerate(self.operations):
 			qty = self.qty
 			while qty > 0:
 				qty = split_qty_based_on_batch_size(self, row, qty)
 				if row.job_card_qty > 0:
-					self.prepare_data_for_job_card(row, idx, plan_days, enable_capacity_planning)
+					self.prepare_data_for_job_card(
+						row, idx, plan_days, enable_capacity_planning, planner=planner
+					)
 
 		planned_end_date = self.operations and self.operations[-1].planned_end_time
 		if planned_end_date:
 			self.db_set("planned_end_date", planned_end_date)
 
-	def prepare_data_for_job_card(self, row, idx, plan_days, enable_capacity_planning):
+	def prepare_data_for_job_card(self, row, idx, plan_days, enable_capacity_planning, planner=None):
 		self.set_operation_start_end_time(row, idx)
 
 		job_card_doc = create_job_card(
-			self, row, auto_create=True, enable_capacity_planning=enable_capacity_planning
+			self, row, auto_create=True, enable_capacity_planning=enable_capacity_planning, planner=planner
 		)
 
 		if enable_capacity_planning and job_card_doc:
@@ -1640,7 +1646,7 @@ def validate_operation_data(row):
 		)
 
 
-def create_job_card(work_order, row, enable_capacity_planning=False, auto_create=False):
+def create_job_card(work_order, row, enable_capacity_planning=False, auto_create=False, planner=None):
 	doc = frappe.new_doc("Job Card")
 	doc.update(
 		{
@@ -1669,7 +1675,7 @@ def create_job_card(work_order, row, enable_capacity_planning=False, auto_create
 	if auto_create:
 		doc.flags.ignore_mandatory = True
 		if enable_capacity_planning:
-			doc.schedule_time_logs(row)
+			doc.schedule_time_logs(row, planner=planner)
 
 		doc.insert()
 		frappe.msgprint(_("Job card {0} created").format(get_link_to_form("Job Card", doc.name)), alert=True)
@@ -0,0 +1,14 @@
+import frappe
+
+from erpnext.stock.doctype.item_search_token.item_search_token import (
+	enqueue_rebuild_item_search_index,
+	is_item_search_index_enabled,
+)
+
+
+def execute():
+	# the index is only used once a rebuild marks it as ready
+	if is_item_search_index_enabled() and not frappe.db.get_single_value(
+		"Stock Settings", "item_search_index_ready"
+	):
+		enqueue_rebuild_item_search_index()
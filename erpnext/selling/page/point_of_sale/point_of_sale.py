@@ -10,6 +10,7 @@ from frappe.utils.nestedset import get_root_of
 
 from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_stock_availability
 from erpnext.accounts.doctype.pos_profile.pos_profile import get_child_nodes, get_item_groups
+from erpnext.stock.doctype.item_search_token.item_search_token import search_items, use_item_search_index
 from erpnext.stock.utils import scan_barcode
 
 
@@ -140,7 +141,16 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 	if not frappe.db.exists("Item Group", item_group):
 		item_group = get_root_of("Item Group")
 
-	condition = get_conditions(search_term)
+	item_codes = None
+	if search_term and use_item_search_index():
+		item_codes = search_items(search_term)
+		if not item_codes:
+			return result
+
+		condition = "item.name in ({})".format(", ".join(frappe.db.escape(d) for d in item_codes))
+	else:
+		condition = get_conditions(search_term)
+
 	condition += get_item_group_condition(pos_profile)
 
 	lft, rgt = frappe.db.get_value("Item Group", item_group, ["lft", "rgt"])
@@ -150,6 +160,9 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 		bin_join_selection = "LEFT JOIN `tabBin` bin ON bin.item_code = item.name"
 		bin_join_condition = "AND (item.is_stock_item = 0 OR (item.is_stock_item = 1 AND bin.warehouse = %(warehouse)s AND bin.actual_qty > 0))"
 
+	# matches from the search index are paginated after ordering them by their rank
+	limit = "" if item_codes else f"LIMIT {cint(page_length)} offset {cint(start)}"
+
 	items_data = frappe.db.sql(
 		"""
 		SELECT
@@ -171,10 +184,8 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 			{bin_join_condition}
 		ORDER BY
 			item.name asc
-		LIMIT
-			{page_length} offset {start}""".format(
-			start=cint(start),
-			page_length=cint(page_length),
+		{limit}""".format(
+			limit=limit,
 			lft=cint(lft),
 			rgt=cint(rgt),
 			condition=condition,
@@ -185,6 +196,11 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 		as_dict=1,
 	)
 
+	if item_codes:
+		rank = {item_code: i for i, item_code in enumerate(item_codes)}
+		items_data = sorted(items_data, key=lambda d: rank[d.item_code])
+		items_data = items_data[cint(start) : cint(start) + cint(page_length)]
+
 	# return (empty) list if there are no results
 	if not items_data:
 		return result
@@ -4,9 +4,14 @@
 # For license information, please see license.txt
 
 
+from bisect import bisect_right
+
+import frappe
 from frappe import _, throw
 from frappe.model.document import Document
-from frappe.utils import cint, formatdate, get_datetime_str, nowdate
+from frappe.utils import add_days, cint, flt, formatdate, get_datetime_str, getdate, nowdate
+
+CURRENCY_EXCHANGE_RATES_KEY = "currency_exchange_rates"
 
 
 class CurrencyExchange(Document):
@@ -53,3 +58,61 @@ class CurrencyExchange(Document):
 
 		if not cint(self.for_buying) and not cint(self.for_selling):
 			throw(_("Currency Exchange must be applicable for Buying or for Selling."))
+
+	def on_update(self):
+		clear_currency_exchange_rates()
+
+	def on_trash(self):
+		clear_currency_exchange_rates()
+
+
+def clear_currency_exchange_rates():
+	from erpnext.accounts.utils import clear_cached_value
+
+	clear_cached_value(CURRENCY_EXCHANGE_RATES_KEY)
+
+
+def get_currency_exchange_rate(from_currency, to_currency, date, args=None, stale_days=None):
+	"""Latest rate of the currency pair on or before `date`, of the rates for buying or for selling
+	if `args` is "for_buying" or "for_selling". Rates of `stale_days` days or more before `date` are
+	not used. Returns None if no rate is found."""
+	purpose = {"for_buying": "buying", "for_selling": "selling"}.get(args, "all")
+	dates, rates = get_currency_exchange_rates(from_currency, to_currency)[purpose]
+
+	date = getdate(date)
+	idx = bisect_right(dates, date)
+	if not idx:
+		return None
+
+	if stale_days is not None and dates[idx - 1] <= getdate(add_days(date, -stale_days)):
+		return None
+
+	return rates[idx - 1]
+
+
+def get_currency_exchange_rates(from_currency, to_currency):
+	return frappe.cache.hget(
+		CURRENCY_EXCHANGE_RATES_KEY,
+		f"{from_currency}:{to_currency}",
+		lambda: build_currency_exchange_rates(from_currency, to_currency),
+	)
+
+
+def build_currency_exchange_rates(from_currency, to_currency):
+	"""Dates and rates of the currency pair sorted by date, of all the rates and of the rates for
+	buying and for selling"""
+	exchange_rates = {"all": ([], []), "buying": ([], []), "selling": ([], [])}
+
+	for d in frappe.get_all(
+		"Currency Exchange",
+		filters={"from_currency": from_currency, "to_currency": to_currency},
+		fields=["date", "exchange_rate", "for_buying", "for_selling"],
+		order_by="date asc, creation asc",
+	):
+		for purpose, applicable in (("all", 1), ("buying", d.for_buying), ("selling", d.for_selling)):
+			if cint(applicable):
+				dates, rates = exchange_rates[purpose]
+				dates.append(getdate(d.date))
+				rates.append(flt(d.exchange_rate))
+
+	return exchange_rates
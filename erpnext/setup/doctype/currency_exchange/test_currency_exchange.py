@@ -172,6 +172,32 @@ class TestCurrencyExchange(unittest.TestCase):
 		exchange_rate = get_exchange_rate("USD", "INR", "2015-12-15", "for_buying")
 		self.assertEqual(flt(exchange_rate, 3), 66.999)
 
+	def test_exchange_rate_cache_on_update(self, mock_get):
+		save_new_records(test_records)
+		frappe.db.set_single_value("Accounts Settings", "allow_stale", 1)
+		self.assertEqual(get_exchange_rate("USD", "EUR", "2016-02-15", "for_selling"), 0.773)
+
+		currency_exchange = frappe.get_doc(
+			{
+				"doctype": "Currency Exchange",
+				"date": "2016-02-10",
+				"exchange_rate": 0.8,
+				"from_currency": "USD",
+				"to_currency": "EUR",
+				"for_buying": 0,
+				"for_selling": 1,
+			}
+		).insert()
+		self.assertEqual(get_exchange_rate("USD", "EUR", "2016-02-15", "for_selling"), 0.8)
+		self.assertEqual(get_exchange_rate("USD", "EUR", "2016-02-09", "for_selling"), 0.773)
+
+		currency_exchange.exchange_rate = 0.81
+		currency_exchange.save()
+		self.assertEqual(get_exchange_rate("USD", "EUR", "2016-02-15", "for_selling"), 0.81)
+
+		currency_exchange.delete()
+		self.assertEqual(get_exchange_rate("USD", "EUR", "2016-02-15", "for_selling"), 0.773)
+
 	def test_exchange_rate_strict_switched(self, mock_get):
 		# Start with allow_stale is True
 		exchange_rate = get_exchange_rate("USD", "INR", "2016-01-15", "for_buying")
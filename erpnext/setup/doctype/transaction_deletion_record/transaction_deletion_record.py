@@ -10,6 +10,10 @@ from frappe.model.document import Document
 from frappe.utils import cint, comma_and, create_batch, get_link_to_form
 from frappe.utils.background_jobs import get_job, is_job_enqueued
 
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	remove_gl_entries_from_account_daily_balance,
+)
+
 LEDGER_ENTRY_DOCTYPES = frozenset(
 	(
 		"GL Entry",
@@ -390,6 +394,9 @@ class TransactionDeletionRecord(Document):
 			frappe.db.delete(table, {"parent": ["in", reference_doc_names]})
 
 	def delete_docs_linked_with_specified_company(self, doctype, reference_doc_names):
+		if doctype == "GL Entry":
+			remove_gl_entries_from_account_daily_balance(reference_doc_names)
+
 		frappe.db.delete(doctype, {"name": ("in", reference_doc_names)})
 
 	def update_naming_series(self, naming_series, doctype_name):
@@ -3,11 +3,12 @@
 
 import frappe
 from frappe import _
-from frappe.utils import add_days, flt, get_datetime_str, nowdate
+from frappe.utils import cint, flt, nowdate
 from frappe.utils.data import getdate, now_datetime
 from frappe.utils.nestedset import get_root_of
 
 from erpnext import get_default_company
+from erpnext.setup.doctype.currency_exchange.currency_exchange import get_currency_exchange_rate
 
 PEGGED_CURRENCIES = {
 	"USD": {"AED": 3.6725},  # AED is pegged to USD at a rate of 3.6725 since 1997
@@ -68,31 +69,14 @@ def get_exchange_rate(from_currency, to_currency, transaction_date=None, args=No
 	if not transaction_date:
 		transaction_date = nowdate()
 
-	currency_settings = frappe.get_doc("Accounts Settings").as_dict()
-	allow_stale_rates = currency_settings.get("allow_stale")
+	stale_days = None
+	if not cint(frappe.db.get_single_value("Accounts Settings", "allow_stale", cache=True)):
+		stale_days = cint(frappe.db.get_single_value("Accounts Settings", "stale_days", cache=True))
 
-	filters = [
-		["date", "<=", get_datetime_str(transaction_date)],
-		["from_currency", "=", from_currency],
-		["to_currency", "=", to_currency],
-	]
-
-	if args == "for_buying":
-		filters.append(["for_buying", "=", "1"])
-	elif args == "for_selling":
-		filters.append(["for_selling", "=", "1"])
-
-	if not allow_stale_rates:
-		stale_days = currency_settings.get("stale_days")
-		checkpoint_date = add_days(transaction_date, -stale_days)
-		filters.append(["date", ">", get_datetime_str(checkpoint_date)])
-
-	# cksgb 19/09/2016: get last entry in Currency Exchange with from_currency and to_currency.
-	entries = frappe.get_all(
-		"Currency Exchange", fields=["exchange_rate"], filters=filters, order_by="date desc", limit=1
-	)
-	if entries:
-		return flt(entries[0].exchange_rate)
+	# get last entry in Currency Exchange with from_currency and to_currency
+	rate = get_currency_exchange_rate(from_currency, to_currency, transaction_date, args, stale_days)
+	if rate is not None:
+		return rate
 
 	if frappe.get_cached_value("Currency Exchange Settings", "Currency Exchange Settings", "disabled"):
 		return 0.00
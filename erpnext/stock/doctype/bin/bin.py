@@ -6,7 +6,21 @@ import frappe
 from frappe.model.document import Document
 from frappe.query_builder import Case, Order
 from frappe.query_builder.functions import Coalesce, CombineDatetime, Sum
-from frappe.utils import flt
+from frappe.utils import create_batch, flt, now
+
+BIN_DETAIL_FIELDS = (
+	"actual_qty",
+	"ordered_qty",
+	"reserved_qty",
+	"indented_qty",
+	"planned_qty",
+	"reserved_qty_for_production",
+	"reserved_qty_for_sub_contract",
+	"reserved_qty_for_production_plan",
+)
+
+# quantities updated by adding the values passed to `update_qty`
+BIN_QTY_CHANGE_FIELDS = ("ordered_qty", "reserved_qty", "indented_qty", "planned_qty")
 
 
 class Bin(Document):
@@ -239,65 +253,113 @@ def on_doctype_update():
 
 
 def get_bin_details(bin_name):
-	return frappe.db.get_value(
-		"Bin",
-		bin_name,
-		[
-			"actual_qty",
-			"ordered_qty",
-			"reserved_qty",
-			"indented_qty",
-			"planned_qty",
-			"reserved_qty_for_production",
-			"reserved_qty_for_sub_contract",
-			"reserved_qty_for_production_plan",
-		],
-		as_dict=1,
-	)
+	return frappe.db.get_value("Bin", bin_name, BIN_DETAIL_FIELDS, as_dict=1)
 
 
 def update_qty(bin_name, args):
+	update_qty_in_bulk([(bin_name, args)])
+
+
+def update_qty_in_bulk(bin_updates):
+	"""Update quantities of bins from a list of (bin name, args).
+
+	Changes in ordered, reserved, indented and planned qty from all the args of a bin are added up,
+	the bins are locked in the order of their names to avoid deadlocks between concurrent
+	transactions and written with one query per batch."""
 	from erpnext.controllers.stock_controller import future_sle_exists
 
-	bin_details = get_bin_details(bin_name)
-	# actual qty is already updated by processing current voucher
-	actual_qty = bin_details.actual_qty or 0.0
-
-	# actual qty is not up to date in case of backdated transaction
-	if future_sle_exists(args, allow_force_reposting=False):
-		actual_qty = get_actual_qty(args.get("item_code"), args.get("warehouse"))
-
-	ordered_qty = flt(bin_details.ordered_qty) + flt(args.get("ordered_qty"))
-	reserved_qty = flt(bin_details.reserved_qty) + flt(args.get("reserved_qty"))
-	indented_qty = flt(bin_details.indented_qty) + flt(args.get("indented_qty"))
-	planned_qty = flt(bin_details.planned_qty) + flt(args.get("planned_qty"))
-
-	# compute projected qty
-	projected_qty = (
-		flt(actual_qty)
-		+ flt(ordered_qty)
-		+ flt(indented_qty)
-		+ flt(planned_qty)
-		- flt(reserved_qty)
-		- flt(bin_details.reserved_qty_for_production)
-		- flt(bin_details.reserved_qty_for_sub_contract)
-		- flt(bin_details.reserved_qty_for_production_plan)
+	changes = {}
+	for bin_name, args in bin_updates:
+		if bin_name not in changes:
+			changes[bin_name] = frappe._dict(dict.fromkeys(BIN_QTY_CHANGE_FIELDS, 0.0))
+
+		changes[bin_name].args = args
+		for field in BIN_QTY_CHANGE_FIELDS:
+			changes[bin_name][field] += flt(args.get(field))
+
+	for bin_names in create_batch(sorted(changes), 500):
+		values = {}
+		for bin_details in lock_bins(bin_names):
+			change = changes[bin_details.name]
+
+			# actual qty is already updated by processing current voucher
+			actual_qty = bin_details.actual_qty or 0.0
+
+			# actual qty is not up to date in case of backdated transaction
+			if future_sle_exists(change.args, allow_force_reposting=False):
+				actual_qty = get_actual_qty(change.args.get("item_code"), change.args.get("warehouse"))
+
+			ordered_qty = flt(bin_details.ordered_qty) + change.ordered_qty
+			reserved_qty = flt(bin_details.reserved_qty) + change.reserved_qty
+			indented_qty = flt(bin_details.indented_qty) + change.indented_qty
+			planned_qty = flt(bin_details.planned_qty) + change.planned_qty
+
+			# compute projected qty
+			projected_qty = (
+				flt(actual_qty)
+				+ flt(ordered_qty)
+				+ flt(indented_qty)
+				+ flt(planned_qty)
+				- flt(reserved_qty)
+				- flt(bin_details.reserved_qty_for_production)
+				- flt(bin_details.reserved_qty_for_sub_contract)
+				- flt(bin_details.reserved_qty_for_production_plan)
+			)
+
+			values[bin_details.name] = {
+				"actual_qty": actual_qty,
+				"ordered_qty": ordered_qty,
+				"reserved_qty": reserved_qty,
+				"indented_qty": indented_qty,
+				"planned_qty": planned_qty,
+				"projected_qty": projected_qty,
+			}
+
+		if values:
+			bulk_set_bin_values(values)
+
+
+def lock_bins(bin_names):
+	"""Lock bins in the order of their names and return their quantities"""
+	bin = frappe.qb.DocType("Bin")
+
+	return (
+		frappe.qb.from_(bin)
+		.select(bin.name, *[bin[field] for field in BIN_DETAIL_FIELDS])
+		.where(bin.name.isin(list(bin_names)))
+		.orderby(bin.name)
+		.for_update()
+		.run(as_dict=True)
 	)
 
-	frappe.db.set_value(
-		"Bin",
-		bin_name,
-		{
-			"actual_qty": actual_qty,
-			"ordered_qty": ordered_qty,
-			"reserved_qty": reserved_qty,
-			"indented_qty": indented_qty,
-			"planned_qty": planned_qty,
-			"projected_qty": projected_qty,
-		},
-		update_modified=True,
+
+def bulk_set_bin_values(values):
+	"""Set values of many bins with one UPDATE. `values` maps bin names to dicts of the same fields."""
+	names = list(values)
+	fields = list(values[names[0]])
+
+	set_clauses, query_values = [], []
+	for field in fields:
+		set_clauses.append(f"`{field}` = case name {' '.join(['when %s then %s'] * len(names))} end")
+		for name in names:
+			query_values.extend([name, values[name][field]])
+
+	query_values.extend([now(), frappe.session.user, *names])
+
+	# nosemgrep
+	frappe.db.sql(
+		"""
+		update `tabBin`
+		set {set_clauses}, `modified` = %s, `modified_by` = %s
+		where name in ({names})""".format(
+			set_clauses=", ".join(set_clauses), names=", ".join(["%s"] * len(names))
+		),
+		query_values,
 	)
 
+	for name in names:
+		frappe.clear_document_cache("Bin", name)
+
 
 def get_actual_qty(item_code, warehouse):
 	sle = frappe.qb.DocType("Stock Ledger Entry")
@@ -4,8 +4,9 @@
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from erpnext.stock.doctype.bin.bin import update_qty_in_bulk
 from erpnext.stock.doctype.item.test_item import make_item
-from erpnext.stock.utils import _create_bin
+from erpnext.stock.utils import _create_bin, get_or_make_bin
 
 
 class TestBin(FrappeTestCase):
@@ -32,3 +33,27 @@ class TestBin(FrappeTestCase):
 		indexes = frappe.db.sql("show index from tabBin where Non_unique = 0", as_dict=1)
 		if not any(index.get("Key_name") == "unique_item_warehouse" for index in indexes):
 			self.fail("Expected unique index on item-warehouse")
+
+	def test_update_qty_in_bulk(self):
+		item_code = make_item("_TestBulkBinUpdate").name
+		bins = [
+			get_or_make_bin(item_code, warehouse)
+			for warehouse in ("_Test Warehouse - _TC", "_Test Warehouse 1 - _TC")
+		]
+
+		args = frappe._dict(item_code=item_code, voucher_type="Material Request", voucher_no="_Test MR")
+		update_qty_in_bulk(
+			[
+				(bins[0], frappe._dict(args, warehouse="_Test Warehouse - _TC", indented_qty=5)),
+				(bins[1], frappe._dict(args, warehouse="_Test Warehouse 1 - _TC", ordered_qty=2)),
+				(bins[0], frappe._dict(args, warehouse="_Test Warehouse - _TC", indented_qty=3)),
+			]
+		)
+
+		bin1 = frappe.get_doc("Bin", bins[0])
+		self.assertEqual(bin1.indented_qty, 8)
+		self.assertEqual(bin1.projected_qty, bin1.actual_qty + 8)
+
+		bin2 = frappe.get_doc("Bin", bins[1])
+		self.assertEqual(bin2.ordered_qty, 2)
+		self.assertEqual(bin2.projected_qty, bin2.actual_qty + 2)
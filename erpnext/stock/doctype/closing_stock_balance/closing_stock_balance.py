@@ -11,6 +11,9 @@ from frappe.model.document import Document
 from frappe.utils import get_link_to_form, parse_json
 from frappe.utils.background_jobs import enqueue
 
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	create_stock_balance_checkpoint,
+)
 from erpnext.stock.report.stock_balance.stock_balance import execute
 
 
@@ -147,6 +150,7 @@ def prepare_closing_stock_balance(name):
 
 	try:
 		doc.create_closing_stock_balance_entries()
+		create_stock_balance_checkpoint(doc.company, doc.to_date, doc.name)
 		doc.db_set("status", "Completed")
 	except Exception:
 		doc.db_set("status", "Failed")
@@ -33,6 +33,11 @@ from erpnext.controllers.item_variant import (
 	validate_item_variant_attributes,
 )
 from erpnext.stock.doctype.item_default.item_default import ItemDefault
+from erpnext.stock.doctype.item_search_token.item_search_token import (
+	delete_from_item_search_index,
+	is_item_search_index_enabled,
+	update_item_search_index,
+)
 from erpnext.stock.utils import get_valuation_method
 
 
@@ -221,6 +226,9 @@ class Item(Document):
 		self.update_variants()
 		self.update_item_price()
 
+		if is_item_search_index_enabled():
+			update_item_search_index([self])
+
 	def validate_description(self):
 		"""Clean HTML description if set"""
 		if cint(frappe.db.get_single_value("Stock Settings", "clean_description_html")):
@@ -542,6 +550,7 @@ class Item(Document):
 
 	def on_trash(self):
 		frappe.db.sql("""delete from tabBin where item_code=%s""", self.name)
+		delete_from_item_search_index([self.name])
 		frappe.db.sql("delete from `tabItem Price` where item_code=%s", self.name)
 		for variant_of in frappe.get_all("Item", filters={"variant_of": self.name}):
 			frappe.delete_doc("Item", variant_of.name)
@@ -570,6 +579,9 @@ class Item(Document):
 			self.set_last_purchase_rate(new_name)
 			self.recalculate_bin_qty(new_name)
 
+		if is_item_search_index_enabled():
+			update_item_search_index([frappe.get_doc("Item", new_name)])
+
 		for dt in ("Sales Taxes and Charges", "Purchase Taxes and Charges"):
 			for d in frappe.db.sql(
 				f"""select name, item_wise_tax_detail from `tab{dt}`
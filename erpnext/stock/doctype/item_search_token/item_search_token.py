@@ -0,0 +1,295 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import math
+import re
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Count
+from frappe.utils import cint, create_batch, cstr, flt, now, strip_html
+
+# weight of the tokens of each field, other search fields of the Item get SEARCH_FIELD_WEIGHT
+FIELD_WEIGHTS = {
+	"name": 4,
+	"item_code": 4,
+	"barcode": 4,
+	"item_name": 3,
+	"description": 1,
+}
+SEARCH_FIELD_WEIGHT = 2
+
+MAX_TOKEN_LENGTH = 140
+# tokens considered for fuzzy matches, longer tokens and numbers (like barcodes) are only matched by prefix
+MIN_FUZZY_TOKEN_LENGTH = 3
+MAX_FUZZY_TOKEN_LENGTH = 40
+MIN_SIMILARITY = 0.4
+MAX_SIMILAR_TOKENS = 10
+MAX_CANDIDATES = 5000
+
+
+class ItemSearchToken(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		item_code: DF.Link | None
+		token: DF.Data | None
+		weight: DF.Int
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Item Search Token", ["token", "item_code"])
+
+
+def is_item_search_index_enabled():
+	return cint(frappe.db.get_single_value("Stock Settings", "use_item_search_index", cache=True))
+
+
+def use_item_search_index():
+	"""Check if items can be searched with the index, it is not used till it is fully built"""
+	return is_item_search_index_enabled() and cint(
+		frappe.db.get_single_value("Stock Settings", "item_search_index_ready", cache=True)
+	)
+
+
+def get_search_tokens(text):
+	"""Lowercase words of the text, without HTML tags"""
+	text = strip_html(cstr(text)).lower()
+	return {token[:MAX_TOKEN_LENGTH] for token in re.split(r"\W+", text) if token}
+
+
+def get_trigrams(token):
+	padded = f" {token} "
+	return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def is_fuzzy_token(token):
+	return MIN_FUZZY_TOKEN_LENGTH <= len(token) <= MAX_FUZZY_TOKEN_LENGTH and not token.isdigit()
+
+
+def get_search_fields():
+	"""Search fields of Item and POS Search Fields, other than the fields with their own weight"""
+	meta = frappe.get_meta("Item")
+	search_fields = set(meta.get_search_fields())
+	search_fields.update(frappe.get_all("POS Search Fields", pluck="fieldname"))
+
+	return sorted(field for field in search_fields if field not in FIELD_WEIGHTS and meta.has_field(field))
+
+
+def get_item_tokens(item, search_fields):
+	tokens = {}
+
+	def add_tokens(text, weight):
+		for token in get_search_tokens(text):
+			tokens[token] = max(tokens.get(token, 0), weight)
+
+	for field in ("name", "item_code", "item_name", "description"):
+		add_tokens(item.get(field), FIELD_WEIGHTS[field])
+
+	for barcode in item.get("barcodes") or []:
+		add_tokens(barcode.get("barcode"), FIELD_WEIGHTS["barcode"])
+
+	for field in search_fields:
+		add_tokens(item.get(field), SEARCH_FIELD_WEIGHT)
+
+	return tokens
+
+
+def update_item_search_index(items, search_fields=None):
+	"""Replace the tokens of the items (Item documents or dicts with their barcodes) in the index"""
+	if not items:
+		return
+
+	if search_fields is None:
+		search_fields = get_search_fields()
+
+	item_tokens = {item.get("name"): get_item_tokens(item, search_fields) for item in items}
+	delete_from_item_search_index(list(item_tokens))
+
+	timestamp, user = now(), frappe.session.user
+	rows = [
+		(timestamp, timestamp, user, user, item_code, token, weight)
+		for item_code, tokens in item_tokens.items()
+		for token, weight in tokens.items()
+	]
+
+	for batch in create_batch(rows, 1000):
+		frappe.db.bulk_insert(
+			"Item Search Token",
+			fields=["creation", "modified", "owner", "modified_by", "item_code", "token", "weight"],
+			values=batch,
+		)
+
+	add_to_trigram_index({token for tokens in item_tokens.values() for token in tokens})
+
+
+def delete_from_item_search_index(item_codes):
+	frappe.db.delete("Item Search Token", {"item_code": ("in", item_codes)})
+
+
+def add_to_trigram_index(tokens):
+	"""Add trigrams of the tokens not indexed yet. Tokens of deleted items are left as is, since they
+	only cost a lookup in fuzzy matches."""
+	tokens = [token for token in tokens if is_fuzzy_token(token)]
+
+	indexed_tokens = set()
+	for batch in create_batch(tokens, 1000):
+		indexed_tokens.update(
+			frappe.get_all(
+				"Item Search Trigram", filters={"token": ("in", batch)}, pluck="token", distinct=True
+			)
+		)
+
+	timestamp, user = now(), frappe.session.user
+	rows = [
+		(timestamp, timestamp, user, user, trigram, token)
+		for token in tokens
+		if token not in indexed_tokens
+		for trigram in get_trigrams(token)
+	]
+
+	for batch in create_batch(rows, 1000):
+		frappe.db.bulk_insert(
+			"Item Search Trigram",
+			fields=["creation", "modified", "owner", "modified_by", "trigram", "token"],
+			values=batch,
+		)
+
+
+def search_items(txt, limit=MAX_CANDIDATES):
+	"""Item codes matching every word of `txt`, best match first.
+
+	A word matches the tokens of an item starting with it, or if no token starts with it, the tokens
+	similar to it by trigrams. Items are ranked by the weight of the matched tokens, with exact and
+	prefix matches ranked above fuzzy ones. Longest words are matched first, the shorter ones are
+	only matched within the items found for them."""
+	scores = None
+	for term in sorted(get_search_tokens(txt), key=len, reverse=True):
+		term_scores = {}
+		for item_code, score in get_term_matches(term, list(scores) if scores else None):
+			term_scores[item_code] = max(term_scores.get(item_code, 0), score)
+
+		if scores is None:
+			scores = term_scores
+		else:
+			scores = {item_code: scores[item_code] + score for item_code, score in term_scores.items()}
+
+		if not scores:
+			return []
+
+	return sorted(scores, key=lambda item_code: (-scores[item_code], item_code))[:limit] if scores else []
+
+
+def get_term_matches(term, item_codes=None):
+	"""Items matching the term with their score, the best `MAX_CANDIDATES` matches are kept"""
+	table = frappe.qb.DocType("Item Search Token")
+	score = table.weight * Case().when(table.token == term, 2).else_(1)
+	query = get_token_matches_query(score, item_codes).where(table.token.like(term.replace("_", "\\_") + "%"))
+
+	matches = [(d.item_code, flt(d.score)) for d in query.run(as_dict=True)]
+	if matches or not is_fuzzy_token(term):
+		return matches
+
+	similar_tokens = get_similar_tokens(term)
+	if not similar_tokens:
+		return []
+
+	similarity = Case()
+	for token, token_similarity in similar_tokens.items():
+		similarity = similarity.when(table.token == token, token_similarity)
+
+	query = get_token_matches_query(table.weight * similarity, item_codes).where(
+		table.token.isin(list(similar_tokens))
+	)
+
+	return [(d.item_code, flt(d.score)) for d in query.run(as_dict=True)]
+
+
+def get_token_matches_query(score, item_codes=None):
+	table = frappe.qb.DocType("Item Search Token")
+	query = (
+		frappe.qb.from_(table)
+		.select(table.item_code, score.as_("score"))
+		.orderby(score, order=frappe.qb.desc)
+		.orderby(table.item_code)
+		.limit(MAX_CANDIDATES)
+	)
+
+	if item_codes:
+		query = query.where(table.item_code.isin(item_codes))
+
+	return query
+
+
+def get_similar_tokens(term):
+	"""Indexed tokens sharing most of their trigrams with the term, with their similarity"""
+	trigrams = get_trigrams(term)
+
+	table = frappe.qb.DocType("Item Search Trigram")
+	shared_trigrams = Count(table.trigram).distinct()
+	rows = (
+		frappe.qb.from_(table)
+		.select(table.token, shared_trigrams)
+		.where(table.trigram.isin(list(trigrams)))
+		.groupby(table.token)
+		.having(shared_trigrams >= math.ceil(len(trigrams) * MIN_SIMILARITY))
+	).run()
+
+	similar_tokens = {}
+	for token, shared in rows:
+		# jaccard similarity of the trigrams
+		similarity = shared / (len(trigrams) + len(get_trigrams(token)) - shared)
+		if similarity >= MIN_SIMILARITY:
+			similar_tokens[token] = similarity
+
+	return dict(sorted(similar_tokens.items(), key=lambda d: d[1], reverse=True)[:MAX_SIMILAR_TOKENS])
+
+
+def enqueue_rebuild_item_search_index():
+	frappe.enqueue(
+		rebuild_item_search_index,
+		queue="long",
+		timeout=7200,
+		enqueue_after_commit=True,
+		now=frappe.flags.in_test,
+	)
+
+
+def rebuild_item_search_index():
+	"""Index all the items again, like after the search fields of Item or POS are changed.
+	Items are searched without the index till the rebuild completes."""
+	frappe.db.set_single_value("Stock Settings", "item_search_index_ready", 0)
+
+	frappe.db.delete("Item Search Token")
+	frappe.db.delete("Item Search Trigram")
+
+	search_fields = get_search_fields()
+	fields = ["name", "item_code", "item_name", "description", *search_fields]
+
+	for item_codes in create_batch(frappe.get_all("Item", pluck="name", order_by="name"), 1000):
+		items = frappe.get_all("Item", filters={"name": ("in", item_codes)}, fields=fields)
+
+		barcodes = {}
+		for d in frappe.get_all(
+			"Item Barcode", filters={"parent": ("in", item_codes)}, fields=["parent", "barcode"]
+		):
+			barcodes.setdefault(d.parent, []).append(d)
+
+		for item in items:
+			item.barcodes = barcodes.get(item.name, [])
+
+		update_item_search_index(items, search_fields)
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+	frappe.db.set_single_value("Stock Settings", "item_search_index_ready", 1)
@@ -0,0 +1,60 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+
+from erpnext.controllers.queries import item_query
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.item_search_token.item_search_token import search_items, use_item_search_index
+
+
+class TestItemSearchToken(FrappeTestCase):
+	@change_settings("Stock Settings", {"use_item_search_index": 1})
+	def test_search_items(self):
+		item = make_item("_Test Item Search Index", {"item_name": "Dark Chocolate Bar"})
+		item.description = "Seventy percent cocoa"
+		item.append("barcodes", {"barcode": "8901234567001"})
+		item.save()
+
+		self.assertIn(item.name, search_items("chocolate"))
+		self.assertIn(item.name, search_items("choc dark"))
+		self.assertIn(item.name, search_items("cocoa"))
+		self.assertIn(item.name, search_items("890123"))
+
+		# typos are matched by similar words
+		self.assertIn(item.name, search_items("chocolte"))
+		self.assertNotIn(item.name, search_items("chocolate milk"))
+
+		self.assertIn(item.name, [d[0] for d in item_query("Item", "dark chocolte", "name", 0, 20, {})])
+
+		item.item_name = "White Truffle"
+		item.save()
+		self.assertNotIn(item.name, search_items("chocolate"))
+		self.assertIn(item.name, search_items("truffle"))
+
+		frappe.delete_doc("Item", item.name)
+		self.assertNotIn(item.name, search_items("truffle"))
+
+	@change_settings("Stock Settings", {"use_item_search_index": 1})
+	def test_best_matches_kept_within_candidate_limit(self):
+		for idx in range(3):
+			make_item(f"_Test Item Search Accessory {idx}", {"description": "Zyxwidget accessory"})
+		prefix_match = make_item("_Test Item Search Widgets", {"item_name": "Zyxwidgets"}).name
+		exact_match = make_item("_Test Item Search Widget", {"item_name": "Zyxwidget"}).name
+
+		with patch("erpnext.stock.doctype.item_search_token.item_search_token.MAX_CANDIDATES", 2):
+			self.assertEqual(search_items("zyxwidget"), [exact_match, prefix_match])
+
+	def test_search_without_index_till_it_is_built(self):
+		item = make_item("_Test Item Search Pending Index", {"item_name": "Pending Index Lamp"}).name
+
+		# rebuild job is not run
+		with patch("frappe.enqueue"):
+			with change_settings("Stock Settings", {"use_item_search_index": 1}):
+				self.assertFalse(use_item_search_index())
+				self.assertIn(
+					item, [d[0] for d in item_query("Item", "Pending Index Lamp", "name", 0, 20, {})]
+				)
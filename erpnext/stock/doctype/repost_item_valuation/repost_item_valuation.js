@@ -70,6 +70,8 @@ frappe.ui.form.on("Repost Item Valuation", {
 				frm.doc.current_index = data.current_index;
 				frm.doc.items_to_be_repost = data.items_to_be_repost;
 				frm.doc.total_reposting_count = data.total_reposting_count;
+				frm.doc.reposted_entries = data.reposted_entries;
+				frm.doc.rows_per_second = data.rows_per_second;
 
 				frm.dashboard.reset();
 				frm.trigger("show_reposting_progress");
@@ -113,6 +115,9 @@ frappe.ui.form.on("Repost Item Valuation", {
 
 		let progress = flt((cint(frm.doc.current_index) / total_count) * 100, 2) || 0.5;
 		var title = __("Reposting Completed {0}%", [progress]);
+		if (frm.doc.rows_per_second) {
+			title += " (" + __("{0} rows/sec", [frm.doc.rows_per_second]) + ")";
+		}
 
 		bars.push({
 			title: title,
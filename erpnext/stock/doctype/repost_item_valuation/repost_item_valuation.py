@@ -1,6 +1,8 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+from contextlib import contextmanager
+
 import frappe
 from frappe import _
 from frappe.desk.form.load import get_attachments
@@ -8,13 +10,17 @@ from frappe.exceptions import QueryDeadlockError, QueryTimeoutError
 from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
 from frappe.query_builder.functions import Max, Now
-from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils import cint, create_batch, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils.background_jobs import enqueue, is_job_enqueued
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
 import erpnext
 from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	invalidate_stock_balance_checkpoints,
+)
 from erpnext.stock.stock_ledger import (
 	get_affected_transactions,
 	get_items_to_be_repost,
@@ -23,6 +29,9 @@ from erpnext.stock.stock_ledger import (
 
 RecoverableErrors = (JobTimeoutException, QueryDeadlockError, QueryTimeoutError)
 
+# Item-warehouse locks are released when the job finishes, expiry only guards against dead workers
+REPOSTING_LOCK_TIMEOUT = 6 * 60 * 60
+
 
 class RepostItemValuation(Document):
 	# begin: auto-generated types
@@ -48,7 +57,9 @@ class RepostItemValuation(Document):
 		posting_date: DF.Date
 		posting_time: DF.Time | None
 		recreate_stock_ledgers: DF.Check
+		reposted_entries: DF.Int
 		reposting_data_file: DF.Attach | None
+		rows_per_second: DF.Float
 		status: DF.Literal["Queued", "In Progress", "Completed", "Skipped", "Failed"]
 		total_reposting_count: DF.Int
 		via_landed_cost_voucher: DF.Check
@@ -346,16 +357,20 @@ def remove_attached_file(docname):
 
 
 def repost_sl_entries(doc):
+	batched = cint(frappe.db.get_single_value("Stock Reposting Settings", "use_batched_reposting"))
+	invalidate_stock_balance_checkpoints(doc.company, doc.posting_date)
+
 	if doc.based_on == "Transaction":
-		repost_future_sle(
+		reposting_stats = repost_future_sle(
 			voucher_type=doc.voucher_type,
 			voucher_no=doc.voucher_no,
 			allow_negative_stock=doc.allow_negative_stock,
 			via_landed_cost_voucher=doc.via_landed_cost_voucher,
 			doc=doc,
+			batched=batched,
 		)
 	else:
-		repost_future_sle(
+		reposting_stats = repost_future_sle(
 			args=[
 				frappe._dict(
 					{
@@ -369,8 +384,16 @@ def repost_sl_entries(doc):
 			allow_negative_stock=doc.allow_negative_stock,
 			via_landed_cost_voucher=doc.via_landed_cost_voucher,
 			doc=doc,
+			batched=batched,
 		)
 
+	doc.db_set(
+		{
+			"reposted_entries": reposting_stats.reposted_entries,
+			"rows_per_second": reposting_stats.rows_per_second,
+		}
+	)
+
 
 def repost_gl_entries(doc):
 	if not cint(erpnext.is_perpetual_inventory_enabled(doc.company)):
@@ -384,6 +407,7 @@ def repost_gl_entries(doc):
 		doc.posting_date,
 		doc.company,
 		repost_doc=doc,
+		incremental=frappe.db.get_single_value("Stock Reposting Settings", "incremental_gl_reposting"),
 	)
 
 
@@ -458,6 +482,11 @@ def repost_entries():
 
 	riv_entries = get_repost_item_valuation_entries()
 
+	parallel_jobs = cint(frappe.db.get_single_value("Stock Reposting Settings", "parallel_reposting_jobs"))
+	if parallel_jobs > 1 and len(riv_entries) > 1:
+		enqueue_reposting_components(riv_entries, parallel_jobs)
+		return
+
 	for row in riv_entries:
 		doc = frappe.get_doc("Repost Item Valuation", row.name)
 		if doc.status in ("Queued", "In Progress"):
@@ -469,6 +498,175 @@ def repost_entries():
 		return
 
 
+def enqueue_reposting_components(riv_entries, parallel_jobs):
+	"""Split queued reposts into independent components and repost them in parallel jobs.
+
+	Components are distributed over `parallel_jobs` jobs, largest first. A job that is
+	still running from a previous run is not enqueued again, its components are picked
+	up in the next run.
+	"""
+	components = get_reposting_components([row.name for row in riv_entries])
+	components.sort(key=lambda component: len(component.riv_names), reverse=True)
+
+	jobs = [[] for _idx in range(parallel_jobs)]
+	for component in components:
+		min(jobs, key=lambda job: sum(len(c.riv_names) for c in job)).append(component)
+
+	for idx, job_components in enumerate(jobs):
+		job_id = f"repost_item_valuation::{frappe.local.site}::{idx}"
+		if not job_components or is_job_enqueued(job_id):
+			continue
+
+		enqueue(
+			repost_components,
+			queue="long",
+			timeout=REPOSTING_LOCK_TIMEOUT,
+			job_id=job_id,
+			components=job_components,
+		)
+
+
+def repost_components(components):
+	for component in components:
+		with item_warehouse_locks(component.item_warehouses) as locked:
+			if not locked:
+				# being reposted by another job
+				continue
+
+			for riv_name in component.riv_names:
+				doc = frappe.get_doc("Repost Item Valuation", riv_name)
+				if doc.status in ("Queued", "In Progress"):
+					repost(doc)
+					doc.deduplicate_similar_repost()
+
+
+@contextmanager
+def item_warehouse_locks(item_warehouses):
+	"""Acquire redis locks on all item-warehouses, yields False if any of them is already locked."""
+	locks = []
+	try:
+		for item_code, warehouse in sorted(item_warehouses):
+			lock = frappe.cache.lock(
+				frappe.cache.make_key(f"repost_item_valuation::{item_code}::{warehouse}"),
+				timeout=REPOSTING_LOCK_TIMEOUT,
+			)
+			if not lock.acquire(blocking=False):
+				break
+
+			locks.append(lock)
+
+		yield len(locks) == len(item_warehouses)
+	finally:
+		for lock in locks:
+			lock.release()
+
+
+def get_reposting_components(riv_names):
+	"""Group reposts which can affect the same item-warehouses.
+
+	Item-warehouses are linked when they appear in the same future stock voucher,
+	which also covers transfers, manufacture and subcontracting linked through
+	`dependant_sle_voucher_detail_no`, and GL reposting of multi-item vouchers.
+
+	Returns list of {"riv_names": [...], "item_warehouses": {(item_code, warehouse), ...}}
+	keeping the order of `riv_names` within each component.
+	"""
+	parent = {}
+
+	def find(key):
+		parent.setdefault(key, key)
+		while parent[key] != key:
+			parent[key] = parent[parent[key]]
+			key = parent[key]
+		return key
+
+	def union(key, other_key):
+		parent[find(key)] = find(other_key)
+
+	riv_item_warehouses = {}
+	from_date = None
+	for riv_name in riv_names:
+		doc = frappe.get_doc("Repost Item Valuation", riv_name)
+		item_warehouses = get_item_warehouses_to_repost(doc)
+		riv_item_warehouses[riv_name] = item_warehouses
+
+		for key in item_warehouses:
+			union(key, next(iter(item_warehouses)))
+
+		if not from_date or getdate(doc.posting_date) < from_date:
+			from_date = getdate(doc.posting_date)
+
+	frontier = set(parent)
+	while frontier:
+		vouchers = get_future_vouchers_for_item_warehouses(frontier, from_date)
+		frontier = set()
+		for item_warehouses in vouchers.values():
+			for key in item_warehouses:
+				if key not in parent:
+					frontier.add(key)
+				union(key, next(iter(item_warehouses)))
+
+	components = {}
+	for riv_name in riv_names:
+		item_warehouses = riv_item_warehouses[riv_name]
+		if not item_warehouses:
+			root = riv_name
+		else:
+			root = find(next(iter(item_warehouses)))
+
+		component = components.setdefault(root, frappe._dict(riv_names=[], item_warehouses=set()))
+		component.riv_names.append(riv_name)
+
+	for key in parent:
+		if component := components.get(find(key)):
+			component.item_warehouses.add(key)
+
+	return list(components.values())
+
+
+def get_item_warehouses_to_repost(doc):
+	if doc.based_on == "Transaction":
+		items = get_items_to_be_repost(voucher_type=doc.voucher_type, voucher_no=doc.voucher_no, doc=doc)
+		return {(d.get("item_code"), d.get("warehouse")) for d in items}
+
+	return {(doc.item_code, doc.warehouse)}
+
+
+def get_future_vouchers_for_item_warehouses(item_warehouses, from_date):
+	"""Return {voucher_no: {(item_code, warehouse), ...}} of stock vouchers on or after `from_date`
+	that touch any of `item_warehouses`."""
+	voucher_nos = set()
+	for batch in create_batch(list(item_warehouses), 100):
+		conditions, values = [], [from_date]
+		for item_code, warehouse in batch:
+			conditions.append("(item_code = %s and warehouse = %s)")
+			values.extend([item_code, warehouse])
+
+		# nosemgrep
+		voucher_nos.update(
+			frappe.db.sql_list(
+				"""
+				select distinct voucher_no
+				from `tabStock Ledger Entry`
+				where is_cancelled = 0 and posting_date >= %s and ({conditions})
+				""".format(conditions=" or ".join(conditions)),
+				values,
+			)
+		)
+
+	vouchers = {}
+	for batch in create_batch(list(voucher_nos), 500):
+		for sle in frappe.get_all(
+			"Stock Ledger Entry",
+			filters={"voucher_no": ("in", batch), "is_cancelled": 0, "posting_date": (">=", from_date)},
+			fields=["voucher_no", "item_code", "warehouse"],
+			distinct=True,
+		):
+			vouchers.setdefault(sle.voucher_no, set()).add((sle.item_code, sle.warehouse))
+
+	return vouchers
+
+
 def get_repost_item_valuation_entries():
 	return frappe.db.sql(
 		""" SELECT name from `tabRepost Item Valuation`
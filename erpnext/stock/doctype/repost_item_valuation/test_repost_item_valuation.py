@@ -14,6 +14,7 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	get_reposting_components,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -458,3 +459,68 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 						"name",
 					)
 				)
+
+	@change_settings("Stock Reposting Settings", {"use_batched_reposting": 1})
+	def test_batched_reposting(self):
+		from erpnext.stock.doctype.delivery_note.test_delivery_note import create_delivery_note
+
+		item_code = make_item("_Test Batched Repost Item", properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		make_purchase_receipt(item_code=item_code, qty=10, rate=100, warehouse=warehouse)
+		dn = create_delivery_note(item_code=item_code, qty=5, rate=150, warehouse=warehouse)
+
+		# backdated receipt at a different rate, reposts the entries above
+		make_purchase_receipt(
+			item_code=item_code,
+			qty=10,
+			rate=50,
+			warehouse=warehouse,
+			posting_date=add_days(today(), -1),
+		)
+
+		sle = frappe.db.get_value(
+			"Stock Ledger Entry",
+			{"voucher_no": dn.name, "is_cancelled": 0},
+			["stock_value_difference", "qty_after_transaction"],
+			as_dict=1,
+		)
+		self.assertEqual(sle.qty_after_transaction, 15)
+		self.assertEqual(sle.stock_value_difference, -250)
+
+		riv = frappe.get_last_doc("Repost Item Valuation", {"item_code": item_code})
+		self.assertTrue(riv.reposted_entries)
+
+	def test_reposting_components(self):
+		item_a = make_item("_Test Repost Component Item A", properties={"is_stock_item": 1}).name
+		item_b = make_item("_Test Repost Component Item B", properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		target_warehouse = "_Test Warehouse 1 - _TC"
+
+		make_stock_entry(item_code=item_a, target=warehouse, qty=10, rate=100)
+		make_stock_entry(item_code=item_b, target=warehouse, qty=10, rate=100)
+		# links item A in both warehouses
+		make_stock_entry(item_code=item_a, source=warehouse, target=target_warehouse, qty=5)
+
+		riv_names = []
+		for item_code, wh in ((item_a, warehouse), (item_b, warehouse), (item_a, target_warehouse)):
+			riv = frappe.get_doc(
+				doctype="Repost Item Valuation",
+				item_code=item_code,
+				warehouse=wh,
+				based_on="Item and Warehouse",
+				posting_date=add_days(today(), -1),
+				posting_time="00:01:00",
+			)
+			riv.flags.dont_run_in_test = True
+			riv.submit()
+			riv_names.append(riv.name)
+
+		components = get_reposting_components(riv_names)
+		self.assertEqual(
+			sorted(sorted(component.riv_names) for component in components),
+			sorted([sorted([riv_names[0], riv_names[2]]), [riv_names[1]]]),
+		)
+
+		for riv_name in riv_names:
+			frappe.get_doc("Repost Item Valuation", riv_name).set_status("Skipped")
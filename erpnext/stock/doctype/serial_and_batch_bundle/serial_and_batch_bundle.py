@@ -27,6 +27,7 @@ from erpnext.stock.serial_batch_bundle import (
 	BatchNoValuation,
 	SerialNoValuation,
 	get_batches_from_bundle,
+	update_serial_nos_of_bundle,
 )
 from erpnext.stock.serial_batch_bundle import get_serial_nos as get_serial_nos_from_bundle
 
@@ -225,6 +226,7 @@ class SerialandBatchBundle(Document):
 			return
 
 		serial_nos = [d.serial_no for d in self.entries if d.serial_no]
+		serial_nos_set = set(serial_nos)
 		kwargs = {
 			"item_code": self.item_code,
 			"warehouse": self.warehouse,
@@ -238,7 +240,7 @@ class SerialandBatchBundle(Document):
 
 		serial_no_warehouse = {}
 		for data in available_serial_nos:
-			if data.serial_no not in serial_nos:
+			if data.serial_no not in serial_nos_set:
 				continue
 
 			serial_no_warehouse[data.serial_no] = data.warehouse
@@ -281,9 +283,10 @@ class SerialandBatchBundle(Document):
 		if self.docstatus == 1:
 			kwargs["voucher_no"] = self.voucher_no
 
+		serial_nos_set = set(serial_nos)
 		available_serial_nos = get_available_serial_nos(kwargs)
 		for data in available_serial_nos:
-			if data.serial_no in serial_nos:
+			if data.serial_no in serial_nos_set:
 				self.throw_error_message(
 					f"Serial No {bold(data.serial_no)} is already present in the warehouse {bold(data.warehouse)}.",
 					SerialNoDuplicateError,
@@ -1085,9 +1088,9 @@ class SerialandBatchBundle(Document):
 	def before_submit(self):
 		self.validate_serial_and_batch_data()
 		self.validate_serial_and_batch_no_for_returned()
-		self.set_purchase_document_no()
 
 	def on_submit(self):
+		self.set_purchase_document_no()
 		self.validate_serial_nos_inventory()
 
 	def set_purchase_document_no(self):
@@ -1098,16 +1101,8 @@ class SerialandBatchBundle(Document):
 			return
 
 		if self.total_qty > 0:
-			serial_nos = [d.serial_no for d in self.entries if d.serial_no]
-			sn_table = frappe.qb.DocType("Serial No")
-			(
-				frappe.qb.update(sn_table)
-				.set(
-					sn_table.purchase_document_no,
-					self.voucher_no if not sn_table.purchase_document_no else self.voucher_no,
-				)
-				.where(sn_table.name.isin(serial_nos))
-			).run()
+			# set on submit, once the entries are saved
+			update_serial_nos_of_bundle(self.name, {"purchase_document_no": self.voucher_no})
 
 	def validate_serial_and_batch_inventory(self):
 		self.check_future_entries_exists()
@@ -1831,12 +1826,9 @@ def get_serial_nos_based_on_posting_date(kwargs, ignore_serial_nos):
 			else:
 				serial_nos.difference_update(sns)
 
-	serial_nos = list(serial_nos)
-	for serial_no in ignore_serial_nos:
-		if serial_no in serial_nos:
-			serial_nos.remove(serial_no)
+	serial_nos.difference_update(ignore_serial_nos)
 
-	return serial_nos
+	return list(serial_nos)
 
 
 def get_bundle_wise_serial_nos(data, kwargs):
@@ -890,6 +890,50 @@ class TestSerialandBatchBundle(FrappeTestCase):
 		self.assertTrue(bundle_doc.docstatus == 0)
 		self.assertRaises(frappe.ValidationError, bundle_doc.submit)
 
+	def test_serial_nos_of_bundle_updated_in_bulk(self):
+		from erpnext.stock.doctype.delivery_note.test_delivery_note import create_delivery_note
+		from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
+
+		item_code = make_item(
+			"Test Bulk Serial No Update",
+			{"has_serial_no": 1, "serial_no_series": "TEST-BULK-SN-.#####", "is_stock_item": 1},
+		).name
+
+		pr = make_purchase_receipt(item_code=item_code, warehouse="_Test Warehouse - _TC", qty=50, rate=100)
+		serial_nos = get_serial_nos_from_bundle(pr.items[0].serial_and_batch_bundle)
+		self.assertEqual(len(serial_nos), 50)
+
+		serial_no_details = frappe.get_all(
+			"Serial No",
+			filters={"name": ("in", serial_nos)},
+			fields=["status", "warehouse", "company", "purchase_document_no"],
+			distinct=True,
+		)
+		self.assertEqual(len(serial_no_details), 1)
+		self.assertEqual(serial_no_details[0].status, "Active")
+		self.assertEqual(serial_no_details[0].warehouse, "_Test Warehouse - _TC")
+		self.assertEqual(serial_no_details[0].company, "_Test Company")
+		self.assertEqual(serial_no_details[0].purchase_document_no, pr.name)
+
+		dn = create_delivery_note(
+			item_code=item_code,
+			warehouse="_Test Warehouse - _TC",
+			qty=20,
+			rate=150,
+			serial_no=serial_nos[:20],
+		)
+
+		delivered = frappe.get_all(
+			"Serial No", filters={"name": ("in", serial_nos), "status": "Delivered"}, pluck="name"
+		)
+		self.assertEqual(sorted(delivered), sorted(serial_nos[:20]))
+		self.assertFalse(frappe.db.get_value("Serial No", serial_nos[0], "warehouse"))
+
+		dn.cancel()
+		self.assertFalse(
+			frappe.db.exists("Serial No", {"name": ("in", serial_nos), "status": ("!=", "Active")})
+		)
+
 
 def get_batch_from_bundle(bundle):
 	from erpnext.stock.serial_batch_bundle import get_batch_nos
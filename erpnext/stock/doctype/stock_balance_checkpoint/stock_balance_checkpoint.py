@@ -0,0 +1,230 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Criterion
+from frappe.query_builder.functions import IfNull, Max, Sum
+from frappe.utils import add_days, add_months, cint, create_batch, get_last_day, getdate, now, today
+
+CHECKPOINT_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"company",
+	"posting_date",
+	"item_code",
+	"warehouse",
+	"qty_after_transaction",
+	"valuation_rate",
+	"stock_value",
+	"stock_queue",
+	"closing_stock_balance",
+)
+
+
+class StockBalanceCheckpoint(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		closing_stock_balance: DF.Link | None
+		company: DF.Link | None
+		item_code: DF.Link | None
+		posting_date: DF.Date | None
+		qty_after_transaction: DF.Float
+		stock_queue: DF.LongText | None
+		stock_value: DF.Currency
+		valuation_rate: DF.Currency
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Balance Checkpoint", ["company", "posting_date"])
+
+
+def create_stock_balance_checkpoint(company, posting_date, closing_stock_balance=None):
+	"""Snapshot the balance qty, value and stock queue of every item and warehouse of the company
+	at the end of `posting_date`.
+
+	Starts from the previous checkpoint of the company and reads only the Stock Ledger Entries
+	posted after it. Returns False if backdated entries are still being reposted, since values of
+	the ledger are not final till then."""
+	from erpnext.stock.utils import check_pending_reposting
+
+	posting_date = getdate(posting_date)
+	if check_pending_reposting(posting_date, throw_error=False):
+		return False
+
+	frappe.db.delete("Stock Balance Checkpoint", {"company": company, "posting_date": posting_date})
+
+	balances = {}
+	from_date = get_checkpoint_dates(add_days(posting_date, -1), company).get(company)
+	if from_date:
+		for row in get_checkpoint_balances({company: from_date}):
+			balances[(row.item_code, row.warehouse)] = row
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(sle)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			sle.qty_after_transaction,
+			sle.valuation_rate,
+			sle.stock_value,
+			sle.stock_queue,
+		)
+		.where((sle.company == company) & (sle.is_cancelled == 0) & (sle.posting_date <= posting_date))
+		.orderby(sle.posting_datetime)
+		.orderby(sle.creation)
+	)
+
+	if from_date:
+		query = query.where(sle.posting_date > from_date)
+
+	# only the last entry of each item and warehouse is kept
+	with frappe.db.unbuffered_cursor():
+		for row in query.run(as_dict=True, as_iterator=True):
+			balances[(row.item_code, row.warehouse)] = row
+
+	timestamp, user = now(), frappe.session.user
+	for batch in create_batch(list(balances.values()), 1000):
+		frappe.db.bulk_insert(
+			"Stock Balance Checkpoint",
+			fields=CHECKPOINT_FIELDS,
+			values=[
+				(
+					frappe.generate_hash(length=10),
+					timestamp,
+					timestamp,
+					user,
+					user,
+					company,
+					posting_date,
+					row.item_code,
+					row.warehouse,
+					row.qty_after_transaction,
+					row.valuation_rate,
+					row.stock_value,
+					row.stock_queue,
+					closing_stock_balance,
+				)
+				for row in batch
+			],
+		)
+
+	return True
+
+
+def invalidate_stock_balance_checkpoints(company, posting_date):
+	"""Remove checkpoints of the company on or after `posting_date`, since entries posted or reposted
+	from that date change the balances captured in them"""
+	if company and posting_date:
+		frappe.db.delete(
+			"Stock Balance Checkpoint", {"company": company, "posting_date": (">=", getdate(posting_date))}
+		)
+
+
+def get_checkpoint_dates(posting_date, company=None):
+	"""Latest checkpoint on or before `posting_date` of each company"""
+	table = frappe.qb.DocType("Stock Balance Checkpoint")
+	query = (
+		frappe.qb.from_(table)
+		.select(table.company, Max(table.posting_date))
+		.where(table.posting_date <= posting_date)
+		.groupby(table.company)
+	)
+
+	if company:
+		query = query.where(table.company == company)
+
+	return {company: getdate(date) for company, date in query.run()}
+
+
+def get_checkpoint_condition(table, checkpoint_dates):
+	return Criterion.any(
+		(table.company == company) & (table.posting_date == date)
+		for company, date in checkpoint_dates.items()
+	)
+
+
+def get_ledger_after_checkpoint_condition(sle, checkpoint_dates):
+	"""Condition for the Stock Ledger Entries not covered by the checkpoints"""
+	return Criterion.all(
+		(sle.company != company) | (sle.posting_date > date) for company, date in checkpoint_dates.items()
+	)
+
+
+def get_checkpoint_balances(checkpoint_dates, warehouses=None, item_code=None):
+	table = frappe.qb.DocType("Stock Balance Checkpoint")
+	query = (
+		frappe.qb.from_(table)
+		.select(
+			table.company,
+			table.item_code,
+			table.warehouse,
+			table.qty_after_transaction,
+			table.valuation_rate,
+			table.stock_value,
+			table.stock_queue,
+		)
+		.where(get_checkpoint_condition(table, checkpoint_dates))
+	)
+
+	if warehouses:
+		query = query.where(table.warehouse.isin(warehouses))
+
+	if item_code:
+		query = query.where(table.item_code == item_code)
+
+	return query.run(as_dict=True)
+
+
+def get_checkpoint_stock_value(checkpoint_dates, warehouses=None, item_code=None):
+	if not checkpoint_dates:
+		return 0.0
+
+	table = frappe.qb.DocType("Stock Balance Checkpoint")
+	query = (
+		frappe.qb.from_(table)
+		.select(IfNull(Sum(table.stock_value), 0))
+		.where(get_checkpoint_condition(table, checkpoint_dates))
+	)
+
+	if warehouses:
+		query = query.where(table.warehouse.isin(warehouses))
+
+	if item_code:
+		query = query.where(table.item_code == item_code)
+
+	return query.run()[0][0]
+
+
+def create_monthly_stock_balance_checkpoints():
+	"""Create checkpoints at the end of every month since the last checkpoint of each company"""
+	if not cint(frappe.db.get_single_value("Stock Settings", "auto_create_stock_balance_checkpoints")):
+		return
+
+	last_month_end = get_last_day(add_months(today(), -1))
+	for company in frappe.get_all("Company", pluck="name"):
+		posting_date = get_checkpoint_dates(last_month_end, company).get(company)
+		posting_date = get_last_day(add_days(posting_date, 1)) if posting_date else last_month_end
+
+		while posting_date <= last_month_end:
+			if not create_stock_balance_checkpoint(company, posting_date):
+				break
+
+			if not frappe.flags.in_test:
+				frappe.db.commit()
+
+			posting_date = get_last_day(add_days(posting_date, 1))
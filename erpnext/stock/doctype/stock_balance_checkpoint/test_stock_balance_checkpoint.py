@@ -0,0 +1,96 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, nowdate
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	create_stock_balance_checkpoint,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.report.stock_balance.stock_balance import execute
+from erpnext.stock.report.warehouse_wise_stock_balance.warehouse_wise_stock_balance import (
+	get_warehouse_wise_balance,
+)
+from erpnext.stock.utils import get_stock_value_on
+
+
+class TestStockBalanceCheckpoint(FrappeTestCase):
+	def test_balances_start_from_checkpoint(self):
+		item_code = make_item("_Test Item Stock Balance Checkpoint", {"is_stock_item": 1}).name
+		warehouse, company = "_Test Warehouse - _TC", "_Test Company"
+
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(nowdate(), -10),
+		)
+		make_stock_entry(
+			item_code=item_code, from_warehouse=warehouse, qty=3, posting_date=add_days(nowdate(), -5)
+		)
+
+		checkpoint_date = add_days(nowdate(), -7)
+		self.assertTrue(create_stock_balance_checkpoint(company, checkpoint_date))
+
+		checkpoint = frappe.db.get_value(
+			"Stock Balance Checkpoint",
+			{"company": company, "posting_date": checkpoint_date, "item_code": item_code},
+			["warehouse", "qty_after_transaction", "stock_value"],
+			as_dict=True,
+		)
+		self.assertEqual(checkpoint.warehouse, warehouse)
+		self.assertEqual(checkpoint.qty_after_transaction, 10)
+		self.assertEqual(checkpoint.stock_value, 1000)
+
+		self.assertEqual(get_stock_value_on(warehouse, nowdate(), item_code), 700)
+		self.assertEqual(get_stock_value_on(warehouse, checkpoint_date, item_code), 1000)
+
+		_columns, data = execute(
+			frappe._dict(
+				{
+					"company": company,
+					"from_date": add_days(nowdate(), -6),
+					"to_date": nowdate(),
+					"item_code": item_code,
+				}
+			)
+		)
+		self.assertEqual(data[0].opening_qty, 10)
+		self.assertEqual(data[0].out_qty, 3)
+		self.assertEqual(data[0].bal_qty, 7)
+
+		# backdated entries invalidate the checkpoints after them
+		make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=5, rate=100, posting_date=add_days(nowdate(), -8)
+		)
+		self.assertFalse(
+			frappe.db.exists(
+				"Stock Balance Checkpoint",
+				{"company": company, "posting_date": (">=", getdate(checkpoint_date))},
+			)
+		)
+		self.assertEqual(get_stock_value_on(warehouse, nowdate(), item_code), 1200)
+
+	def test_warehouse_wise_balance_from_checkpoint(self):
+		item_code = make_item("_Test Item Stock Balance Checkpoint", {"is_stock_item": 1}).name
+		warehouse, company = "_Test Warehouse - _TC", "_Test Company"
+		filters = frappe._dict({"company": company})
+
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(nowdate(), -10),
+		)
+		expected_balance = get_warehouse_wise_balance(filters)
+
+		self.assertTrue(create_stock_balance_checkpoint(company, add_days(nowdate(), -7)))
+		self.assertEqual(get_warehouse_wise_balance(filters), expected_balance)
+
+		make_stock_entry(item_code=item_code, from_warehouse=warehouse, qty=3)
+		self.assertEqual(get_warehouse_wise_balance(filters)[warehouse], expected_balance[warehouse] - 300)
@@ -1772,6 +1772,23 @@ class TestStockEntry(FrappeTestCase):
 			mr.cancel()
 			mr.delete()
 
+	def test_group_warehouse_projected_qty_for_reorder(self):
+		from erpnext.stock.reorder_item import get_item_warehouse_projected_qty, get_parent_warehouses
+
+		item_code = make_item("Test Auto Reorder Item - 003", properties={"is_stock_item": 1}).name
+		warehouses = ["_Test Warehouse - _TC", "_Test Warehouse 1 - _TC"]
+		for warehouse, qty in zip(warehouses, [5, 7], strict=False):
+			make_stock_entry(item_code=item_code, target=warehouse, qty=qty, basic_rate=100)
+
+		projected_qty = get_item_warehouse_projected_qty({item_code: []})[item_code]
+		self.assertEqual(projected_qty[warehouses[0]], 5)
+		self.assertEqual(projected_qty[warehouses[1]], 7)
+
+		# group warehouses have the total of their child warehouses
+		parent_warehouses = get_parent_warehouses()
+		for parent in set(parent_warehouses[warehouses[0]]) & set(parent_warehouses[warehouses[1]]):
+			self.assertEqual(projected_qty[parent], 12)
+
 	def test_use_serial_and_batch_fields(self):
 		item = make_item(
 			"Test Use Serial and Batch Item SN Item",
@@ -11,6 +11,7 @@ from frappe.model.document import Document
 from frappe.utils import cint
 from frappe.utils.html_utils import clean_html
 
+from erpnext.stock.doctype.item_search_token.item_search_token import enqueue_rebuild_item_search_index
 from erpnext.stock.utils import check_pending_reposting
 
 
@@ -36,6 +37,7 @@ class StockSettings(Document):
 		allow_to_make_quality_inspection_after_purchase_or_delivery: DF.Check
 		allow_uom_with_conversion_rate_defined_in_item: DF.Check
 		auto_create_serial_and_batch_bundle_for_outward: DF.Check
+		auto_create_stock_balance_checkpoints: DF.Check
 		auto_indent: DF.Check
 		auto_insert_price_list_rate_if_missing: DF.Check
 		auto_reserve_serial_and_batch: DF.Check
@@ -48,6 +50,7 @@ class StockSettings(Document):
 		enable_stock_reservation: DF.Check
 		item_group: DF.Link | None
 		item_naming_by: DF.Literal["Item Code", "Naming Series"]
+		item_search_index_ready: DF.Check
 		mr_qty_allowance: DF.Float
 		naming_series_prefix: DF.Data | None
 		over_delivery_receipt_allowance: DF.Float
@@ -65,6 +68,8 @@ class StockSettings(Document):
 		stock_uom: DF.Link | None
 		update_existing_price_list_rate: DF.Check
 		update_price_list_based_on: DF.Literal["Rate", "Price List Rate"]
+		use_compact_stock_queue_encoding: DF.Check
+		use_item_search_index: DF.Check
 		use_naming_series: DF.Check
 		use_serial_batch_fields: DF.Check
 		valuation_method: DF.Literal["FIFO", "Moving Average", "LIFO"]
@@ -108,6 +113,10 @@ class StockSettings(Document):
 		self.change_precision_for_for_sales()
 		self.change_precision_for_purchase()
 
+		if self.has_value_changed("use_item_search_index") and self.use_item_search_index:
+			# items are searched without the index till it is built again
+			self.item_search_index_ready = 0
+
 	def validate_warehouses(self):
 		warehouse_fields = ["default_warehouse", "sample_retention_warehouse"]
 		for field in warehouse_fields:
@@ -218,6 +227,9 @@ class StockSettings(Document):
 	def on_update(self):
 		self.toggle_warehouse_field_for_inter_warehouse_transfer()
 
+		if self.has_value_changed("use_item_search_index") and self.use_item_search_index:
+			enqueue_rebuild_item_search_index()
+
 	def change_precision_for_for_sales(self):
 		doc_before_save = self.get_doc_before_save()
 		if doc_before_save and (
@@ -3,6 +3,7 @@
 
 
 import json
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, throw
@@ -137,6 +138,113 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	return out
 
 
+@frappe.whitelist()
+def get_item_details_for_items(args_list, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""Batched `get_item_details` for multiple rows, returns details in the same order as `args_list`.
+
+	Item Prices, Bins and UOM conversion factors for all rows are fetched together instead of per row."""
+	if isinstance(args_list, str):
+		args_list = json.loads(args_list)
+
+	args_list = [process_args(args) for args in args_list]
+	with prefetch_item_details(args_list):
+		return [get_item_details(args, doc, for_validate, overwrite_warehouse) for args in args_list]
+
+
+@contextmanager
+def prefetch_item_details(args_list):
+	"""Fetch Item Prices, Bins and UOM conversion factors of items in `args_list` with one query each,
+	to be used by `get_item_details` for these items while in this context"""
+	frappe.local.item_details_prefetch = get_item_details_prefetch(args_list)
+	try:
+		yield
+	finally:
+		frappe.local.item_details_prefetch = None
+
+
+def get_item_details_prefetch(args_list):
+	args_list = [frappe._dict(args) for args in args_list if args.get("item_code")]
+	prefetch = frappe._dict(item_prices={}, bins={}, conversion_factors={}, child_warehouses={})
+	if not args_list:
+		return prefetch
+
+	item_codes = {args.item_code for args in args_list}
+	variants = frappe.get_all(
+		"Item", filters={"name": ("in", list(item_codes))}, fields=["name", "variant_of"], order_by=None
+	)
+	variant_of = {d.name: d.variant_of for d in variants}
+	all_item_codes = list(item_codes | {d.variant_of for d in variants if d.variant_of})
+
+	price_lists = {
+		args.get("price_list") or args.get("selling_price_list") or args.get("buying_price_list")
+		for args in args_list
+	} - {None, ""}
+
+	if price_lists:
+		for item_code in all_item_codes:
+			for price_list in price_lists:
+				prefetch.item_prices[(item_code, price_list)] = []
+
+		for item_price in frappe.get_all(
+			"Item Price",
+			filters={"item_code": ("in", all_item_codes), "price_list": ("in", list(price_lists))},
+			fields=[
+				"name",
+				"item_code",
+				"price_list",
+				"price_list_rate",
+				"uom",
+				"batch_no",
+				"customer",
+				"supplier",
+				"valid_from",
+				"valid_upto",
+			],
+			order_by="name",
+		):
+			prefetch.item_prices[(item_price.item_code, item_price.price_list)].append(item_price)
+
+	for item_code in all_item_codes:
+		prefetch.bins[item_code] = {}
+	for d in frappe.get_all(
+		"Bin",
+		filters={"item_code": ("in", all_item_codes)},
+		fields=["item_code", "warehouse", "projected_qty", "actual_qty", "reserved_qty"],
+		order_by=None,
+	):
+		prefetch.bins[d.item_code][d.warehouse] = d
+
+	conversion_factors = {}
+	for d in frappe.get_all(
+		"UOM Conversion Detail",
+		filters={"parent": ("in", all_item_codes), "parenttype": "Item"},
+		fields=["parent", "uom", "conversion_factor"],
+		order_by="idx",
+	):
+		conversion_factors.setdefault(d.parent, {}).setdefault(d.uom, d.conversion_factor)
+
+	for item_code in item_codes:
+		# conversion factors of the template apply to its variants
+		prefetch.conversion_factors[item_code] = {
+			**conversion_factors.get(variant_of.get(item_code), {}),
+			**conversion_factors.get(item_code, {}),
+		}
+
+	return prefetch
+
+
+def get_prefetched_item_details(key, name):
+	"""Prefetched details of `name` (see `prefetch_item_details`) or None if not prefetched"""
+	prefetch = getattr(frappe.local, "item_details_prefetch", None)
+	if prefetch:
+		return prefetch[key].get(name)
+
+
+def clear_prefetched_item_prices(item_code, price_list):
+	if prefetch := getattr(frappe.local, "item_details_prefetch", None):
+		prefetch.item_prices.pop((item_code, price_list), None)
+
+
 def remove_standard_fields(details):
 	for key in child_table_fields + default_fields:
 		details.pop(key, None)
@@ -986,6 +1094,7 @@ def insert_item_price(args):
 			return
 
 		frappe.db.set_value("Item Price", item_price.name, "price_list_rate", price_list_rate)
+		clear_prefetched_item_prices(args.item_code, args.price_list)
 		frappe.msgprint(
 			_("Item Price updated for {0} in Price List {1}").format(args.item_code, args.price_list),
 			alert=True,
@@ -1009,6 +1118,7 @@ def insert_item_price(args):
 			}
 		)
 		item_price.insert()
+		clear_prefetched_item_prices(args.item_code, args.price_list)
 		frappe.msgprint(
 			_("Item Price added for {0} in Price List {1}").format(args.item_code, args.price_list),
 			alert=True,
@@ -1028,6 +1138,10 @@ def get_item_price(args, item_code, ignore_party=False, force_batch_no=False) ->
 	:param item_code: str, Item Doctype field item_code
 	"""
 
+	item_prices = get_prefetched_item_details("item_prices", (item_code, args.get("price_list")))
+	if item_prices is not None:
+		return filter_item_prices(item_prices, args, ignore_party, force_batch_no)
+
 	ip = frappe.qb.DocType("Item Price")
 	query = (
 		frappe.qb.from_(ip)
@@ -1064,6 +1178,46 @@ def get_item_price(args, item_code, ignore_party=False, force_batch_no=False) ->
 	return query.run()
 
 
+def filter_item_prices(item_prices, args, ignore_party=False, force_batch_no=False):
+	"""Apply the conditions and ordering of the query in `get_item_price` on prefetched Item Prices"""
+	transaction_date = getdate(args["transaction_date"]) if args.get("transaction_date") else None
+
+	filtered = []
+	for ip in item_prices:
+		if cstr(ip.uom) not in ("", args.get("uom")):
+			continue
+
+		if force_batch_no:
+			if ip.batch_no is None or ip.batch_no != args.get("batch_no"):
+				continue
+		elif cstr(ip.batch_no) not in ("", args.get("batch_no")):
+			continue
+
+		if not ignore_party:
+			if args.get("customer"):
+				if ip.customer != args.get("customer"):
+					continue
+			elif args.get("supplier"):
+				if ip.supplier != args.get("supplier"):
+					continue
+			elif ip.customer or ip.supplier:
+				continue
+
+		if transaction_date and not (
+			getdate(ip.valid_from or "2000-01-01")
+			<= transaction_date
+			<= getdate(ip.valid_upto or "2500-12-31")
+		):
+			continue
+
+		filtered.append(ip)
+
+	filtered.sort(
+		key=lambda ip: (getdate(ip.valid_from or "1900-01-01"), cstr(ip.batch_no), cstr(ip.uom)), reverse=True
+	)
+	return [(ip.name, ip.price_list_rate, ip.uom) for ip in filtered]
+
+
 @frappe.whitelist()
 def get_batch_based_item_price(params, item_code) -> float:
 	if isinstance(params, str):
@@ -1282,12 +1436,17 @@ def get_pos_profile(company, pos_profile=None, user=None):
 
 @frappe.whitelist()
 def get_conversion_factor(item_code, uom):
-	variant_of = frappe.db.get_value("Item", item_code, "variant_of", cache=True)
-	filters = {"parent": item_code, "uom": uom}
+	conversion_factors = get_prefetched_item_details("conversion_factors", item_code)
+	if conversion_factors is not None:
+		conversion_factor = conversion_factors.get(uom)
+	else:
+		variant_of = frappe.db.get_value("Item", item_code, "variant_of", cache=True)
+		filters = {"parent": item_code, "uom": uom}
+
+		if variant_of:
+			filters["parent"] = ("in", (item_code, variant_of))
+		conversion_factor = frappe.db.get_value("UOM Conversion Detail", filters, "conversion_factor")
 
-	if variant_of:
-		filters["parent"] = ("in", (item_code, variant_of))
-	conversion_factor = frappe.db.get_value("UOM Conversion Detail", filters, "conversion_factor")
 	if not conversion_factor:
 		stock_uom = frappe.db.get_value("Item", item_code, "stock_uom")
 		conversion_factor = get_uom_conv_factor(uom, stock_uom)
@@ -1313,18 +1472,32 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 
 		from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 
-		warehouses = get_child_warehouses(warehouse) if include_child_warehouses else [warehouse]
+		if include_child_warehouses:
+			warehouses = get_prefetched_item_details("child_warehouses", warehouse)
+			if warehouses is None:
+				warehouses = get_child_warehouses(warehouse)
+				if prefetch := getattr(frappe.local, "item_details_prefetch", None):
+					prefetch.child_warehouses[warehouse] = warehouses
+		else:
+			warehouses = [warehouse]
 
-		bin = frappe.qb.DocType("Bin")
-		bin_details = (
-			frappe.qb.from_(bin)
-			.select(
-				Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
-				Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
-				Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
-			)
-			.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
-		).run(as_dict=True)[0]
+		bins = get_prefetched_item_details("bins", item_code)
+		if bins is not None:
+			bin_details = {
+				field: sum(flt(bins[wh][field]) for wh in warehouses if wh in bins)
+				for field in ("projected_qty", "actual_qty", "reserved_qty")
+			}
+		else:
+			bin = frappe.qb.DocType("Bin")
+			bin_details = (
+				frappe.qb.from_(bin)
+				.select(
+					Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
+					Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
+					Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
+				)
+				.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
+			).run(as_dict=True)[0]
 
 	if company:
 		bin_details["company_total_stock"] = get_company_total_stock(item_code, company)
@@ -3,11 +3,12 @@
 
 
 import json
+import time
 from math import ceil
 
 import frappe
 from frappe import _
-from frappe.utils import add_days, cint, flt, nowdate
+from frappe.utils import add_days, cint, create_batch, flt, nowdate
 
 import erpnext
 
@@ -23,6 +24,7 @@ def reorder_item():
 
 
 def _reorder_item():
+	timer = ReorderTimer()
 	material_requests = {"Purchase": {}, "Transfer": {}, "Material Issue": {}, "Manufacture": {}}
 	warehouse_company = frappe._dict(
 		frappe.db.sql(
@@ -35,63 +37,46 @@ def _reorder_item():
 	)
 
 	items_to_consider = get_items_for_reorder()
+	timer.log("get_items_for_reorder")
 
 	if not items_to_consider:
 		return
 
 	item_warehouse_projected_qty = get_item_warehouse_projected_qty(items_to_consider)
+	timer.log("get_item_warehouse_projected_qty")
+
+	# all reorder levels in flat columns, disabled warehouses and templates are skipped
+	item_codes, reorder_levels = [], []
+	for item_code, levels in items_to_consider.items():
+		for d in levels:
+			if not d.has_variants and d.warehouse in warehouse_company:
+				item_codes.append(item_code)
+				reorder_levels.append(d)
+
+	# projected_qty will be 0 if Bin does not exist
+	projected_qty = [
+		flt(item_warehouse_projected_qty.get(item_code, {}).get(d.warehouse_group or d.warehouse))
+		for item_code, d in zip(item_codes, reorder_levels, strict=False)
+	]
+	reorder_level = [flt(d.warehouse_reorder_level) for d in reorder_levels]
+	reorder_qty = [flt(d.warehouse_reorder_qty) for d in reorder_levels]
+
+	for idx in range(len(reorder_levels)):
+		if not (reorder_level[idx] or reorder_qty[idx]) or projected_qty[idx] > reorder_level[idx]:
+			continue
 
-	def add_to_material_request(**kwargs):
-		if isinstance(kwargs, dict):
-			kwargs = frappe._dict(kwargs)
-
-		if kwargs.warehouse not in warehouse_company:
-			# a disabled warehouse
-			return
-
-		reorder_level = flt(kwargs.reorder_level)
-		reorder_qty = flt(kwargs.reorder_qty)
-
-		# projected_qty will be 0 if Bin does not exist
-		if kwargs.warehouse_group:
-			projected_qty = flt(
-				item_warehouse_projected_qty.get(kwargs.item_code, {}).get(kwargs.warehouse_group)
-			)
-		else:
-			projected_qty = flt(item_warehouse_projected_qty.get(kwargs.item_code, {}).get(kwargs.warehouse))
-
-		if (reorder_level or reorder_qty) and projected_qty <= reorder_level:
-			deficiency = reorder_level - projected_qty
-			if deficiency > reorder_qty:
-				reorder_qty = deficiency
-
-			company = warehouse_company.get(kwargs.warehouse) or default_company
-
-			material_requests[kwargs.material_request_type].setdefault(company, []).append(
-				{
-					"item_code": kwargs.item_code,
-					"warehouse": kwargs.warehouse,
-					"reorder_qty": reorder_qty,
-					"item_details": kwargs.item_details,
-				}
-			)
+		d = reorder_levels[idx]
+		company = warehouse_company.get(d.warehouse) or default_company
 
-	for item_code, reorder_levels in items_to_consider.items():
-		for d in reorder_levels:
-			if d.has_variants:
-				continue
-
-			add_to_material_request(
-				item_code=item_code,
-				warehouse=d.warehouse,
-				reorder_level=d.warehouse_reorder_level,
-				reorder_qty=d.warehouse_reorder_qty,
-				material_request_type=d.material_request_type,
-				warehouse_group=d.warehouse_group,
-				item_details=frappe._dict(
+		material_requests[d.material_request_type].setdefault(company, []).append(
+			{
+				"item_code": item_codes[idx],
+				"warehouse": d.warehouse,
+				"reorder_qty": max(reorder_qty[idx], reorder_level[idx] - projected_qty[idx]),
+				"item_details": frappe._dict(
 					{
-						"item_code": item_code,
-						"name": item_code,
+						"item_code": item_codes[idx],
+						"name": item_codes[idx],
 						"item_name": d.item_name,
 						"item_group": d.item_group,
 						"brand": d.brand,
@@ -101,10 +86,35 @@ def _reorder_item():
 						"lead_time_days": d.lead_time_days,
 					}
 				),
-			)
+			}
+		)
+
+	timer.log("compute_reorder_qty", rows=len(reorder_levels))
 
 	if material_requests:
-		return create_material_request(material_requests)
+		mr_list = create_material_request(material_requests)
+		timer.log("create_material_request", material_requests=len(mr_list))
+		timer.report()
+
+		return mr_list
+
+
+class ReorderTimer:
+	"""Time taken by each step of the auto reorder job, written to the `reorder_item` log"""
+
+	def __init__(self):
+		self.start = self.last = time.monotonic()
+		self.steps = []
+
+	def log(self, step, **details):
+		current = time.monotonic()
+		self.steps.append({"step": step, "seconds": round(current - self.last, 3), **details})
+		self.last = current
+
+	def report(self):
+		frappe.logger("reorder_item", allow_site=True).info(
+			{"total_seconds": round(time.monotonic() - self.start, 3), "steps": self.steps}
+		)
 
 
 def get_items_for_reorder() -> dict[str, list]:
@@ -183,37 +193,43 @@ def get_reorder_levels_for_variants(itemwise_reorder):
 
 
 def get_item_warehouse_projected_qty(items_to_consider):
+	"""Projected qty of items per warehouse. Group warehouses have the total of their child warehouses."""
 	item_warehouse_projected_qty = {}
-	items_to_consider = list(items_to_consider.keys())
-
-	for item_code, warehouse, projected_qty in frappe.db.sql(
-		"""select item_code, warehouse, projected_qty
-		from tabBin where item_code in ({})
-			and (warehouse != '' and warehouse is not null)""".format(
-			", ".join(["%s"] * len(items_to_consider))
-		),
-		items_to_consider,
-	):
-		if item_code not in item_warehouse_projected_qty:
-			item_warehouse_projected_qty.setdefault(item_code, {})
-
-		if warehouse not in item_warehouse_projected_qty.get(item_code):
-			item_warehouse_projected_qty[item_code][warehouse] = flt(projected_qty)
-
-		warehouse_doc = frappe.get_doc("Warehouse", warehouse)
-
-		while warehouse_doc.parent_warehouse:
-			if not item_warehouse_projected_qty.get(item_code, {}).get(warehouse_doc.parent_warehouse):
-				item_warehouse_projected_qty.setdefault(item_code, {})[warehouse_doc.parent_warehouse] = flt(
-					projected_qty
-				)
-			else:
-				item_warehouse_projected_qty[item_code][warehouse_doc.parent_warehouse] += flt(projected_qty)
-			warehouse_doc = frappe.get_doc("Warehouse", warehouse_doc.parent_warehouse)
+	parent_warehouses = get_parent_warehouses()
+
+	for item_codes in create_batch(list(items_to_consider.keys()), 1000):
+		for item_code, warehouse, projected_qty in frappe.db.sql(
+			"""select item_code, warehouse, projected_qty
+			from tabBin where item_code in ({})
+				and (warehouse != '' and warehouse is not null)""".format(
+				", ".join(["%s"] * len(item_codes))
+			),
+			item_codes,
+		):
+			warehouse_qty = item_warehouse_projected_qty.setdefault(item_code, {})
+			for name in (warehouse, *parent_warehouses.get(warehouse, ())):
+				warehouse_qty[name] = warehouse_qty.get(name, 0.0) + flt(projected_qty)
 
 	return item_warehouse_projected_qty
 
 
+def get_parent_warehouses():
+	"""Map of each warehouse to all its parent warehouses, nearest first"""
+	parent_of = dict(frappe.get_all("Warehouse", fields=["name", "parent_warehouse"], as_list=True))
+
+	parent_warehouses = {}
+	for warehouse in parent_of:
+		parents = []
+		parent = parent_of.get(warehouse)
+		while parent and parent not in parents:
+			parents.append(parent)
+			parent = parent_of.get(parent)
+
+		parent_warehouses[warehouse] = parents
+
+	return parent_warehouses
+
+
 def create_material_request(material_requests):
 	"""Create indent on reaching reorder level"""
 	mr_list = []
@@ -228,6 +244,8 @@ def create_material_request(material_requests):
 
 		mr.log_error("Unable to create material request")
 
+	conversion_factors, whole_number_uoms = get_uom_details_for_material_requests(material_requests)
+
 	company_wise_mr = frappe._dict({})
 	for request_type in material_requests:
 		for company in material_requests[request_type]:
@@ -256,18 +274,10 @@ def create_material_request(material_requests):
 					if request_type == "Purchase":
 						uom = item.purchase_uom or item.stock_uom
 						if uom != item.stock_uom:
-							conversion_factor = (
-								frappe.db.get_value(
-									"UOM Conversion Detail",
-									{"parent": item.name, "uom": uom},
-									"conversion_factor",
-								)
-								or 1.0
-							)
-
-					must_be_whole_number = frappe.db.get_value("UOM", uom, "must_be_whole_number", cache=True)
+							conversion_factor = conversion_factors.get((item.name, uom)) or 1.0
+
 					qty = d.reorder_qty / conversion_factor
-					if must_be_whole_number:
+					if uom in whole_number_uoms:
 						qty = ceil(qty)
 
 					mr.append(
@@ -315,6 +325,29 @@ def create_material_request(material_requests):
 	return mr_list
 
 
+def get_uom_details_for_material_requests(material_requests):
+	"""Purchase UOM conversion factors of the items and UOMs which must be whole numbers"""
+	item_codes = {
+		d["item_code"]
+		for company_items in material_requests.get("Purchase", {}).values()
+		for d in company_items
+		if d["item_details"].purchase_uom
+	}
+
+	conversion_factors = {}
+	for batch in create_batch(sorted(item_codes), 1000):
+		for d in frappe.get_all(
+			"UOM Conversion Detail",
+			filters={"parent": ("in", batch)},
+			fields=["parent", "uom", "conversion_factor"],
+		):
+			conversion_factors[(d.parent, d.uom)] = d.conversion_factor
+
+	whole_number_uoms = set(frappe.get_all("UOM", filters={"must_be_whole_number": 1}, pluck="name"))
+
+	return conversion_factors, whole_number_uoms
+
+
 def send_email_notification(company_wise_mr):
 	"""Notify user about auto creation of indent"""
 
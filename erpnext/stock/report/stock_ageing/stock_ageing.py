@@ -7,7 +7,7 @@ from operator import itemgetter
 
 import frappe
 from frappe import _
-from frappe.utils import cint, date_diff, flt, get_datetime
+from frappe.utils import cint, create_batch, date_diff, flt, get_datetime
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
@@ -19,7 +19,7 @@ def execute(filters: Filters = None) -> tuple:
 	filters.ranges = [num.strip() for num in filters.range.split(",") if num.strip().isdigit()]
 	columns = get_columns(filters)
 
-	item_details = FIFOSlots(filters).generate()
+	item_details = FIFOSlots(filters).generate_item_wise()
 	data = format_report_data(filters, item_details, to_date)
 
 	chart_data = get_chart_data(data, filters)
@@ -27,14 +27,17 @@ def execute(filters: Filters = None) -> tuple:
 	return columns, data, None, chart_data
 
 
-def format_report_data(filters: Filters, item_details: dict, to_date: str) -> list[dict]:
+def format_report_data(filters: Filters, item_details: dict | Iterator[tuple], to_date: str) -> list[dict]:
 	"Returns ordered, formatted data with ranges."
 	_func = itemgetter(1)
 	data = []
 
+	if isinstance(item_details, dict):
+		item_details = item_details.items()
+
 	precision = cint(frappe.db.get_single_value("System Settings", "float_precision", cache=True))
 
-	for _item, item_dict in item_details.items():
+	for _item, item_dict in item_details:
 		if not flt(item_dict.get("total_qty"), precision):
 			continue
 
@@ -244,10 +247,6 @@ class FIFOSlots:
 		}
 		"""
 
-		from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
-			get_serial_nos_from_bundle,
-		)
-
 		stock_ledger_entries = self.sle
 
 		bundle_wise_serial_nos = frappe._dict({})
@@ -259,26 +258,7 @@ class FIFOSlots:
 				stock_ledger_entries = self.__get_stock_ledger_entries()
 
 			for d in stock_ledger_entries:
-				key, fifo_queue, transferred_item_key = self.__init_key_stores(d)
-
-				if d.voucher_type == "Stock Reconciliation":
-					# get difference in qty shift as actual qty
-					prev_balance_qty = self.item_details[key].get("qty_after_transaction", 0)
-					d.actual_qty = flt(d.qty_after_transaction) - flt(prev_balance_qty)
-
-				serial_nos = get_serial_nos(d.serial_no) if d.serial_no else []
-				if d.serial_and_batch_bundle and d.has_serial_no:
-					if bundle_wise_serial_nos:
-						serial_nos = bundle_wise_serial_nos.get(d.serial_and_batch_bundle) or []
-					else:
-						serial_nos = get_serial_nos_from_bundle(d.serial_and_batch_bundle) or []
-
-				if d.actual_qty > 0:
-					self.__compute_incoming_stock(d, fifo_queue, transferred_item_key, serial_nos)
-				else:
-					self.__compute_outgoing_stock(d, fifo_queue, transferred_item_key, serial_nos)
-
-				self.__update_balances(d, key)
+				self.__process_sle(d, bundle_wise_serial_nos)
 
 			# Note that stock_ledger_entries is an iterator, you can not reuse it like a list
 			del stock_ledger_entries
@@ -289,6 +269,81 @@ class FIFOSlots:
 
 		return self.item_details
 
+	def generate_item_wise(self, chunk_size: int = 500) -> Iterator[tuple]:
+		"""
+		Yields (key, details) pairs with the same structure as `generate`, one item at a time.
+
+		Stock Ledger Entries are read for a chunk of items at a time, sorted by item, and the
+		slots of an item are finalised as soon as its entries end. Memory used is bounded by
+		the chunk size instead of growing with the number of items.
+		"""
+		if self.sle is not None:
+			# stable sort, entries of an item stay in posting order
+			yield from self.__generate_for_entries(sorted(self.sle, key=itemgetter("name")), {})
+			return
+
+		for item_codes in create_batch(self.__get_item_codes(), chunk_size):
+			bundle_wise_serial_nos = self.__get_bundle_wise_serial_nos(item_codes)
+
+			# consumed before yielding, the caller may query while the cursor is still open otherwise
+			with frappe.db.unbuffered_cursor():
+				item_details = list(
+					self.__generate_for_entries(
+						self.__get_stock_ledger_entries(item_codes), bundle_wise_serial_nos
+					)
+				)
+
+			yield from item_details
+
+	def __generate_for_entries(self, stock_ledger_entries, bundle_wise_serial_nos: dict) -> Iterator[tuple]:
+		item_code = None
+		for d in stock_ledger_entries:
+			if d.name != item_code:
+				yield from self.__flush_item_details()
+				item_code = d.name
+
+			self.__process_sle(d, bundle_wise_serial_nos)
+
+		yield from self.__flush_item_details()
+
+	def __flush_item_details(self) -> Iterator[tuple]:
+		"Yield slots of the processed item and reset the stores for the next one."
+		item_details = self.item_details
+		if not self.filters.get("show_warehouse_wise_stock"):
+			item_details = self.__aggregate_details_by_item(item_details)
+
+		self.item_details = {}
+		self.transferred_item_details = {}
+		self.serial_no_batch_purchase_details = {}
+
+		yield from item_details.items()
+
+	def __process_sle(self, d: dict, bundle_wise_serial_nos: dict):
+		key, fifo_queue, transferred_item_key = self.__init_key_stores(d)
+
+		if d.voucher_type == "Stock Reconciliation":
+			# get difference in qty shift as actual qty
+			prev_balance_qty = self.item_details[key].get("qty_after_transaction", 0)
+			d.actual_qty = flt(d.qty_after_transaction) - flt(prev_balance_qty)
+
+		serial_nos = get_serial_nos(d.serial_no) if d.serial_no else []
+		if d.serial_and_batch_bundle and d.has_serial_no:
+			if bundle_wise_serial_nos:
+				serial_nos = bundle_wise_serial_nos.get(d.serial_and_batch_bundle) or []
+			else:
+				from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+					get_serial_nos_from_bundle,
+				)
+
+				serial_nos = get_serial_nos_from_bundle(d.serial_and_batch_bundle) or []
+
+		if d.actual_qty > 0:
+			self.__compute_incoming_stock(d, fifo_queue, transferred_item_key, serial_nos)
+		else:
+			self.__compute_outgoing_stock(d, fifo_queue, transferred_item_key, serial_nos)
+
+		self.__update_balances(d, key)
+
 	def __init_key_stores(self, row: dict) -> tuple:
 		"Initialise keys and FIFO Queue."
 
@@ -435,7 +490,7 @@ class FIFOSlots:
 
 		return item_aggregated_data
 
-	def __get_stock_ledger_entries(self) -> Iterator[dict]:
+	def __get_stock_ledger_entries(self, item_codes: list | None = None) -> Iterator[dict]:
 		sle = frappe.qb.DocType("Stock Ledger Entry")
 		item = self.__get_item_query()  # used as derived table in sle query
 		to_date = get_datetime(self.filters.get("to_date") + " 23:59:59")
@@ -484,11 +539,14 @@ class FIFOSlots:
 			if warehouses:
 				sle_query = sle_query.where(sle.warehouse.isin(warehouses))
 
+		if item_codes:
+			sle_query = sle_query.where(sle.item_code.isin(item_codes)).orderby(sle.item_code)
+
 		sle_query = sle_query.orderby(sle.posting_datetime, sle.creation)
 
 		return sle_query.run(as_dict=True, as_iterator=True)
 
-	def __get_bundle_wise_serial_nos(self) -> dict:
+	def __get_bundle_wise_serial_nos(self, item_codes: list | None = None) -> dict:
 		bundle = frappe.qb.DocType("Serial and Batch Bundle")
 		entry = frappe.qb.DocType("Serial and Batch Entry")
 
@@ -509,6 +567,9 @@ class FIFOSlots:
 			if self.filters.get(field):
 				query = query.where(bundle[field] == self.filters.get(field))
 
+		if item_codes:
+			query = query.where(bundle.item_code.isin(item_codes))
+
 		if self.filters.get("warehouse"):
 			query = self.__get_warehouse_conditions(bundle, query)
 
@@ -518,6 +579,23 @@ class FIFOSlots:
 
 		return bundle_wise_serial_nos
 
+	def __get_item_codes(self) -> list[str]:
+		item_table = frappe.qb.DocType("Item")
+		query = (
+			frappe.qb.from_(item_table)
+			.select(item_table.name)
+			.where(item_table.is_stock_item == 1)
+			.orderby(item_table.name)
+		)
+
+		if self.filters.get("item_code"):
+			query = query.where(item_table.item_code == self.filters.get("item_code"))
+
+		if self.filters.get("brand"):
+			query = query.where(item_table.brand == self.filters.get("brand"))
+
+		return query.run(pluck=True)
+
 	def __get_item_query(self) -> str:
 		item_table = frappe.qb.DocType("Item")
 
@@ -1,6 +1,8 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
+import copy
+
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
@@ -868,6 +870,45 @@ class TestStockAgeing(FrappeTestCase):
 		range_valuations = range_values[1::2]
 		self.assertEqual(range_valuations, [15, 7.5, 20, 5])
 
+	def test_item_wise_generation_matches_full_scan(self):
+		"Slots yielded item by item match the slots generated over all entries."
+
+		def make_sle(item, qty, balance, warehouse, posting_date, voucher_no):
+			return frappe._dict(
+				name=item,
+				actual_qty=qty,
+				qty_after_transaction=balance,
+				stock_value_difference=qty * 10,
+				warehouse=warehouse,
+				posting_date=posting_date,
+				voucher_type="Stock Entry",
+				voucher_no=voucher_no,
+				has_serial_no=False,
+				serial_no=None,
+			)
+
+		sle = [
+			make_sle("Flask Item", 30, 30, "WH 1", "2021-12-01", "001"),
+			make_sle("Bottle Item", 10, 10, "WH 1", "2021-12-02", "002"),
+			make_sle("Flask Item", -20, 10, "WH 1", "2021-12-03", "003"),
+			make_sle("Flask Item", 20, 20, "WH 2", "2021-12-03", "003"),
+			make_sle("Bottle Item", -15, -5, "WH 1", "2021-12-04", "004"),
+			make_sle("Flask Item", 5, 15, "WH 1", "2021-12-05", "005"),
+		]
+
+		for show_warehouse_wise_stock in (False, True):
+			self.filters.show_warehouse_wise_stock = show_warehouse_wise_stock
+			slots = FIFOSlots(self.filters, copy.deepcopy(sle)).generate()
+			item_wise_slots = dict(FIFOSlots(self.filters, copy.deepcopy(sle)).generate_item_wise())
+
+			self.assertEqual(item_wise_slots, slots)
+
+			# rows are ordered by item instead of the first posting of the item
+			self.assertEqual(
+				sorted(format_report_data(self.filters, item_wise_slots.items(), self.filters["to_date"])),
+				sorted(format_report_data(self.filters, slots, self.filters["to_date"])),
+			)
+
 
 def generate_item_and_item_wh_wise_slots(filters, sle):
 	"Return results with and without 'show_warehouse_wise_stock'"
@@ -14,6 +14,10 @@ from frappe.utils.nestedset import get_descendants_of
 
 import erpnext
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	get_checkpoint_condition,
+	get_checkpoint_dates,
+)
 from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, get_average_age
 from erpnext.stock.utils import add_additional_uom_columns
@@ -77,6 +81,7 @@ class StockBalanceReport:
 
 		closing_balance = self.get_closing_balance()
 		if not closing_balance:
+			self.prepare_opening_data_from_checkpoint()
 			return
 
 		self.start_from = add_days(closing_balance[0].to_date, 1)
@@ -89,6 +94,49 @@ class StockBalanceReport:
 			if group_by_key not in self.opening_data:
 				self.opening_data.setdefault(group_by_key, entry)
 
+	def prepare_opening_data_from_checkpoint(self) -> None:
+		"""Start from the latest Stock Balance Checkpoint before the from date. Checkpoints are kept
+		per item and warehouse, so they are not used for inventory dimension wise or ageing data."""
+		if (
+			self.filters.get("ignore_closing_balance")
+			or not self.filters.get("company")
+			or self.filters.get("show_stock_ageing_data")
+			or self.filters.get("show_dimension_wise_stock")
+			or any(self.filters.get(fieldname) for fieldname in self.inventory_dimensions)
+		):
+			return
+
+		checkpoint_dates = get_checkpoint_dates(add_days(self.from_date, -1), self.filters.company)
+		if not checkpoint_dates:
+			return
+
+		self.start_from = add_days(checkpoint_dates[self.filters.company], 1)
+
+		checkpoint = frappe.qb.DocType("Stock Balance Checkpoint")
+		item_table = frappe.qb.DocType("Item")
+		query = (
+			frappe.qb.from_(checkpoint)
+			.inner_join(item_table)
+			.on(checkpoint.item_code == item_table.name)
+			.select(
+				checkpoint.company,
+				checkpoint.item_code,
+				checkpoint.warehouse,
+				checkpoint.qty_after_transaction.as_("bal_qty"),
+				checkpoint.stock_value.as_("bal_val"),
+				item_table.item_group,
+				item_table.stock_uom,
+				item_table.item_name,
+			)
+			.where(get_checkpoint_condition(checkpoint, checkpoint_dates))
+		)
+
+		query = self.apply_warehouse_filters(query, checkpoint)
+		query = self.apply_items_filters(query, item_table)
+
+		for entry in query.run(as_dict=True):
+			self.opening_data[self.get_group_by_key(entry)] = entry
+
 	def prepare_new_data(self):
 		self.item_warehouse_map = self.get_item_warehouse_map()
 
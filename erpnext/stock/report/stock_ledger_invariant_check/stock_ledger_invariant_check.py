@@ -7,6 +7,8 @@ import frappe
 from frappe import _
 from frappe.utils import cint, flt, get_link_to_form, parse_json
 
+from erpnext.stock.valuation import load_stock_queue
+
 SLE_FIELDS = (
 	"name",
 	"posting_date",
@@ -55,7 +57,10 @@ def add_invariant_check_fields(sles, filters):
 	incorrect_idx = 0
 	precision = frappe.get_precision("Stock Ledger Entry", "actual_qty")
 	for idx, sle in enumerate(sles):
-		queue = json.loads(sle.stock_queue) if sle.stock_queue else []
+		queue = load_stock_queue(sle.stock_queue)
+		if queue:
+			# show compact encoded queues as JSON
+			sle.stock_queue = json.dumps(queue)
 
 		fifo_qty = 0.0
 		fifo_value = 0.0
@@ -1,8 +1,6 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
-import json
-
 import frappe
 from frappe import _
 from frappe.utils import cint, flt
@@ -10,6 +8,7 @@ from frappe.utils import cint, flt
 from erpnext.stock.report.stock_ledger_invariant_check.stock_ledger_invariant_check import (
 	get_data as stock_ledger_invariant_check,
 )
+from erpnext.stock.valuation import load_stock_queue
 
 
 def execute(filters=None):
@@ -275,7 +274,7 @@ def has_difference(row, precision, difference_in, valuation_method):
 		qty_diff = flt(row.difference_in_qty, precision)
 		value_diff = flt(row.diff_value_diff, precision)
 
-		if row.stock_queue and json.loads(row.stock_queue):
+		if load_stock_queue(row.stock_queue):
 			value_diff = value_diff or (
 				flt(row.fifo_value_diff, precision) or flt(row.fifo_difference_diff, precision)
 			)
@@ -6,6 +6,13 @@ from typing import Any, TypedDict
 import frappe
 from frappe import _
 from frappe.query_builder.functions import Sum
+from frappe.utils import flt, today
+
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	get_checkpoint_condition,
+	get_checkpoint_dates,
+	get_ledger_after_checkpoint_condition,
+)
 
 
 class StockBalanceFilter(TypedDict):
@@ -38,8 +45,29 @@ def get_warehouse_wise_balance(filters: StockBalanceFilter) -> list[SLEntry]:
 	if filters.get("company"):
 		query = query.where(sle.company == filters.get("company"))
 
-	data = query.run(as_list=True)
-	return frappe._dict(data) if data else frappe._dict()
+	# start from the latest stock balance checkpoint of each company and add the entries after it
+	checkpoint_dates = get_checkpoint_dates(today(), filters.get("company"))
+	if checkpoint_dates:
+		query = query.where(get_ledger_after_checkpoint_condition(sle, checkpoint_dates))
+
+	data = frappe._dict(query.run(as_list=True) or [])
+	for warehouse, stock_value in get_checkpoint_warehouse_balance(checkpoint_dates):
+		data[warehouse] = flt(data.get(warehouse)) + flt(stock_value)
+
+	return data
+
+
+def get_checkpoint_warehouse_balance(checkpoint_dates):
+	if not checkpoint_dates:
+		return []
+
+	checkpoint = frappe.qb.DocType("Stock Balance Checkpoint")
+	return (
+		frappe.qb.from_(checkpoint)
+		.select(checkpoint.warehouse, Sum(checkpoint.stock_value))
+		.where(get_checkpoint_condition(checkpoint, checkpoint_dates))
+		.groupby(checkpoint.warehouse)
+	).run()
 
 
 def get_warehouses(report_filters: StockBalanceFilter):
@@ -337,15 +337,14 @@ class SerialBatchBundle:
 		if self.sle.auto_created_serial_and_batch_bundle and self.sle.actual_qty > 0:
 			return
 
-		serial_nos = get_serial_nos(self.sle.serial_and_batch_bundle)
-		if not self.sle.serial_and_batch_bundle and self.sle.serial_no:
-			serial_nos = get_parsed_serial_nos(self.sle.serial_no)
+		serial_nos = []
+		if not self.sle.serial_and_batch_bundle:
+			serial_nos = get_parsed_serial_nos(self.sle.serial_no) if self.sle.serial_no else []
+			if not serial_nos:
+				return
 
 		warehouse = self.warehouse if self.sle.actual_qty > 0 else None
 
-		if not serial_nos:
-			return
-
 		status = "Inactive"
 		if self.sle.actual_qty < 0:
 			status = "Delivered"
@@ -359,53 +358,67 @@ class SerialBatchBundle:
 				]:
 					status = "Consumed"
 
-		sn_table = frappe.qb.DocType("Serial No")
-
-		query = (
-			frappe.qb.update(sn_table)
-			.set(sn_table.warehouse, warehouse)
-			.set(
-				sn_table.status,
-				"Active"
-				if warehouse
-				else status
-				if (sn_table.purchase_document_no != self.sle.voucher_no and self.sle.is_cancelled != 1)
-				else "Inactive",
-			)
-			.set(sn_table.company, self.sle.company)
-			.where(sn_table.name.isin(serial_nos))
-		)
+		values = {
+			"warehouse": warehouse,
+			"status": "Active" if warehouse else status if self.sle.is_cancelled != 1 else "Inactive",
+			"company": self.sle.company,
+		}
 
 		if status == "Delivered":
 			warranty_period = frappe.get_cached_value("Item", self.sle.item_code, "warranty_period")
 			if warranty_period:
-				warranty_expiry_date = add_days(self.sle.posting_date, cint(warranty_period))
-				query = query.set(sn_table.warranty_expiry_date, warranty_expiry_date)
-				query = query.set(sn_table.warranty_period, warranty_period)
+				values["warranty_expiry_date"] = add_days(self.sle.posting_date, cint(warranty_period))
+				values["warranty_period"] = warranty_period
 		else:
-			query = query.set(sn_table.warranty_expiry_date, None)
-			query = query.set(sn_table.warranty_period, 0)
+			values["warranty_expiry_date"] = None
+			values["warranty_period"] = 0
+
+		if self.sle.serial_and_batch_bundle:
+			update_serial_nos_of_bundle(self.sle.serial_and_batch_bundle, values)
+			return
+
+		sn_table = frappe.qb.DocType("Serial No")
+		query = frappe.qb.update(sn_table).where(sn_table.name.isin(serial_nos))
+		for field, value in values.items():
+			query = query.set(sn_table[field], value)
 
 		query.run()
 
 	def set_batch_no_in_serial_nos(self):
-		entries = frappe.get_all(
-			"Serial and Batch Entry",
-			fields=["serial_no", "batch_no"],
-			filters={"parent": self.sle.serial_and_batch_bundle},
-		)
+		update_serial_nos_of_bundle(self.sle.serial_and_batch_bundle, set_batch_no=True)
+
+
+def update_serial_nos_of_bundle(serial_and_batch_bundle, values=None, set_batch_no=False):
+	"""Set `values` (and the batch no of the entry, if `set_batch_no`) on all the Serial Nos of
+	the bundle in one statement joined with the bundle entries, instead of passing every serial no
+	of the bundle in the query"""
+	values = values or {}
 
-		batch_serial_nos = {}
-		for ledger in entries:
-			batch_serial_nos.setdefault(ledger.batch_no, []).append(ledger.serial_no)
-
-		for batch_no, serial_nos in batch_serial_nos.items():
-			sn_table = frappe.qb.DocType("Serial No")
-			(
-				frappe.qb.update(sn_table)
-				.set(sn_table.batch_no, batch_no)
-				.where(sn_table.name.isin(serial_nos))
-			).run()
+	mariadb_set = [f"sn.`{field}` = %({field})s" for field in values]
+	postgres_set = [f"`{field}` = %({field})s" for field in values]
+	if set_batch_no:
+		mariadb_set.append("sn.`batch_no` = sbe.`batch_no`")
+		postgres_set.append("`batch_no` = sbe.`batch_no`")
+
+	if not mariadb_set:
+		return
+
+	# nosemgrep
+	frappe.db.multisql(
+		{
+			"mariadb": f"""
+				update `tabSerial No` sn
+				inner join `tabSerial and Batch Entry` sbe on sbe.serial_no = sn.name
+				set {", ".join(mariadb_set)}
+				where sbe.parent = %(serial_and_batch_bundle)s""",
+			"postgres": f"""
+				update `tabSerial No` sn
+				set {", ".join(postgres_set)}
+				from `tabSerial and Batch Entry` sbe
+				where sbe.serial_no = sn.name and sbe.parent = %(serial_and_batch_bundle)s""",
+		},
+		{**values, "serial_and_batch_bundle": serial_and_batch_bundle},
+	)
 
 
 def get_serial_nos(serial_and_batch_bundle, serial_nos=None):
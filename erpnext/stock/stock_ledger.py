@@ -4,6 +4,7 @@
 import copy
 import gzip
 import json
+import time
 
 import frappe
 from frappe import _, bold, scrub
@@ -11,6 +12,7 @@ from frappe.model.meta import get_field_precision
 from frappe.query_builder.functions import Sum
 from frappe.utils import (
 	cint,
+	create_batch,
 	cstr,
 	flt,
 	format_date,
@@ -23,11 +25,14 @@ from frappe.utils import (
 )
 
 import erpnext
-from erpnext.stock.doctype.bin.bin import update_qty as update_bin_qty
+from erpnext.stock.doctype.bin.bin import lock_bins, update_qty_in_bulk
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_batches,
 )
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	invalidate_stock_balance_checkpoints,
+)
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
 	get_sre_reserved_batch_nos_details,
 	get_sre_reserved_serial_nos_details,
@@ -41,7 +46,13 @@ from erpnext.stock.utils import (
 	get_stock_balance,
 	get_valuation_method,
 )
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	DequeFIFOValuation,
+	LIFOValuation,
+	dump_stock_queue,
+	load_stock_queue,
+	round_off_if_near_zero,
+)
 
 
 class NegativeStockError(frappe.ValidationError):
@@ -74,6 +85,18 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 		args = get_args_for_future_sle(sl_entries[0])
 		future_sle_exists(args, sl_entries)
 
+		invalidate_stock_balance_checkpoints(
+			sl_entries[0].get("company")
+			or frappe.get_cached_value("Warehouse", sl_entries[0].get("warehouse"), "company"),
+			min(getdate(sle.get("posting_date")) for sle in sl_entries),
+		)
+
+		# lock the bins of all the items upfront, always in the same order
+		bins = get_bins_for_sl_entries(sl_entries)
+		if bins:
+			lock_bins(sorted(set(bins.values())))
+
+		bin_updates = []
 		for sle in sl_entries:
 			if sle.serial_no and not via_landed_cost_voucher:
 				validate_serial_no(sle)
@@ -105,15 +128,30 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 
 			is_stock_item = frappe.get_cached_value("Item", args.get("item_code"), "is_stock_item")
 			if is_stock_item:
-				bin_name = get_or_make_bin(args.get("item_code"), args.get("warehouse"))
+				bin_name = bins.get((args.item_code, args.warehouse)) or get_or_make_bin(
+					args.get("item_code"), args.get("warehouse")
+				)
 				args.reserved_stock = flt(frappe.db.get_value("Bin", bin_name, "reserved_stock"))
 				repost_current_voucher(args, allow_negative_stock, via_landed_cost_voucher)
-				update_bin_qty(bin_name, args)
+				bin_updates.append((bin_name, args))
 			else:
 				frappe.msgprint(
 					_("Item {0} ignored since it is not a stock item").format(args.get("item_code"))
 				)
 
+		# quantities of each bin are updated once for the whole voucher
+		update_qty_in_bulk(bin_updates)
+
+
+def get_bins_for_sl_entries(sl_entries):
+	bins = {}
+	for sle in sl_entries:
+		key = (sle.get("item_code"), sle.get("warehouse"))
+		if key not in bins and frappe.get_cached_value("Item", key[0], "is_stock_item"):
+			bins[key] = get_or_make_bin(*key)
+
+	return bins
+
 
 def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False):
 	if args.get("actual_qty") or args.get("voucher_type") == "Stock Reconciliation":
@@ -236,6 +274,22 @@ def make_entry(args, allow_negative_stock=False, via_landed_cost_voucher=False):
 	return sle
 
 
+# Number of item-warehouse keys whose future SLEs are fetched together in batched reposting
+REPOST_PREFETCH_SIZE = 50
+
+# Fields recalculated by `update_entries_after.process_sle`, written back in bulk
+SLE_FIELDS_TO_UPDATE = (
+	"actual_qty",
+	"qty_after_transaction",
+	"incoming_rate",
+	"outgoing_rate",
+	"valuation_rate",
+	"stock_value",
+	"stock_value_difference",
+	"stock_queue",
+)
+
+
 def repost_future_sle(
 	args=None,
 	voucher_type=None,
@@ -243,7 +297,13 @@ def repost_future_sle(
 	allow_negative_stock=None,
 	via_landed_cost_voucher=False,
 	doc=None,
+	batched=False,
 ):
+	"""Repost future SLEs of all item-warehouses affected by a transaction.
+
+	If `batched` is set, future SLEs of upcoming item-warehouses are fetched together
+	and recalculated values are written back with bulk updates.
+	"""
 	if not args:
 		args = []  # set args to empty list if None to avoid enumerate error
 
@@ -260,10 +320,17 @@ def repost_future_sle(
 	distinct_item_warehouses = get_distinct_item_warehouse(args, doc, reposting_data=reposting_data)
 	affected_transactions = get_affected_transactions(doc, reposting_data=reposting_data)
 
+	prefetched_sles = {}
+	reposted_entries = 0
+	start_time = time.monotonic()
+
 	i = get_current_index(doc) or 0
 	while i < len(args):
 		validate_item_warehouse(args[i])
 
+		if batched and (args[i].get("item_code"), args[i].get("warehouse")) not in prefetched_sles:
+			prefetched_sles.update(get_future_sle_for_item_warehouses(args[i : i + REPOST_PREFETCH_SIZE]))
+
 		obj = update_entries_after(
 			{
 				"item_code": args[i].get("item_code"),
@@ -274,11 +341,14 @@ def repost_future_sle(
 				"distinct_item_warehouses": distinct_item_warehouses,
 				"items_to_be_repost": args,
 				"current_index": i,
+				"prefetched_sles": prefetched_sles,
+				"batch_updates": batched,
 			},
 			allow_negative_stock=allow_negative_stock,
 			via_landed_cost_voucher=via_landed_cost_voucher,
 		)
 		affected_transactions.update(obj.affected_transactions)
+		reposted_entries += obj.processed_entries
 
 		key = (args[i].get("item_code"), args[i].get("warehouse"))
 		if distinct_item_warehouses.get(key):
@@ -297,11 +367,95 @@ def repost_future_sle(
 				data.sle_changed = False
 		i += 1
 
+		# in batched mode, save progress (and commit) only once prefetched entries are used up,
+		# so that rows locked by the prefetch query stay locked until they are reposted
+		if batched and i < len(args):
+			if (args[i].get("item_code"), args[i].get("warehouse")) in prefetched_sles:
+				continue
+
 		if doc:
 			update_args_in_repost_item_valuation(
-				doc, i, args, distinct_item_warehouses, affected_transactions
+				doc,
+				i,
+				args,
+				distinct_item_warehouses,
+				affected_transactions,
+				reposting_stats=get_reposting_stats(reposted_entries, start_time),
 			)
 
+	return get_reposting_stats(reposted_entries, start_time)
+
+
+def get_reposting_stats(reposted_entries, start_time):
+	elapsed = time.monotonic() - start_time
+	return frappe._dict(
+		{
+			"reposted_entries": reposted_entries,
+			"rows_per_second": flt(reposted_entries / elapsed, 2) if elapsed else 0.0,
+		}
+	)
+
+
+def get_future_sle_for_item_warehouses(args):
+	"""Fetch future SLEs of many item-warehouses in a single query.
+
+	Returns {(item_code, warehouse): (from_datetime, [sle, ...])}, entries of each key
+	are sorted the same way as `get_stock_ledger_entries`.
+	"""
+	from_datetimes = {}
+	for row in args:
+		key = (row.get("item_code"), row.get("warehouse"))
+		posting_datetime = get_combine_datetime(row.get("posting_date"), row.get("posting_time"))
+		if key not in from_datetimes or posting_datetime < from_datetimes[key]:
+			from_datetimes[key] = posting_datetime
+
+	conditions, values = [], []
+	for (item_code, warehouse), from_datetime in from_datetimes.items():
+		conditions.append("(item_code = %s and warehouse = %s and posting_datetime >= %s)")
+		values.extend([item_code, warehouse, from_datetime])
+
+	# nosemgrep
+	entries = frappe.db.sql(
+		"""
+		select *, posting_datetime as "timestamp"
+		from `tabStock Ledger Entry`
+		where is_cancelled = 0
+		and ({conditions})
+		order by posting_datetime asc, creation asc
+		for update""".format(conditions=" or ".join(conditions)),
+		values,
+		as_dict=1,
+	)
+
+	future_sles = {key: (from_datetime, []) for key, from_datetime in from_datetimes.items()}
+	for sle in entries:
+		future_sles[(sle.item_code, sle.warehouse)][1].append(sle)
+
+	return future_sles
+
+
+def bulk_update_stock_ledger_entries(entries):
+	"""Write recalculated values of many SLEs using one UPDATE per chunk."""
+	for chunk in create_batch(entries, 500):
+		set_clauses, values = [], []
+		for field in SLE_FIELDS_TO_UPDATE:
+			set_clauses.append(f"`{field}` = case name {' '.join(['when %s then %s'] * len(chunk))} end")
+			for sle in chunk:
+				values.extend([sle.name, sle.get(field)])
+
+		values.extend(sle.name for sle in chunk)
+
+		# nosemgrep
+		frappe.db.sql(
+			"""
+			update `tabStock Ledger Entry`
+			set {set_clauses}
+			where name in ({names})""".format(
+				set_clauses=", ".join(set_clauses), names=", ".join(["%s"] * len(chunk))
+			),
+			values,
+		)
+
 
 def get_reposting_data(file_path) -> dict:
 	file_name = frappe.db.get_value(
@@ -340,7 +494,9 @@ def validate_item_warehouse(args):
 			frappe.throw(_(validation_msg))
 
 
-def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehouses, affected_transactions):
+def update_args_in_repost_item_valuation(
+	doc, index, args, distinct_item_warehouses, affected_transactions, reposting_stats=None
+):
 	if not doc.items_to_be_repost:
 		file_name = ""
 		if doc.reposting_data_file:
@@ -387,6 +543,7 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 			"items_to_be_repost": json.dumps(args, default=str),
 			"current_index": index,
 			"total_reposting_count": len(args),
+			**(reposting_stats or {}),
 		},
 		doctype=doc.doctype,
 		docname=doc.name,
@@ -559,12 +716,25 @@ class update_entries_after:
 		self.company = frappe.get_cached_value("Warehouse", self.args.warehouse, "company")
 		self.set_precision()
 		self.valuation_method = get_valuation_method(self.item_code)
+		self.compact_stock_queue = frappe.db.get_single_value(
+			"Stock Settings", "use_compact_stock_queue_encoding", cache=True
+		)
 
 		self.new_items_found = False
 		self.distinct_item_warehouses = args.get("distinct_item_warehouses", frappe._dict())
 		self.affected_transactions: set[tuple[str, str]] = set()
+		self.incremental_gl_reposting = frappe.db.get_single_value(
+			"Stock Reposting Settings", "incremental_gl_reposting", cache=True
+		)
 		self.reserved_stock = self.get_reserved_stock()
 
+		# batched reposting
+		self.prefetched_sles = args.get("prefetched_sles")
+		self.batch_updates = args.get("batch_updates")
+		self.pending_sle_updates = []
+		self.pending_bin_updates = {}
+		self.processed_entries = 0
+
 		self.data = frappe._dict()
 		self.initialize_previous_data(self.args)
 		self.build()
@@ -622,7 +792,7 @@ class update_entries_after:
 		warehouse_dict.update(
 			{
 				"prev_stock_value": previous_sle.stock_value or 0.0,
-				"stock_queue": json.loads(previous_sle.stock_queue or "[]"),
+				"stock_queue": load_stock_queue(previous_sle.stock_queue),
 				"stock_value_difference": 0.0,
 			}
 		)
@@ -648,6 +818,8 @@ class update_entries_after:
 				if sle.dependant_sle_voucher_detail_no:
 					entries_to_fix = self.get_dependent_entries_to_fix(entries_to_fix, sle)
 
+			self.flush_pending_updates()
+
 		if self.exceptions:
 			self.raise_exceptions()
 
@@ -696,8 +868,32 @@ class update_entries_after:
 			{"item_code": self.item_code, "warehouse": self.args.warehouse}
 		)
 
+		if (entries := self.get_prefetched_entries_to_fix()) is not None:
+			return entries
+
 		return list(self.get_sle_after_datetime(args))
 
+	def get_prefetched_entries_to_fix(self):
+		"""Future entries from `get_future_sle_for_item_warehouses`, if still applicable.
+
+		Previous SLE is the last entry strictly before current posting datetime, so
+		entries after it are exactly the entries on or after current posting datetime.
+		"""
+		if not self.prefetched_sles:
+			return
+
+		prefetched = self.prefetched_sles.pop((self.item_code, self.args.warehouse), None)
+		if not prefetched:
+			return
+
+		from_datetime, entries = prefetched
+		posting_datetime = get_combine_datetime(self.args.posting_date, self.args.posting_time)
+		if posting_datetime < from_datetime:
+			# posting date moved back after prefetch, entries are incomplete
+			return
+
+		return [sle for sle in entries if sle.posting_datetime >= posting_datetime]
+
 	def get_dependent_entries_to_fix(self, entries_to_fix, sle):
 		dependant_sle = get_sle_by_voucher_detail_no(
 			sle.dependant_sle_voucher_detail_no, excluded_sle=sle.name
@@ -800,9 +996,17 @@ class update_entries_after:
 	def process_sle(self, sle):
 		# previous sle data for this warehouse
 		self.wh_data = self.data[sle.warehouse]
+		self.processed_entries += 1
+
+		defer_update = self.can_defer_sle_update(sle)
+		if not defer_update:
+			# entries below may read previous SLEs from the database
+			self.flush_pending_updates()
 
 		self.validate_previous_sle_qty(sle)
-		self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
+		previous_stock_value_difference = sle.stock_value_difference
+		if not self.incremental_gl_reposting:
+			self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
 
 		if (sle.serial_no and not self.via_landed_cost_voucher) or not cint(self.allow_negative_stock):
 			# validate negative stock for serialized items, fifo valuation
@@ -903,7 +1107,7 @@ class update_entries_after:
 		sle.qty_after_transaction = flt(self.wh_data.qty_after_transaction, self.flt_precision)
 		sle.valuation_rate = self.wh_data.valuation_rate
 		sle.stock_value = self.wh_data.stock_value
-		sle.stock_queue = json.dumps(self.wh_data.stock_queue)
+		sle.stock_queue = dump_stock_queue(self.wh_data.stock_queue, compact=self.compact_stock_queue)
 
 		if not sle.is_adjustment_entry:
 			sle.stock_value_difference = stock_value_difference
@@ -915,14 +1119,53 @@ class update_entries_after:
 				* -1
 			)
 
+		if self.incremental_gl_reposting and flt(sle.stock_value_difference, self.currency_precision) != flt(
+			previous_stock_value_difference, self.currency_precision
+		):
+			# GL Entries of vouchers with unchanged stock value are not reposted
+			self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
+
 		sle.doctype = "Stock Ledger Entry"
-		frappe.get_doc(sle).db_update()
+		if defer_update:
+			self.pending_sle_updates.append(sle)
+		else:
+			frappe.get_doc(sle).db_update()
 
 		if not self.args.get("sle_id") or (
 			sle.serial_and_batch_bundle and sle.auto_created_serial_and_batch_bundle
 		):
 			self.update_outgoing_rate_on_transaction(sle)
 
+	def can_defer_sle_update(self, sle):
+		"""Check if SLE can be written later in bulk during batched reposting.
+
+		Only plain receipts and deliveries are deferred, valuation of other entries
+		may read earlier SLEs of the same item-warehouse from the database.
+		"""
+		if not self.batch_updates or self.args.get("sle_id"):
+			return False
+
+		if sle.serial_no or sle.batch_no or sle.serial_and_batch_bundle:
+			return False
+
+		if sle.recalculate_rate or sle.is_adjustment_entry:
+			return False
+
+		if sle.voucher_type in ("Delivery Note", "Sales Invoice"):
+			return True
+
+		return sle.voucher_type in ("Purchase Receipt", "Purchase Invoice") and flt(sle.actual_qty) > 0
+
+	def flush_pending_updates(self):
+		if self.pending_sle_updates:
+			bulk_update_stock_ledger_entries(self.pending_sle_updates)
+			self.pending_sle_updates = []
+
+		for bin_name, values in self.pending_bin_updates.items():
+			frappe.db.set_value("Bin", bin_name, values)
+
+		self.pending_bin_updates = {}
+
 	def get_serialized_values(self, sle):
 		from erpnext.stock.serial_batch_bundle import SerialNoValuation
 
@@ -1402,8 +1645,11 @@ class update_entries_after:
 
 		if self.valuation_method == "LIFO":
 			stock_queue = LIFOValuation(self.wh_data.stock_queue)
+		elif isinstance(self.wh_data.stock_queue, DequeFIFOValuation):
+			# reuse the queue from previous entry instead of rebuilding it per SLE
+			stock_queue = self.wh_data.stock_queue
 		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+			stock_queue = DequeFIFOValuation(self.wh_data.stock_queue)
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1428,13 +1674,17 @@ class update_entries_after:
 
 		stock_value_difference = stock_value - prev_stock_value
 
-		self.wh_data.stock_queue = stock_queue.state
 		self.wh_data.stock_value = round_off_if_near_zero(self.wh_data.stock_value + stock_value_difference)
 
-		if not self.wh_data.stock_queue:
-			self.wh_data.stock_queue.append(
+		if not len(stock_queue):
+			self.wh_data.stock_queue = [
 				[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]
-			)
+			]
+		elif self.valuation_method == "LIFO":
+			self.wh_data.stock_queue = stock_queue.state
+		else:
+			# FIFO queue is kept for the next entry and serialized only when the SLE is updated
+			self.wh_data.stock_queue = stock_queue
 
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
@@ -1493,6 +1743,7 @@ class update_entries_after:
 	def get_fallback_rate(self, sle) -> float:
 		"""When exact incoming rate isn't available use any of other "average" rates as fallback.
 		This should only get used for negative stock."""
+		self.flush_pending_updates()
 		return get_valuation_rate(
 			sle.item_code,
 			sle.warehouse,
@@ -1569,6 +1820,11 @@ class update_entries_after:
 		if sle.valuation_rate is not None:
 			values_to_update["valuation_rate"] = sle.valuation_rate
 
+		if self.batch_updates:
+			# only the last entry's values matter, written in `flush_pending_updates`
+			self.pending_bin_updates[bin_name] = values_to_update
+			return
+
 		frappe.db.set_value("Bin", bin_name, values_to_update)
 
 	def update_bin(self):
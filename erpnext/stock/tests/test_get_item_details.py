@@ -2,7 +2,7 @@ import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import get_item_details, get_item_details_for_items
 
 test_ignore = ["BOM"]
 test_dependencies = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
@@ -97,3 +97,28 @@ class TestGetItemDetail(FrappeTestCase):
 		dn.save()
 		self.assertEqual(dn.items[0].batch_no, "BATCH01")
 		self.assertEqual(dn.items[0].rate, 50)
+
+	def test_get_item_details_for_items(self):
+		base_args = {
+			"company": "_Test Company",
+			"conversion_rate": 1.0,
+			"price_list_currency": "USD",
+			"plc_conversion_rate": 1.0,
+			"doctype": "Purchase Order",
+			"name": None,
+			"supplier": "_Test Supplier",
+			"transaction_date": None,
+			"price_list": "_Test Buying Price List",
+			"warehouse": "_Test Warehouse - _TC",
+			"is_subcontracted": 0,
+			"ignore_pricing_rule": 1,
+			"qty": 1,
+		}
+		args_list = [
+			{**base_args, "item_code": "_Test Item"},
+			{**base_args, "item_code": "_Test Item 2", "qty": 5},
+			{**base_args, "item_code": "_Test Item", "warehouse": "Stores - _TC"},
+		]
+
+		expected = [get_item_details(frappe._dict(args)) for args in args_list]
+		self.assertEqual(get_item_details_for_items(args_list), expected)
@@ -1,4 +1,5 @@
 import json
+import time
 import unittest
 
 import frappe
@@ -8,7 +9,16 @@ from hypothesis import strategies as st
 
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	COMPACT_STOCK_QUEUE_MIN_BINS,
+	COMPACT_STOCK_QUEUE_PREFIX,
+	DequeFIFOValuation,
+	FIFOValuation,
+	LIFOValuation,
+	dump_stock_queue,
+	load_stock_queue,
+	round_off_if_near_zero,
+)
 
 qty_gen = st.floats(min_value=-1e6, max_value=1e6)
 value_gen = st.floats(min_value=1, max_value=1e6)
@@ -317,6 +327,113 @@ class TestLIFOValuation(unittest.TestCase):
 			self.assertTotalValue(total_value)
 
 
+class TestDequeFIFOValuation(unittest.TestCase):
+	def assertSameAsFIFO(self, transactions, initial_state=None):
+		fifo = FIFOValuation(json.loads(json.dumps(initial_state or [])))
+		deque_fifo = DequeFIFOValuation(initial_state or [])
+
+		for qty, rate in transactions:
+			if qty > 0:
+				fifo.add_stock(qty, rate)
+				deque_fifo.add_stock(qty, rate)
+			else:
+				self.assertEqual(fifo.remove_stock(abs(qty), rate), deque_fifo.remove_stock(abs(qty), rate))
+			self.assertEqual(fifo.state, deque_fifo.state)
+
+		# deque keeps running totals, which can differ from a fresh sum in the last bits
+		for expected, total in zip(
+			fifo.get_total_stock_and_value(), deque_fifo.get_total_stock_and_value(), strict=True
+		):
+			self.assertAlmostEqual(expected, total, delta=1e-9 * max(1, abs(expected)))
+
+	def test_simple_consumption(self):
+		self.assertSameAsFIFO([(1, 10), (2, 20), (-2, 0), (-2, 0)])
+
+	def test_consumption_by_rate(self):
+		self.assertSameAsFIFO([(1, 10), (2, 20), (1, 30), (5, 20), (-3, 20), (-1, 30), (-4, 20)])
+
+	def test_consumption_from_state(self):
+		self.assertSameAsFIFO([(-1, 20), (2, 10), (-4, 0)], initial_state=[[1, 10], [2, 20], [3, 30]])
+
+	def test_negative_stock(self):
+		self.assertSameAsFIFO([(-1, 5), (-1, 0), (1, 10), (3, 10), (-5, 10)])
+
+	def test_same_rate_index_after_merge(self):
+		queue = DequeFIFOValuation([])
+		queue.add_stock(1, 10)
+		queue.add_stock(1, 20)
+		queue.add_stock(1, 20)
+		queue.add_stock(1, 10)
+		queue.remove_stock(2, 20)
+
+		self.assertEqual(queue, [[1, 10], [1, 10]])
+		self.assertEqual(len(queue.rate_index[10]), 2)
+		self.assertNotIn(20, queue.rate_index)
+
+	@given(stock_queue_generator, st.sampled_from([0.0, 1.0, 10.0]))
+	def test_deque_fifo_parity_hypothesis(self, stock_queue, outgoing_rate):
+		transactions = []
+		for qty, rate in stock_queue:
+			if round_off_if_near_zero(qty) == 0:
+				continue
+			transactions.append((qty, rate if qty > 0 else outgoing_rate))
+
+		self.assertSameAsFIFO(transactions)
+
+	def test_benchmark_high_cardinality_queue(self):
+		timings = benchmark_fifo_engines(bins=2000)
+		self.assertEqual(set(timings), {"FIFOValuation", "DequeFIFOValuation"})
+
+
+def benchmark_fifo_engines(bins: int = 20000) -> dict[str, float]:
+	"""Time FIFO engines on a queue with `bins` distinct incoming rates.
+
+	Half of the bins are consumed by matching outgoing rate from the end of
+	the queue (worst case for the list engine), the rest in FIFO order.
+
+	Run with: bench execute erpnext.stock.tests.test_valuation.benchmark_fifo_engines
+	"""
+	timings = {}
+	for engine in (FIFOValuation, DequeFIFOValuation):
+		queue = engine([])
+		for idx in range(bins):
+			queue.add_stock(1, idx + 1)
+
+		start = time.perf_counter()
+		for idx in range(bins // 2):
+			queue.remove_stock(1, outgoing_rate=bins - idx)
+		for _idx in range(bins - bins // 2):
+			queue.remove_stock(1)
+
+		timings[engine.__name__] = time.perf_counter() - start
+
+	return timings
+
+
+class TestStockQueueCodec(unittest.TestCase):
+	def test_short_queue_stays_json(self):
+		queue = [[1.0, 10.0], [2.0, 20.0]]
+		self.assertEqual(dump_stock_queue(queue, compact=True), json.dumps(queue))
+
+	def test_compact_roundtrip(self):
+		queue = [[float(idx % 7 + 1), 100.0 + idx / 3] for idx in range(COMPACT_STOCK_QUEUE_MIN_BINS * 10)]
+		encoded = dump_stock_queue(queue, compact=True)
+
+		self.assertTrue(encoded.startswith(COMPACT_STOCK_QUEUE_PREFIX))
+		self.assertLess(len(encoded), len(json.dumps(queue)))
+		self.assertEqual(load_stock_queue(encoded), queue)
+
+	def test_load_legacy_values(self):
+		self.assertEqual(load_stock_queue(None), [])
+		self.assertEqual(load_stock_queue(""), [])
+		self.assertEqual(load_stock_queue("[[1, 10]]"), [[1, 10]])
+
+	@given(stock_queue_generator)
+	def test_compact_roundtrip_hypothesis(self, stock_queue):
+		queue = [[qty, rate] for qty, rate in stock_queue]
+		self.assertEqual(load_stock_queue(dump_stock_queue(queue, compact=True)), queue)
+
+
 class TestLIFOValuationSLE(FrappeTestCase):
 	ITEM_CODE = "_Test LIFO item"
 	WAREHOUSE = "_Test Warehouse - _TC"
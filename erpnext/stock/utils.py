@@ -15,7 +15,7 @@ from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle impor
 )
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 from erpnext.stock.serial_batch_bundle import BatchNoValuation, SerialNoValuation
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation
+from erpnext.stock.valuation import FIFOValuation, LIFOValuation, load_stock_queue
 
 BarcodeScanResult = dict[str, str | None]
 
@@ -63,6 +63,12 @@ def get_stock_value_on(
 	item_code: str | None = None,
 	company: str | None = None,
 ) -> float:
+	from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+		get_checkpoint_dates,
+		get_checkpoint_stock_value,
+		get_ledger_after_checkpoint_condition,
+	)
+
 	if not posting_date:
 		posting_date = nowdate()
 
@@ -73,6 +79,11 @@ def get_stock_value_on(
 		.where((sle.posting_date <= posting_date) & (sle.is_cancelled == 0))
 	)
 
+	# start from the latest stock balance checkpoint of each company and add the entries after it
+	checkpoint_dates = get_checkpoint_dates(posting_date, company)
+	if checkpoint_dates:
+		query = query.where(get_ledger_after_checkpoint_condition(sle, checkpoint_dates))
+
 	if warehouses:
 		if isinstance(warehouses, str):
 			warehouses = [warehouses]
@@ -90,7 +101,9 @@ def get_stock_value_on(
 	if company:
 		query = query.where(sle.company == company)
 
-	return query.run(as_list=True)[0][0]
+	return flt(query.run(as_list=True)[0][0]) + flt(
+		get_checkpoint_stock_value(checkpoint_dates, warehouses, item_code)
+	)
 
 
 @frappe.whitelist()
@@ -305,7 +318,7 @@ def get_incoming_rate(args, raise_error_if_no_rate=True):
 		previous_sle = get_previous_sle(args)
 		if valuation_method in ("FIFO", "LIFO"):
 			if previous_sle:
-				previous_stock_queue = json.loads(previous_sle.get("stock_queue", "[]") or "[]")
+				previous_stock_queue = load_stock_queue(previous_sle.get("stock_queue"))
 				in_rate = (
 					_get_fifo_lifo_rate(previous_stock_queue, args.get("qty") or 0, valuation_method)
 					if previous_stock_queue
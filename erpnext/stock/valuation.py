@@ -1,4 +1,9 @@
+import base64
+import json
+import struct
+import zlib
 from abc import ABC, abstractmethod, abstractproperty
+from collections import deque
 from collections.abc import Callable
 from typing import NewType
 
@@ -10,6 +15,11 @@ StockBin = NewType("StockBin", list[float])  # [[qty, rate], ...]
 QTY = 0
 RATE = 1
 
+# Versioned prefix of compact `stock_queue` encoding, see `dump_stock_queue`
+COMPACT_STOCK_QUEUE_PREFIX = "sq1:"
+# Short queues are smaller as JSON text
+COMPACT_STOCK_QUEUE_MIN_BINS = 16
+
 
 class BinWiseValuation(ABC):
 	@abstractmethod
@@ -36,6 +46,9 @@ class BinWiseValuation(ABC):
 
 		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
 
+	def __len__(self):
+		return len(self.state)
+
 	def __repr__(self):
 		return str(self.state)
 
@@ -151,6 +164,186 @@ class FIFOValuation(BinWiseValuation):
 		return consumed_bins
 
 
+class DequeFIFOValuation(BinWiseValuation):
+	"""FIFO valuation backed by a deque and a rate -> bins index.
+
+	Behaves exactly like `FIFOValuation` and serializes to the same `state`,
+	but consumption is O(1) per bin instead of O(n):
+
+	- bins consumed from the front are popped from the deque.
+	- bins consumed by matching `outgoing_rate` are looked up in `rate_index`
+	  and tombstoned in place; tombstones are dropped lazily once they reach
+	  either end of the deque, or by an occasional compaction.
+	- total qty and value are kept as running totals, `state` is only built
+	  when the queue is serialized.
+
+	Useful for items with thousands of small receipts where reposting
+	a long history would otherwise be quadratic.
+	"""
+
+	__slots__ = ["live_bins", "queue", "rate_index", "total_qty", "total_value"]
+
+	def __init__(self, state: list[StockBin] | None):
+		self.queue: deque[StockBin] = deque()
+		# rate -> bins with that rate, in FIFO order
+		self.rate_index: dict[float, deque[StockBin]] = {}
+		self.live_bins = 0
+		self.total_qty = 0.0
+		self.total_value = 0.0
+
+		for fifo_bin in state or []:
+			self._append_bin([fifo_bin[QTY], fifo_bin[RATE]])
+
+	@property
+	def state(self) -> list[StockBin]:
+		"""Get current state of queue."""
+		return [fifo_bin for fifo_bin in self.queue if fifo_bin[QTY] is not None]
+
+	def get_total_stock_and_value(self) -> tuple[float, float]:
+		return round_off_if_near_zero(self.total_qty), round_off_if_near_zero(self.total_value)
+
+	def __len__(self):
+		return self.live_bins
+
+	def add_stock(self, qty: float, rate: float) -> None:
+		"""Update fifo queue with new stock.
+
+		args:
+		        qty: new quantity to add
+		        rate: incoming rate of new quantity"""
+
+		if not self.live_bins:
+			self._append_bin([0, 0])
+
+		last_bin = self._last_bin()
+
+		# last row has the same rate, merge new bin.
+		if last_bin[RATE] == rate:
+			self._set_bin_qty(last_bin, last_bin[QTY] + qty)
+		else:
+			# Item has a positive balance qty, add new entry
+			if last_bin[QTY] > 0:
+				self._append_bin([qty, rate])
+			else:  # negative balance qty
+				qty = last_bin[QTY] + qty
+				if qty > 0:  # new balance qty is positive
+					self._pop_last_bin()
+					self._append_bin([qty, rate])
+				else:  # new balance qty is still negative, maintain same rate
+					self._set_bin_qty(last_bin, qty)
+
+	def remove_stock(
+		self, qty: float, outgoing_rate: float = 0.0, rate_generator: Callable[[], float] | None = None
+	) -> list[StockBin]:
+		"""Remove stock from the queue and return popped bins.
+
+		args:
+		        qty: quantity to remove
+		        rate: outgoing rate
+		        rate_generator: function to be called if queue is not found and rate is required.
+		"""
+		if not rate_generator:
+			rate_generator = lambda: 0.0  # noqa
+
+		consumed_bins = []
+		while qty:
+			if not self.live_bins:
+				# rely on rate generator.
+				self._append_bin([0, rate_generator()])
+
+			fifo_bin = None
+			if outgoing_rate > 0:
+				# Find the entry where rate matched with outgoing rate
+				same_rate_bins = self.rate_index.get(outgoing_rate)
+				if same_rate_bins:
+					fifo_bin = same_rate_bins[0]
+
+			# If no entry found with outgoing rate, consume as per FIFO
+			if fifo_bin is None:
+				fifo_bin = self._first_bin()
+
+			if qty >= fifo_bin[QTY]:
+				# consume current bin
+				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
+				consumed_bins.append(list(fifo_bin))
+				self._remove_bin(fifo_bin)
+
+				if not self.live_bins and qty:
+					# stock finished, qty still remains to be withdrawn
+					# negative stock, keep in as a negative bin
+					self._append_bin([-qty, outgoing_rate or fifo_bin[RATE]])
+					consumed_bins.append([qty, outgoing_rate or fifo_bin[RATE]])
+					break
+			else:
+				# qty found in current bin consume it and exit
+				self._set_bin_qty(fifo_bin, round_off_if_near_zero(fifo_bin[QTY] - qty))
+				consumed_bins.append([qty, fifo_bin[RATE]])
+				qty = 0
+
+		return consumed_bins
+
+	def _append_bin(self, fifo_bin: StockBin) -> None:
+		self.queue.append(fifo_bin)
+		self.rate_index.setdefault(fifo_bin[RATE], deque()).append(fifo_bin)
+		self.live_bins += 1
+		self._add_to_totals(fifo_bin[QTY], fifo_bin[RATE])
+
+	def _set_bin_qty(self, fifo_bin: StockBin, qty: float) -> None:
+		self._add_to_totals(qty - fifo_bin[QTY], fifo_bin[RATE])
+		fifo_bin[QTY] = qty
+
+	def _add_to_totals(self, qty: float, rate: float) -> None:
+		if not self.live_bins:
+			# reset accumulated rounding errors once the queue is empty
+			self.total_qty = self.total_value = 0.0
+			return
+
+		self.total_qty += flt(qty)
+		self.total_value += flt(qty) * flt(rate)
+
+	def _first_bin(self) -> StockBin:
+		while self.queue[0][QTY] is None:
+			self.queue.popleft()
+		return self.queue[0]
+
+	def _last_bin(self) -> StockBin:
+		while self.queue[-1][QTY] is None:
+			self.queue.pop()
+		return self.queue[-1]
+
+	def _pop_last_bin(self) -> None:
+		fifo_bin = self._last_bin()
+		self.queue.pop()
+		self._unindex_bin(fifo_bin, last=True)
+		self.live_bins -= 1
+		self._add_to_totals(-fifo_bin[QTY], fifo_bin[RATE])
+
+	def _remove_bin(self, fifo_bin: StockBin) -> None:
+		"""Remove a bin which is the first bin of its rate."""
+		self._unindex_bin(fifo_bin, last=False)
+		self.live_bins -= 1
+		self._add_to_totals(-fifo_bin[QTY], fifo_bin[RATE])
+
+		if self.queue[0] is fifo_bin:
+			self.queue.popleft()
+			return
+
+		# tombstone, original rate is kept for the caller
+		fifo_bin[QTY] = None
+		if len(self.queue) > 2 * self.live_bins + 32:
+			self.queue = deque(b for b in self.queue if b[QTY] is not None)
+
+	def _unindex_bin(self, fifo_bin: StockBin, last: bool) -> None:
+		same_rate_bins = self.rate_index[fifo_bin[RATE]]
+		if last:
+			same_rate_bins.pop()
+		else:
+			same_rate_bins.popleft()
+
+		if not same_rate_bins:
+			del self.rate_index[fifo_bin[RATE]]
+
+
 class LIFOValuation(BinWiseValuation):
 	"""Valuation method where a *stack* of all the incoming stock is maintained.
 
@@ -253,3 +446,53 @@ def round_off_if_near_zero(number: float, precision: int = 7) -> float:
 		return 0.0
 
 	return flt(number)
+
+
+def dump_stock_queue(queue: list[StockBin] | BinWiseValuation, compact: bool = False) -> str:
+	"""Serialize stock queue for `stock_queue` field of Stock Ledger Entry.
+
+	args:
+	        queue: list of [qty, rate] bins or a valuation queue
+	        compact: use compact binary encoding for long queues, JSON otherwise.
+
+	Compact encoding (v1) packs qty and rate columns as float64 and regroups
+	the bytes so that the n-th byte of every value is stored together.
+	Neighbouring bins share sign/exponent bytes, which zlib then compresses
+	well. The result is base64 encoded behind `COMPACT_STOCK_QUEUE_PREFIX`.
+	It is lossless.
+	"""
+	if isinstance(queue, BinWiseValuation):
+		queue = queue.state
+
+	if not compact or len(queue) < COMPACT_STOCK_QUEUE_MIN_BINS:
+		return json.dumps(queue)
+
+	values = [flt(fifo_bin[QTY]) for fifo_bin in queue] + [flt(fifo_bin[RATE]) for fifo_bin in queue]
+	packed = struct.pack(f"<{len(values)}d", *values)
+	shuffled = b"".join(packed[byte::8] for byte in range(8))
+
+	payload = zlib.compress(struct.pack("<I", len(queue)) + shuffled)
+	return COMPACT_STOCK_QUEUE_PREFIX + base64.b64encode(payload).decode()
+
+
+def load_stock_queue(value: str | list | None) -> list[StockBin]:
+	"""Deserialize `stock_queue` written by `dump_stock_queue`, JSON or compact."""
+	if not value:
+		return []
+
+	if isinstance(value, list):
+		return value
+
+	if not value.startswith(COMPACT_STOCK_QUEUE_PREFIX):
+		return json.loads(value)
+
+	payload = zlib.decompress(base64.b64decode(value[len(COMPACT_STOCK_QUEUE_PREFIX) :]))
+	(count,) = struct.unpack_from("<I", payload)
+
+	total = 2 * count
+	packed = bytearray(8 * total)
+	for byte in range(8):
+		packed[byte::8] = payload[4 + byte * total : 4 + (byte + 1) * total]
+
+	values = struct.unpack(f"<{total}d", packed)
+	return [list(fifo_bin) for fifo_bin in zip(values[:count], values[count:], strict=True)]
@@ -1,9 +1,32 @@
 import json
-from datetime import date, datetime
+import time
+from datetime import datetime
 
 import frappe
 from frappe import _
-from frappe.utils import get_link_to_form, today
+from frappe.utils import cint, create_batch, flt, format_duration, get_link_to_form, now, today
+
+# documents converted in one background job, each job is committed separately
+BULK_TRANSACTION_CHUNK_SIZE = 100
+
+# minimum interval in seconds between progress updates
+PROGRESS_UPDATE_INTERVAL = 2
+
+LOG_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"transaction_name",
+	"transaction_status",
+	"error_description",
+	"from_doctype",
+	"to_doctype",
+	"date",
+	"time",
+	"retried",
+)
 
 
 @frappe.whitelist()
@@ -19,12 +42,23 @@ def transaction_processing(data, from_doctype, to_doctype):
 	length_of_data = len(deserialized_data)
 
 	frappe.msgprint(_("Started a background job to create {1} {0}").format(to_doctype, length_of_data))
-	frappe.enqueue(
-		job,
-		deserialized_data=deserialized_data,
-		from_doctype=from_doctype,
-		to_doctype=to_doctype,
-	)
+
+	# chunks are picked up by any available worker and processed in parallel
+	batch_id = frappe.generate_hash(length=10)
+	batch_started = now()
+	init_progress(batch_id, length_of_data)
+
+	for idx, chunk in enumerate(create_batch(deserialized_data, BULK_TRANSACTION_CHUNK_SIZE)):
+		frappe.enqueue(
+			job,
+			deserialized_data=chunk,
+			from_doctype=from_doctype,
+			to_doctype=to_doctype,
+			batch_id=batch_id,
+			batch_started=batch_started,
+			job_id=f"bulk_transaction::{batch_id}::{idx}",
+			deduplicate=True,
+		)
 
 
 @frappe.whitelist()
@@ -66,34 +100,140 @@ def retry_failed_transactions(failed_docs: list | None):
 
 
 def update_log(log_name, status, retried, err=None):
-	frappe.db.set_value("Bulk Transaction Log Detail", log_name, "transaction_status", status)
-	frappe.db.set_value("Bulk Transaction Log Detail", log_name, "retried", retried)
+	values = {"transaction_status": status, "retried": retried}
 	if err:
-		frappe.db.set_value("Bulk Transaction Log Detail", log_name, "error_description", err)
+		values["error_description"] = err
+
+	frappe.db.set_value("Bulk Transaction Log Detail", log_name, values)
+
 
+def job(deserialized_data, from_doctype, to_doctype, batch_id=None, batch_started=None):
+	"""Convert a chunk of documents, logs are inserted together and committed along with the
+	created documents. Documents converted by an earlier run of the same batch are skipped,
+	so a chunk can be enqueued again to resume it."""
+	doc_names = [d.get("name") for d in deserialized_data]
+	if batch_started:
+		converted = set(get_converted_documents(doc_names, from_doctype, to_doctype, batch_started))
+		doc_names = [doc_name for doc_name in doc_names if doc_name not in converted]
 
-def job(deserialized_data, from_doctype, to_doctype):
+	logs = []
 	fail_count = 0
-	for d in deserialized_data:
+	# skipped documents count towards the batch as well, so that it completes
+	processed = len(deserialized_data) - len(doc_names)
+	last_update = time.monotonic()
+
+	for doc_name in doc_names:
 		try:
-			doc_name = d.get("name")
 			frappe.db.savepoint("before_creation_state")
 			task(doc_name, from_doctype, to_doctype)
 		except Exception:
 			frappe.db.rollback(save_point="before_creation_state")
 			fail_count += 1
-			create_log(
-				doc_name,
-				str(frappe.get_traceback(with_context=True)),
-				from_doctype,
-				to_doctype,
-				status="Failed",
-				log_date=str(date.today()),
+			logs.append(
+				make_log_row(
+					doc_name,
+					str(frappe.get_traceback(with_context=True)),
+					from_doctype,
+					to_doctype,
+					status="Failed",
+				)
 			)
 		else:
-			create_log(doc_name, None, from_doctype, to_doctype, status="Success", log_date=str(date.today()))
+			logs.append(make_log_row(doc_name, None, from_doctype, to_doctype, status="Success"))
+
+		processed += 1
+		if batch_id and time.monotonic() - last_update > PROGRESS_UPDATE_INTERVAL:
+			update_progress(batch_id, to_doctype, processed, fail_count)
+			processed = fail_count = 0
+			last_update = time.monotonic()
+
+	if logs:
+		frappe.db.bulk_insert("Bulk Transaction Log Detail", fields=LOG_FIELDS, values=logs)
+
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+	if batch_id:
+		update_progress(batch_id, to_doctype, processed, fail_count)
+	else:
+		show_job_status(fail_count, len(deserialized_data), to_doctype)
+
+
+def get_converted_documents(doc_names, from_doctype, to_doctype, since):
+	return frappe.get_all(
+		"Bulk Transaction Log Detail",
+		filters={
+			"transaction_name": ("in", doc_names),
+			"from_doctype": from_doctype,
+			"to_doctype": to_doctype,
+			"transaction_status": "Success",
+			"creation": (">=", since),
+		},
+		pluck="transaction_name",
+	)
+
+
+def make_log_row(doc_name, e, from_doctype, to_doctype, status, restarted=0):
+	timestamp, user = now(), frappe.session.user
+	return (
+		frappe.generate_hash(length=10),
+		timestamp,
+		timestamp,
+		user,
+		user,
+		doc_name,
+		status,
+		str(e),
+		from_doctype,
+		to_doctype,
+		today(),
+		datetime.now().strftime("%H:%M:%S"),
+		restarted,
+	)
+
+
+def get_progress_key(batch_id):
+	return f"bulk_transaction_progress::{batch_id}"
+
+
+def init_progress(batch_id, total):
+	frappe.cache.set_value(
+		get_progress_key(batch_id),
+		{"total": total, "started": time.time(), "user": frappe.session.user},
+		expires_in_sec=86400,
+	)
+
+
+def update_progress(batch_id, to_doctype, processed, fail_count):
+	"""Add counts processed by a chunk to the batch and publish the throughput and ETA of the batch"""
+	batch = frappe.cache.get_value(get_progress_key(batch_id))
+	if not batch:
+		return
 
-	show_job_status(fail_count, len(deserialized_data), to_doctype)
+	processed_key = frappe.cache.make_key(f"{get_progress_key(batch_id)}::processed")
+	failed_key = frappe.cache.make_key(f"{get_progress_key(batch_id)}::failed")
+	total_processed = cint(frappe.cache.incrby(processed_key, processed))
+	total_failed = cint(frappe.cache.incrby(failed_key, fail_count))
+	for key in (processed_key, failed_key):
+		frappe.cache.expire(key, 86400)
+
+	elapsed = max(time.time() - batch["started"], 1)
+	per_minute = total_processed * 60 / elapsed
+	remaining = max(batch["total"] - total_processed, 0)
+	eta = remaining * elapsed / total_processed if total_processed else 0
+
+	frappe.publish_progress(
+		total_processed * 100 / batch["total"],
+		title=_("Creating {0}").format(_(to_doctype)),
+		description=_("{0} of {1} processed ({2} per minute), about {3} remaining").format(
+			total_processed, batch["total"], flt(per_minute, 1), format_duration(cint(eta))
+		),
+	)
+
+	if not remaining:
+		frappe.cache.delete_value(get_progress_key(batch_id))
+		frappe.cache.delete(processed_key, failed_key)
+		show_job_status(total_failed, batch["total"], to_doctype)
 
 
 def task(doc_name, from_doctype, to_doctype):
@@ -157,20 +297,6 @@ def task(doc_name, from_doctype, to_doctype):
 	del frappe.flags.bulk_transaction
 
 
-def create_log(doc_name, e, from_doctype, to_doctype, status, log_date=None, restarted=0):
-	transaction_log = frappe.new_doc("Bulk Transaction Log Detail")
-	transaction_log.transaction_name = doc_name
-	transaction_log.date = today()
-	now = datetime.now()
-	transaction_log.time = now.strftime("%H:%M:%S")
-	transaction_log.transaction_status = status
-	transaction_log.error_description = str(e)
-	transaction_log.from_doctype = from_doctype
-	transaction_log.to_doctype = to_doctype
-	transaction_log.retried = restarted
-	transaction_log.save(ignore_permissions=True)
-
-
 def show_job_status(fail_count, deserialized_data_count, to_doctype):
 	if not fail_count:
 		frappe.msgprint(